@@ -10,7 +10,9 @@ from .models import (
     ContactAttempt,
     Notification,
     NotificationPreference,
+    OutboundEmail,
     SiteVisit,
+    SpamKeyword,
     NewsletterSubscription,
 )
 
@@ -151,6 +153,15 @@ class ContactAttemptAdmin(admin.ModelAdmin):
     unblock_attempts.short_description = "선택된 항목 차단 해제"
 
 
+@admin.register(SpamKeyword)
+class SpamKeywordAdmin(admin.ModelAdmin):
+    list_display = ("keyword", "weight", "is_active", "updated_at")
+    list_editable = ("weight", "is_active")
+    list_filter = ("is_active",)
+    search_fields = ("keyword",)
+    readonly_fields = ("updated_at",)
+
+
 @admin.register(SiteVisit)
 class SiteVisitAdmin(admin.ModelAdmin):
     list_display = ("ip_address", "page_path", "visit_time", "referer_short")
@@ -180,6 +191,24 @@ class SiteVisitAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("subject", "to")
+    readonly_fields = ("subject", "body", "from_email", "to", "attempts", "last_error", "created_at", "sent_at")
+    actions = ["retry_emails"]
+
+    def retry_emails(self, request, queryset):
+        updated = queryset.exclude(status="sent").update(status="pending", attempts=0, next_attempt_at=timezone.now())
+        self.message_user(request, f"{updated}개의 이메일을 다시 발송 대기열에 넣었습니다.")
+
+    retry_emails.short_description = "선택된 이메일 재발송"
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(NewsletterSubscription)
 class NewsletterSubscriptionAdmin(admin.ModelAdmin):
     list_display = ("email", "name", "is_active", "subscribed_at", "ip_address_short")
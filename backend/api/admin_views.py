@@ -1,16 +1,25 @@
 from rest_framework.decorators import api_view, throttle_classes, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Sum
 from django.db.models.functions import TruncDate
 from django.utils import timezone
 from django.core.cache import cache
 from datetime import timedelta
-
-from .constants import CACHE_ADMIN_STATS
+import os
+
+from . import counters, spam
+from .authentication import user_cache
+from .counting import CACHED, ESTIMATED, EXACT, count
+from .ingest import view_count_buffer, visit_buffer
+from .likes import like_counter_folder
+from .outbox import email_outbox
+from .pagination import keyset_paginate, requested_cursor
+from .rollups import day_bounds, unique_visitors_between
 from .views import AdminRateThrottle
 from .serializers import AdminUserSerializer
-from .models import BlogPost, Contact, SiteVisit
+from .utils import is_email
+from .models import BlogPost, Contact, DailyPageStat, DailyVisitStat, SiteVisit
 
 from django.contrib.auth.models import User
 
@@ -22,41 +31,64 @@ def parse_pagination_params(request, default_page_size=20):
     return page, page_size
 
 
-def paginate_queryset(queryset, page, page_size):
-    """Slice queryset and return (items, total, next_page)."""
-    total = queryset.count()
+def paginate_queryset(queryset, page, page_size, count_strategy=EXACT):
+    """Slice queryset and return (items, total, next_page); ``total`` per ``count_strategy`` (api.counting)."""
+    total = count(queryset, count_strategy)
     offset = (page - 1) * page_size
     items = queryset[offset : offset + page_size]
     next_page = page + 1 if offset + page_size < total else None
     return items, total, next_page
 
 
+def paginate(request, queryset, keyset_ordering, page, page_size, count_strategy=EXACT):
+    """Page by number, or by cursor when requested (see api.pagination).
+
+    Returns (items, meta): meta is {"count", "next" page} or, for cursor pages,
+    {"next" cursor, "has_next"} without a COUNT. A bad cursor raises a ValidationError (400).
+    """
+    cursor = requested_cursor(request)
+    if cursor is None:
+        items, total, next_page = paginate_queryset(queryset, page, page_size, count_strategy)
+        return items, {"count": total, "next": next_page}
+    items, next_cursor = keyset_paginate(queryset, keyset_ordering, cursor, page_size)
+    return items, {"next": next_cursor, "has_next": next_cursor is not None}
+
+
 @api_view(["GET"])
 @permission_classes([IsAdminUser])
 @throttle_classes([AdminRateThrottle])
 def admin_stats(request):
-    """Admin dashboard statistics"""
-    cache_key = CACHE_ADMIN_STATS
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return Response(cached)
-
-    total_users = User.objects.count()
-    total_posts = BlogPost.objects.count()
-    total_messages = Contact.objects.count()
-    total_views = SiteVisit.objects.count()
-
+    """Admin dashboard statistics (running totals, see api/counters.py)"""
+    totals = counters.read()
     data = {
-        "totalUsers": total_users,
-        "totalPosts": total_posts,
-        "totalMessages": total_messages,
-        "totalViews": total_views,
+        "totalUsers": totals["users"],
+        "totalPosts": totals["posts"],
+        "totalMessages": totals["messages"],
+        "totalViews": totals["visits"],
     }
-    cache.set(cache_key, data, timeout=60)
 
     return Response(data)
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+@throttle_classes([AdminRateThrottle])
+def admin_metrics(request):
+    """Runtime counters of the worker that served this request (per-process, not aggregated)"""
+    return Response(
+        {
+            "pid": os.getpid(),
+            "visit_buffer": visit_buffer.stats(),
+            "view_count_buffer": view_count_buffer.stats(),
+            "email_outbox": email_outbox.stats(),
+            "like_counters": like_counter_folder.stats(),
+            "spam_filter": spam.get_scorer().stats(),
+            "auth_users": user_cache.stats(),
+            "cache": cache.stats() if hasattr(cache, "stats") else None,
+        }
+    )
+
+
 @api_view(["GET"])
 @permission_classes([IsAdminUser])
 @throttle_classes([AdminRateThrottle])
@@ -68,7 +100,7 @@ def admin_content(request):
         return Response({"error": "Invalid pagination parameters"}, status=400)
 
     posts = BlogPost.objects.all().order_by("-date")
-    page_items, total, next_page = paginate_queryset(posts, page, page_size)
+    page_items, total, next_page = paginate_queryset(posts, page, page_size, CACHED)
     items = [
         {
             "id": post.id,
@@ -95,7 +127,7 @@ def admin_messages(request):
         return Response({"error": "Invalid pagination parameters"}, status=400)
 
     contacts = Contact.objects.select_related("processed_by").order_by("-created_at")
-    page_items, total, next_page = paginate_queryset(contacts, page, page_size)
+    page_items, meta = paginate(request, contacts, ("-created_at", "-id"), page, page_size, CACHED)
     items = [
         {
             "id": str(c.id),
@@ -109,7 +141,7 @@ def admin_messages(request):
         for c in page_items
     ]
 
-    return Response({"count": total, "next": next_page, "results": items})
+    return Response({**meta, "results": items})
 
 
 @api_view(["GET", "PATCH"])
@@ -175,7 +207,11 @@ def admin_users(request):
     search = request.query_params.get("search", "").strip()
     if search:
         search = search[:200]
-        queryset = queryset.filter(Q(username__icontains=search) | Q(email__icontains=search))
+        if is_email(search):
+            # A whole address: exact matches only, both answered from an index
+            queryset = queryset.filter(Q(email__lower=search.lower()) | Q(username=search))
+        else:
+            queryset = queryset.filter(Q(username__icontains=search) | Q(email__icontains=search))
 
     # Filter by role
     role = request.query_params.get("role", "").strip()
@@ -193,9 +229,9 @@ def admin_users(request):
     elif is_active == "false":
         queryset = queryset.filter(is_active=False)
 
-    page_items, total, next_page = paginate_queryset(queryset, page, page_size)
+    page_items, meta = paginate(request, queryset, ("-date_joined", "-id"), page, page_size, ESTIMATED)
     serializer = AdminUserSerializer(page_items, many=True)
-    return Response({"count": total, "next": next_page, "results": serializer.data})
+    return Response({**meta, "results": serializer.data})
 
 
 @api_view(["GET", "PATCH", "DELETE"])
@@ -239,21 +275,33 @@ def admin_user_detail(request, pk):
 @permission_classes([IsAdminUser])
 @throttle_classes([AdminRateThrottle])
 def admin_analytics_visits(request):
-    """Daily visit time-series data"""
+    """Daily visit time-series data.
+
+    Unique visitor counts are HyperLogLog estimates (~1.6% standard error, see
+    api/hyperloglog.py); ``?exact=true`` recounts them from raw SiteVisit rows
+    for audits, which only covers days cleanup_sitevisits has not purged yet.
+    """
     try:
         days = min(365, max(1, int(request.query_params.get("days", 30))))
     except (ValueError, TypeError):
         return Response({"error": "Invalid days parameter"}, status=400)
 
-    start_date = timezone.now() - timedelta(days=days)
+    exact = request.query_params.get("exact", "").lower() == "true"
+    start_date = timezone.localdate(timezone.now() - timedelta(days=days))
 
-    daily_data = (
-        SiteVisit.objects.filter(visit_time__gte=start_date)
-        .annotate(date=TruncDate("visit_time"))
-        .values("date")
-        .annotate(visits=Count("id"), unique_visitors=Count("ip_address", distinct=True))
-        .order_by("date")
-    )
+    if exact:
+        raw = SiteVisit.objects.filter(visit_time__gte=day_bounds(start_date)[0])
+        daily_data = (
+            raw.annotate(date=TruncDate("visit_time"))
+            .values("date")
+            .annotate(visits=Count("id"), unique_visitors=Count("ip_address", distinct=True))
+            .order_by("date")
+        )
+        total_unique_visitors = raw.values("ip_address").distinct().count()
+    else:
+        # Read the daily rollups (api/rollups.py) — cost no longer grows with raw SiteVisit rows
+        daily_data = DailyVisitStat.objects.filter(date__gte=start_date).values("date", "visits", "unique_visitors")
+        total_unique_visitors = unique_visitors_between(start_date)
 
     data = [
         {
@@ -264,7 +312,7 @@ def admin_analytics_visits(request):
         for entry in daily_data
     ]
 
-    return Response({"period": days, "data": data})
+    return Response({"period": days, "exact": exact, "total_unique_visitors": total_unique_visitors, "data": data})
 
 
 @api_view(["GET"])
@@ -277,13 +325,13 @@ def admin_analytics_pages(request):
     except (ValueError, TypeError):
         return Response({"error": "Invalid days parameter"}, status=400)
 
-    start_date = timezone.now() - timedelta(days=days)
+    start_date = timezone.localdate(timezone.now() - timedelta(days=days))
 
     page_data = (
-        SiteVisit.objects.filter(visit_time__gte=start_date)
+        DailyPageStat.objects.filter(date__gte=start_date)
         .values("page_path")
-        .annotate(visits=Count("id"))
-        .order_by("-visits")[:10]
+        .annotate(visits=Sum("visits"))
+        .order_by("-visits", "page_path")[:10]
     )
 
     data = [{"page_path": entry["page_path"], "visits": entry["visits"]} for entry in page_data]
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from django.contrib.auth.models import User
+        from django.db.models.functions import Lower
+
+        from . import signals  # noqa: F401
+
+        # User.objects.filter(email__lower=...): case-insensitive and served by the LOWER(email) index (migration 0025)
+        User._meta.get_field("email").register_lookup(Lower)
@@ -11,6 +11,7 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.conf import settings
 from .serializers import UserSerializer
+from .tokens import remember_blacklisted, rotate
 
 logger = logging.getLogger(__name__)
 
@@ -65,11 +66,11 @@ def login(request):
     # Try to authenticate with username or email
     user = None
     if "@" in username:
-        try:
-            user_obj = User.objects.get(email=username)
+        # Emails are matched case-insensitively, so more than one account may share one
+        for user_obj in User.objects.filter(email__lower=username.strip().lower()).order_by("pk"):
             user = authenticate(username=user_obj.username, password=password)
-        except User.DoesNotExist:
-            pass
+            if user is not None:
+                break
     else:
         user = authenticate(username=username, password=password)
 
@@ -96,6 +97,7 @@ def logout(request):
         if refresh_token:
             token = RefreshToken(refresh_token)
             token.blacklist()
+            remember_blacklisted(token)
             response = Response({"success": "Logged out successfully"})
             _clear_jwt_cookies(response)
             return response
@@ -131,10 +133,13 @@ def update_user(request):
     if "last_name" in request.data:
         user.last_name = request.data["last_name"]
     if "email" in request.data:
+        if not isinstance(request.data["email"], str):
+            return Response({"error": "Email must be a string"}, status=status.HTTP_400_BAD_REQUEST)
+        email = User.objects.normalize_email(request.data["email"].strip())
         # Check if email is already taken
-        if User.objects.filter(email=request.data["email"]).exclude(id=user.id).exists():
+        if User.objects.filter(email__lower=email.lower()).exclude(id=user.id).exists():
             return Response({"error": "Email already in use"}, status=status.HTTP_400_BAD_REQUEST)
-        user.email = request.data["email"]
+        user.email = email
 
     user.save()
 
@@ -182,20 +187,20 @@ def token_refresh(request):
         return Response({"error": "Refresh token required"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        old_refresh = RefreshToken(refresh_token)
-        # Get new access token
-        access_token = old_refresh.access_token
-
         # If rotation is enabled, create new refresh token
         if settings.SIMPLE_JWT.get("ROTATE_REFRESH_TOKENS"):
             if settings.SIMPLE_JWT.get("BLACKLIST_AFTER_ROTATION"):
-                old_refresh.blacklist()
-            new_refresh = RefreshToken.for_user(User.objects.get(id=old_refresh["user_id"]))
+                # Blacklist check, blacklisting and the new token in one transaction (api/tokens.py)
+                new_refresh = rotate(refresh_token)
+            else:
+                old_refresh = RefreshToken(refresh_token)
+                new_refresh = RefreshToken.for_user(User.objects.get(id=old_refresh["user_id"]))
             response = Response({"success": "Token refreshed"})
             _set_jwt_cookies(response, new_refresh.access_token, new_refresh)
         else:
+            old_refresh = RefreshToken(refresh_token)
             response = Response({"success": "Token refreshed"})
-            _set_jwt_cookies(response, access_token, old_refresh)
+            _set_jwt_cookies(response, old_refresh.access_token, old_refresh)
 
         return response
 
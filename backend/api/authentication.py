@@ -1,6 +1,121 @@
+"""JWT authentication from the httpOnly cookie or the Authorization header.
+
+Resolving a token's user used to cost an ``auth_user`` query per request, so an
+admin dashboard polling a dozen ``admin_*`` endpoints ran a dozen of them.
+``get_user`` now keeps the users it loaded in a small per-worker cache keyed by
+(user id, token ``iat``) for ``AUTH_USER_CACHE["TIMEOUT"]`` seconds (0 turns it
+off). Saving or deleting a user — profile updates, password changes, the admin
+user endpoints — drops that user here after commit and bumps that user's
+version in the shared cache; other workers compare each entry's version with it
+at most every ``CHECK_INTERVAL`` seconds and drop the entry when it moved, so
+one user's change leaves everyone else's entries alone.
+"""
+
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+
+from .constants import CACHE_AUTH_USER_VERSION
+
+DEFAULTS = {
+    "TIMEOUT": 30,
+    "MAX_ENTRIES": 1000,
+    "CHECK_INTERVAL": 1,
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, "AUTH_USER_CACHE", {})}
+
+
+def _shared_version(user_id):
+    return cache.get(f"{CACHE_AUTH_USER_VERSION}{user_id}")
+
+
+class UserCache:
+    """Per-process LRU of authenticated users, shared by all threads of a worker."""
+
+    def __init__(self):
+        # (user id, iat) -> [expires_at, pickled user, user's shared version, version checked_at]
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped whenever entries are dropped, so a lookup that raced a change isn't stored
+        self.generation = 0
+        self.hits = self.misses = 0
+
+    def _entry(self, key, now, interval):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self.entries[key]
+                entry = None
+        if entry is not None and now - entry[3] >= interval:
+            if _shared_version(key[0]) != entry[2]:
+                self.forget(key[0])
+                return None
+            entry[3] = now
+        return entry
+
+    def get(self, key, config):
+        now = time.monotonic()
+        entry = self._entry(key, now, config["CHECK_INTERVAL"])
+        with self.lock:
+            if entry is None or key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        # Kept pickled so a view changing request.user can't alter another request's copy
+        return pickle.loads(entry[1])
+
+    def put(self, key, user, version, generation, config):
+        value = pickle.dumps(user, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            if generation != self.generation:
+                return
+            now = time.monotonic()
+            self.entries[key] = [now + config["TIMEOUT"], value, version, now]
+            self.entries.move_to_end(key)
+            while len(self.entries) > config["MAX_ENTRIES"]:
+                self.entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self.lock:
+            self.generation += 1
+            for key in [key for key in self.entries if str(key[0]) == str(user_id)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+user_cache = UserCache()
+
+
+def user_changed(user_id):
+    """Drop a user's cached entries in this worker now, in the others at their next version check."""
+    cache.set(f"{CACHE_AUTH_USER_VERSION}{user_id}", uuid.uuid4().hex, timeout=None)
+    user_cache.forget(user_id)
 
 
 class CookieJWTAuthentication(JWTAuthentication):
@@ -19,3 +134,17 @@ class CookieJWTAuthentication(JWTAuthentication):
 
         # Fall back to Authorization header
         return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        config = _config()
+        if not config["TIMEOUT"]:
+            return super().get_user(validated_token)
+        key = (validated_token.get(api_settings.USER_ID_CLAIM), validated_token.get("iat"))
+        user = user_cache.get(key, config)
+        if user is None:
+            generation = user_cache.generation
+            # Read before the row, so a change committed in between makes the entry stale, not current
+            version = _shared_version(key[0])
+            user = super().get_user(validated_token)
+            user_cache.put(key, user, version, generation, config)
+        return user
@@ -0,0 +1,448 @@
+"""Cache backends shared by the gunicorn workers on one host.
+
+``SQLiteCache`` keeps every entry in one WAL-mode SQLite file: a cache hit is
+one primary-key lookup, expired rows are swept incrementally through an
+expiry index, and integers are stored natively so ``incr`` is a single atomic
+``UPDATE ... RETURNING``.
+
+``TieredCache`` is a per-process LRU in front of a shared cache.
+Configured in ``settings.CACHES``; ``LOCATION`` names the shared cache alias
+(the tier every gunicorn worker sees). Reads are served from the local tier
+while its entry is fresh, otherwise from the shared tier, and the result —
+including "not found" — is kept locally for the key's L1 TTL. Writes go
+through to both tiers.
+
+L1 TTLs are chosen per key prefix (``L1_TIMEOUTS``; the longest matching prefix
+wins, ``L1_TIMEOUT`` otherwise). 0 bypasses the local tier, for counters that
+are read-modify-written. Deletes of keys whose L1 TTL is longer than
+``EPOCH_CHECK_INTERVAL`` bump a shared epoch; every worker compares it with its
+own at most once per interval and drops its local tier when it moved, so
+``cache.delete(CACHE_BLOG_POST_LIST)`` reaches all workers within that interval.
+``set``/``add`` only write through: they are how a miss is refilled, and a
+refill must not flush every worker, so invalidate by deleting. Keys with
+shorter L1 TTLs simply expire before an epoch check would help.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+EPOCH_KEY = "tiered_cache_epoch"
+
+# _NOT_LOCAL: no fresh local entry; _ABSENT: cached "not in the shared tier either"
+_NOT_LOCAL = object()
+_ABSENT = object()
+
+# Local tiers are per process (like LocMemCache), shared by all threads of a worker
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class _LocalStore:
+    def __init__(self):
+        self.entries = OrderedDict()  # full key -> (expires_at, pickled value or _ABSENT)
+        self.lock = threading.Lock()
+        self.epoch = None
+        self.epoch_checked_at = 0.0
+        self.stats = {"hits": 0, "misses": 0, "shared_hits": 0, "shared_misses": 0, "evictions": 0, "resets": 0}
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = location or "shared"
+        self._max_entries = options.get("L1_MAX_ENTRIES", 1000)
+        self._default_l1_timeout = options.get("L1_TIMEOUT", 1)
+        # Longest prefix first so the most specific rule wins
+        self._l1_timeouts = sorted(options.get("L1_TIMEOUTS", {}).items(), key=lambda item: -len(item[0]))
+        self._epoch_interval = options.get("EPOCH_CHECK_INTERVAL", 1)
+        with _stores_lock:
+            self._store = _stores.setdefault(self._shared_alias, _LocalStore())
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def l1_timeout(self, key):
+        for prefix, timeout in self._l1_timeouts:
+            if key.startswith(prefix):
+                return timeout
+        return self._default_l1_timeout
+
+    def _full_key(self, key, version):
+        return self.shared.make_and_validate_key(key, version=version)
+
+    # Local tier
+
+    def _check_epoch(self, now):
+        store = self._store
+        if now - store.epoch_checked_at < self._epoch_interval:
+            return
+        store.epoch_checked_at = now
+        epoch = self.shared.get(EPOCH_KEY, 0)
+        if epoch != store.epoch:
+            self._reset_local(epoch)
+
+    def _reset_local(self, epoch):
+        store = self._store
+        with store.lock:
+            if store.epoch is not None:
+                store.stats["resets"] += 1
+            store.entries.clear()
+            store.epoch = epoch
+
+    def _bump_epoch(self):
+        """Tell other workers their local tiers are stale."""
+        try:
+            epoch = self.shared.incr(EPOCH_KEY)
+        except ValueError:
+            self.shared.add(EPOCH_KEY, 0, timeout=None)
+            epoch = self.shared.incr(EPOCH_KEY)
+        store = self._store
+        if store.epoch is not None and epoch == store.epoch + 1:
+            # Only our own bump since the last check: the local tier is current
+            store.epoch = epoch
+        else:
+            self._reset_local(epoch)
+
+    def _local_get(self, full_key, now):
+        store = self._store
+        with store.lock:
+            entry = store.entries.get(full_key)
+            if entry is None:
+                return _NOT_LOCAL
+            expires_at, value = entry
+            if expires_at <= now:
+                del store.entries[full_key]
+                return _NOT_LOCAL
+            store.entries.move_to_end(full_key)
+        # Values are kept pickled, like LocMemCache, so callers can't mutate a shared copy
+        return value if value is _ABSENT else pickle.loads(value)
+
+    def _local_set(self, full_key, value, l1_timeout, shared_timeout, now):
+        if l1_timeout <= 0:
+            return
+        if shared_timeout is not None:
+            l1_timeout = min(l1_timeout, shared_timeout)
+        if value is not _ABSENT:
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        store = self._store
+        with store.lock:
+            store.entries[full_key] = (now + l1_timeout, value)
+            store.entries.move_to_end(full_key)
+            while len(store.entries) > self._max_entries:
+                store.entries.popitem(last=False)
+                store.stats["evictions"] += 1
+
+    def _local_delete(self, full_key):
+        store = self._store
+        with store.lock:
+            store.entries.pop(full_key, None)
+
+    def _count(self, stat):
+        with self._store.lock:
+            self._store.stats[stat] += 1
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        l1_timeout = self.l1_timeout(key)
+        if l1_timeout <= 0:
+            return self.shared.get(key, default, version=version)
+        full_key = self._full_key(key, version)
+        now = time.monotonic()
+        self._check_epoch(now)
+        value = self._local_get(full_key, now)
+        if value is not _NOT_LOCAL:
+            self._count("hits")
+            return default if value is _ABSENT else value
+        self._count("misses")
+        value = self.shared.get(key, _ABSENT, version=version)
+        self._count("shared_misses" if value is _ABSENT else "shared_hits")
+        self._local_set(full_key, value, l1_timeout, None, now)
+        return default if value is _ABSENT else value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout=timeout, version=version)
+        self._after_write(key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout=timeout, version=version)
+        if added:
+            self._after_write(key, value, timeout, version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self.shared.delete(key, version=version)
+        if self.l1_timeout(key) > self._epoch_interval:
+            self._bump_epoch()
+        self._after_write(key, _ABSENT, DEFAULT_TIMEOUT, version)
+        return deleted
+
+    def incr(self, key, delta=1, version=None):
+        value = self.shared.incr(key, delta, version=version)
+        self._local_delete(self._full_key(key, version))
+        return value
+
+    def has_key(self, key, version=None):
+        return self.get(key, _ABSENT, version=version) is not _ABSENT
+
+    def clear(self):
+        self.shared.clear()
+        self._reset_local(None)
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def _after_write(self, key, value, timeout, version):
+        l1_timeout = self.l1_timeout(key)
+        if l1_timeout <= 0:
+            return
+        shared_timeout = self.shared.get_backend_timeout(timeout)
+        if shared_timeout is not None:
+            shared_timeout = max(shared_timeout - time.time(), 0)
+        now = time.monotonic()
+        # A pending epoch reset must happen before the fresh value is stored, not wipe it after
+        self._check_epoch(now)
+        self._local_set(self._full_key(key, version), value, l1_timeout, shared_timeout, now)
+
+    def stats(self):
+        """Local-tier counters of this process."""
+        store = self._store
+        with store.lock:
+            stats = dict(store.stats, size=len(store.entries), epoch=store.epoch)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
+
+
+class SQLiteCache(BaseCache):
+    """Cache entries as rows of one WAL-mode SQLite file (``LOCATION``).
+
+    Values are pickled, except plain ints, which are stored as SQLite integers
+    so ``incr``/``decr`` happen inside one UPDATE. Every ``SWEEP_EVERY``
+    writes, up to ``SWEEP_BATCH`` expired rows are deleted through the
+    ``expires`` index; if the table is still over ``MAX_ENTRIES``, the
+    ``1 / CULL_FREQUENCY`` entries closest to expiry are culled. Triggers keep
+    the row count in ``cache_size`` so a sweep never counts the table.
+    Connections are per thread and reopened after fork.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)",
+        "CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), rows INTEGER NOT NULL)",
+        "CREATE TRIGGER IF NOT EXISTS cache_inserted AFTER INSERT ON cache "
+        "BEGIN UPDATE cache_size SET rows = rows + 1; END",
+        "CREATE TRIGGER IF NOT EXISTS cache_deleted AFTER DELETE ON cache "
+        "BEGIN UPDATE cache_size SET rows = rows - 1; END",
+    )
+    LIVE = "(expires IS NULL OR expires > :now)"
+    # SQLite caps bound parameters per statement; stay well below it
+    CHUNK_SIZE = 500
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._location = str(location)
+        self._busy_timeout = options.get("BUSY_TIMEOUT", 5)
+        self._sweep_every = options.get("SWEEP_EVERY", 100)
+        self._sweep_batch = options.get("SWEEP_BATCH", 500)
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._location)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self._location, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            # In WAL mode NORMAL can't corrupt the file; a power cut only loses the last writes
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in self.SCHEMA:
+                    conn.execute(statement)
+                # Counted once, in the transaction that creates the triggers, for files that predate them
+                if conn.execute("SELECT 1 FROM cache_size").fetchone() is None:
+                    conn.execute("INSERT INTO cache_size (id, rows) SELECT 0, count(*) FROM cache")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _encode(value):
+        if type(value) is int and -(2**63) <= value < 2**63:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(raw):
+        return raw if isinstance(raw, int) else pickle.loads(raw)
+
+    def _wrote(self, count=1):
+        with self._writes_lock:
+            self._writes += count
+            if self._writes < self._sweep_every:
+                return
+            self._writes = 0
+        self.sweep()
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = (
+            self._connection()
+            .execute(f"SELECT value FROM cache WHERE key = :key AND {self.LIVE}", {"key": key, "now": time.time()})
+            .fetchone()
+        )
+        return default if row is None else self._decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._connection().execute(
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+            (key, self._encode(value), self.get_backend_timeout(timeout)),
+        )
+        self._wrote()
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        # Insert, or take over an expired row; a live row makes the upsert a no-op
+        cursor = self._connection().execute(
+            "INSERT INTO cache (key, value, expires) VALUES (:key, :value, :expires) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires "
+            "WHERE cache.expires IS NOT NULL AND cache.expires <= :now",
+            {
+                "key": key,
+                "value": self._encode(value),
+                "expires": self.get_backend_timeout(timeout),
+                "now": time.time(),
+            },
+        )
+        self._wrote()
+        return cursor.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            f"UPDATE cache SET expires = :expires WHERE key = :key AND {self.LIVE}",
+            {"key": key, "expires": self.get_backend_timeout(timeout), "now": time.time()},
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._connection().execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = (
+            self._connection()
+            .execute(f"SELECT 1 FROM cache WHERE key = :key AND {self.LIVE}", {"key": key, "now": time.time()})
+            .fetchone()
+        )
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        row = (
+            self._connection()
+            .execute(
+                f"UPDATE cache SET value = value + :delta "
+                f"WHERE key = :key AND typeof(value) = 'integer' AND {self.LIVE} RETURNING value",
+                {"key": full_key, "delta": delta, "now": time.time()},
+            )
+            .fetchone()
+        )
+        if row is not None:
+            return row[0]
+        # Missing (ValueError) or a pickled number: fall back to get-and-set
+        return super().incr(key, delta, version=version)
+
+    def get_many(self, keys, version=None):
+        full_keys = {self.make_and_validate_key(key, version=version): key for key in keys}
+        conn = self._connection()
+        now = time.time()
+        found = {}
+        chunk_keys = list(full_keys)
+        for start in range(0, len(chunk_keys), self.CHUNK_SIZE):
+            chunk = chunk_keys[start : start + self.CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND (expires IS NULL OR expires > ?)",
+                (*chunk, now),
+            )
+            for full_key, raw in rows:
+                found[full_keys[full_key]] = self._decode(raw)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._encode(value), expires)
+            for key, value in data.items()
+        ]
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                rows,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._wrote(len(rows))
+        return []
+
+    def delete_many(self, keys, version=None):
+        conn = self._connection()
+        conn.executemany(
+            "DELETE FROM cache WHERE key = ?", [(self.make_and_validate_key(key, version=version),) for key in keys]
+        )
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache")
+
+    def sweep(self):
+        """Delete one batch of expired rows, then cull if still over MAX_ENTRIES. Returns rows removed."""
+        conn = self._connection()
+        removed = conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache WHERE expires <= ? LIMIT ?)",
+            (time.time(), self._sweep_batch),
+        ).rowcount
+        (count,) = conn.execute("SELECT rows FROM cache_size").fetchone()
+        if count > self._max_entries:
+            cull = count // self._cull_frequency if self._cull_frequency else count
+            # Soonest-expiring first, entries without expiry last; both walk the expires index
+            for condition in ("expires IS NOT NULL ORDER BY expires", "expires IS NULL"):
+                culled = conn.execute(
+                    f"DELETE FROM cache WHERE key IN (SELECT key FROM cache WHERE {condition} LIMIT ?)", (cull,)
+                ).rowcount
+                removed += culled
+                cull -= culled
+                if not cull:
+                    break
+        return removed
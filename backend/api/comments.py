@@ -0,0 +1,90 @@
+"""Comment tree for a blog post, loaded with one query.
+
+All comments of the post are fetched as plain rows ordered by
+(``parent_id``, ``-created_at``, ``-id``) — the ``(post, parent, -created_at,
+-id)`` index order — and linked into a tree in Python in O(n), so a thread of
+any depth costs a single query instead of a prefetch per level.
+
+Replies are nested at most ``max_depth`` levels below a top-level comment;
+deeper ones are listed, in depth-first order, at the last level under their
+ancestor there, so a deep thread is flattened rather than cut off. Nodes are
+the dicts ``BlogCommentSerializer`` would produce, built directly from the
+rows without a serializer instance per comment.
+"""
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import BlogComment
+
+COMMENT_FIELDS = ("id", "post_id", "parent_id", "author_name", "content", "likes", "created_at", "updated_at")
+
+# One field instance formats every timestamp, exactly as the serializer does
+_datetime = serializers.DateTimeField()
+
+
+def max_depth_setting() -> int:
+    return getattr(settings, "COMMENT_MAX_DEPTH", 5)
+
+
+def _node(row):
+    return {
+        "id": row["id"],
+        "post": row["post_id"],
+        "parent": row["parent_id"],
+        "author_name": row["author_name"],
+        "content": row["content"],
+        "likes": row["likes"],
+        "created_at": _datetime.to_representation(row["created_at"]),
+        "updated_at": _datetime.to_representation(row["updated_at"]),
+        "replies": [],
+    }
+
+
+def build_tree(rows, max_depth: int) -> list[dict]:
+    """Link rows (grouped by parent, newest first within a parent) into nested nodes.
+
+    Top-level comments are level 0 and no reply is placed below level
+    ``max_depth`` (0 lists no replies at all).
+    """
+    children = {}
+    roots = []
+    for row in rows:
+        node = _node(row)
+        if row["parent_id"] is None:
+            roots.append(node)
+        else:
+            children.setdefault(row["parent_id"], []).append(node)
+
+    # Depth-first from the roots; replies of orphaned parents (other post, deleted) are unreachable
+    stack = [(root, 0) for root in reversed(roots)]
+    while stack:
+        node, depth = stack.pop()
+        replies = children.get(node["id"], [])
+        if depth + 1 < max_depth:
+            node["replies"] = replies
+            stack.extend((reply, depth + 1) for reply in reversed(replies))
+        elif depth + 1 == max_depth:
+            node["replies"] = _flatten(replies, children)
+    return roots
+
+
+def _flatten(replies, children):
+    """Every descendant of ``replies``, as one list in depth-first order."""
+    flat = []
+    stack = list(reversed(replies))
+    while stack:
+        node = stack.pop()
+        flat.append(node)
+        stack.extend(reversed(children.get(node["id"], [])))
+    return flat
+
+
+def load_comment_tree(post_id, max_depth: int | None = None) -> list[dict]:
+    """Top-level comments of a post, newest first, each with its nested ``replies``."""
+    if max_depth is None:
+        max_depth = max_depth_setting()
+    rows = (
+        BlogComment.objects.filter(post_id=post_id).order_by("parent_id", "-created_at", "-id").values(*COMMENT_FIELDS)
+    )
+    return build_tree(rows, max_depth)
@@ -0,0 +1,146 @@
+"""Conditional GET for the public blog endpoints (list, detail, categories).
+
+Each endpoint computes its validators before doing any serialization work:
+
+- ETag: a strong tag hashed from everything the response body depends on.
+  ``updated_at`` alone is not enough: view and like counters are bumped with
+  ``UPDATE ... F()`` (no ``updated_at`` change) and ``relative_date`` moves
+  with the clock, so those feed the tag too. List tags don't read the posts at
+  all: they hash the query parameters and a *list generation*, which
+  ``blog_list_changed()`` bumps when a post is saved or deleted (``api.signals``)
+  and when the view/like counters are flushed (``api.ingest``, ``api.likes``).
+  Writes that bypass those must call it themselves.
+- Last-Modified: the post's ``updated_at``, for details only. It can't see
+  counter changes, so clients that send both headers are judged on
+  ``If-None-Match`` alone (RFC 9110 §13.2.2, as Django does). Lists and
+  categories send none: the newest ``updated_at`` stays put when a post is
+  deleted or unpublished, so ``If-Modified-Since`` alone would get a stale 304.
+
+A matching request gets a bodiless 304 carrying the same validators and
+caching headers. Anonymous responses are ``public`` so the CDN can store them
+and revalidate every ``SHARED_MAX_AGE`` seconds; staff responses include
+drafts and are ``private``.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .constants import CACHE_BLOG_LIST_GENERATION, ONE_DAY, ONE_HOUR
+from .models import BlogPost
+
+# How long a shared cache may serve a stored response before revalidating
+# (matches the 30 s server-side cache of the public post list)
+SHARED_MAX_AGE = 30
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: object  # aware datetime or None
+
+
+def _etag(*parts):
+    return quote_etag(hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest())
+
+
+def _clock_bucket(newest, now):
+    """Clock position at the granularity of the newest post's ``relative_date``.
+
+    Younger posts' relative dates change most often (every minute during the
+    first hour, hourly during the first day, daily after that), so this is how
+    often a list that contains ``newest`` can change on its own.
+    """
+    if newest is None:
+        return None
+    age = (now - newest).total_seconds()
+    step = 60 if age < ONE_HOUR else ONE_HOUR if age < ONE_DAY else ONE_DAY
+    return int(now.timestamp()) // step
+
+
+def _is_staff(request):
+    return bool(request.user and request.user.is_staff)
+
+
+def _bump_list_generation():
+    try:
+        cache.incr(CACHE_BLOG_LIST_GENERATION)
+    except ValueError:
+        cache.add(CACHE_BLOG_LIST_GENERATION, 1, timeout=None)
+
+
+def blog_list_changed(using="default"):
+    """Retire every blog list ETag; again on commit if inside a transaction."""
+    _bump_list_generation()
+    if connections[using].in_atomic_block:
+        # A reader between now and the commit could tag the old rows with the new generation
+        transaction.on_commit(_bump_list_generation, using=using)
+
+
+def _newest_post_date(generation):
+    """Newest ``date`` of any post (drafts too), looked up once per list generation."""
+    key = f"{CACHE_BLOG_LIST_GENERATION}:{generation}:newest"
+    cached = cache.get(key)
+    if cached is None:
+        # Wrapped so an empty table (None) is cached too; an index seek on (-date, -id)
+        cached = (BlogPost.objects.aggregate(newest=Max("date"))["newest"],)
+        cache.set(key, cached, timeout=ONE_DAY)
+    return cached[0]
+
+
+def post_list_validators(request):
+    """List validators from the list generation and the query, without touching the posts. ETag only."""
+    generation = cache.get(CACHE_BLOG_LIST_GENERATION, 0)
+    # The newest post overall is at least as young as any list's newest, so its bucket is never too coarse
+    etag = _etag(
+        "list",
+        sorted(request.query_params.lists()),
+        _is_staff(request),
+        generation,
+        _clock_bucket(_newest_post_date(generation), timezone.now()),
+    )
+    return Validators(etag, None)
+
+
+def post_validators(post, relative_date):
+    """Validators for one post; ``relative_date`` as the serializer would render it."""
+    etag = _etag("post", post.id, post.updated_at, post.view_count, post.likes, relative_date)
+    return Validators(etag, post.updated_at)
+
+
+def category_validators(queryset):
+    """Validators for the category counts over ``queryset`` (the published posts). ETag only."""
+    summary = queryset.order_by().aggregate(updated=Max("updated_at"), count=Count("id"))
+    return Validators(_etag("categories", summary["updated"], summary["count"]), None)
+
+
+def not_modified(request, validators):
+    """A 304 response if the request's preconditions match ``validators``, else None."""
+    last_modified = validators.last_modified
+    response = get_conditional_response(
+        request,
+        etag=validators.etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, validators, request)
+    return response
+
+
+def set_validators(response, validators, request):
+    """Add ETag, Last-Modified and caching headers to ``response``."""
+    response["ETag"] = validators.etag
+    if validators.last_modified:
+        response["Last-Modified"] = http_date(validators.last_modified.timestamp())
+    if _is_staff(request):
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=0, s_maxage=SHARED_MAX_AGE)
+    # Staff see drafts on the same URLs; authentication comes from the cookie or header
+    patch_vary_headers(response, ("Authorization", "Cookie"))
+    return response
@@ -5,7 +5,9 @@ ONE_DAY = 86400
 # Cache keys
 CACHE_BLOG_CATEGORIES = "blog_categories"
 CACHE_BLOG_POST_LIST = "blog_post_list"
-CACHE_ADMIN_STATS = "admin_stats"
+CACHE_BLOG_LIST_GENERATION = "blog_list_generation"
+CACHE_SPAM_RULES_VERSION = "spam_rules_version"
+CACHE_AUTH_USER_VERSION = "auth_user_version_"  # + user id
 
 SPAM_THRESHOLD = 2
 
@@ -40,9 +42,3 @@ SPAM_KEYWORDS = [
     "투자",
     "홍보",
 ]
-
-
-def is_spam(text: str) -> bool:
-    """Check if text contains too many spam keywords."""
-    text_lower = text.lower()
-    return sum(1 for kw in SPAM_KEYWORDS if kw in text_lower) >= SPAM_THRESHOLD
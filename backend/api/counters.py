@@ -0,0 +1,63 @@
+"""Running totals for the admin dashboard (``StatCounters``, one row).
+
+``admin_stats`` used to run ``COUNT(*)`` over users, posts, messages and the
+unbounded ``SiteVisit`` table. Instead every write path adjusts the totals
+with a single ``UPDATE ... SET x = x + n``:
+
+- users, posts, messages: ``post_save`` (created) / ``post_delete`` signals
+  (api/signals.py);
+- visits: the visit buffer flush adds its batch size in the same transaction
+  as the insert, ``cleanup_sitevisits`` subtracts what it deleted.
+
+Writes that bypass these paths (``bulk_create``, ``QuerySet.update``, raw
+SQL, deleting visits from the Django admin) make the totals drift;
+``reconcile_counters`` recomputes them exactly and reports the drift.
+"""
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+
+from .models import BlogPost, Contact, SiteVisit, StatCounters
+
+COUNTER_PK = 1
+
+# Counter field -> model it counts
+COUNTED = {"users": User, "posts": BlogPost, "messages": Contact, "visits": SiteVisit}
+
+
+def adjust(field, delta, using="default"):
+    """Add ``delta`` to one total."""
+    if not delta:
+        return
+    updated = StatCounters.objects.using(using).filter(pk=COUNTER_PK).update(**{field: F(field) + delta})
+    if not updated:
+        # Row missing (e.g. tables flushed): start over from exact counts, which already include this change
+        reconcile(using)
+
+
+def read(using="default"):
+    """All totals, from the single row."""
+    values = StatCounters.objects.using(using).filter(pk=COUNTER_PK).values(*COUNTED).first()
+    if values is None:
+        reconcile(using)
+        values = StatCounters.objects.using(using).filter(pk=COUNTER_PK).values(*COUNTED).first()
+    return values
+
+
+def reconcile(using="default"):
+    """Recompute every total exactly; returns {field: (stored, exact)} for the ones that drifted."""
+    with transaction.atomic(using=using):
+        # Lock the row first: concurrent adjustments wait and land on top of the exact values
+        counters = StatCounters.objects.using(using).select_for_update().filter(pk=COUNTER_PK).first()
+        if counters is None:
+            counters = StatCounters(pk=COUNTER_PK)
+        drift = {}
+        for field, model in COUNTED.items():
+            exact = model.objects.using(using).count()
+            stored = getattr(counters, field)
+            if stored != exact:
+                drift[field] = (stored, exact)
+                setattr(counters, field, exact)
+        counters.save(using=using)
+    return drift
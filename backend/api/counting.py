@@ -0,0 +1,122 @@
+"""Row counts for paginated responses.
+
+Every page-number page reports ``count``, which is a ``SELECT COUNT(*)`` over
+the filtered queryset. Views pick how that number is produced:
+
+- ``EXACT``: the plain ``COUNT(*)``.
+- ``CACHED``: the exact count, cached per query (its SQL and parameters) and
+  model *generation*. ``invalidate_counts(model)`` bumps the generation, which
+  orphans every cached count of that model; ``api.signals`` calls it when a
+  tracked model is saved or deleted. Writes that bypass signals
+  (``bulk_create``, ``update``) are covered by ``CACHE_TIMEOUT``.
+- ``ESTIMATED``: for an unfiltered queryset, the planner's row estimate
+  (PostgreSQL ``pg_class.reltuples``, SQLite ``sqlite_stat1`` as written by
+  ``ANALYZE``). Small tables, filtered querysets and databases without
+  statistics fall back to ``CACHED``. SQLite never analyzes on its own:
+  ``manage.py analyze_db`` (nightly via ``make setup-cron``) keeps
+  ``sqlite_stat1`` current.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+EXACT = "exact"
+CACHED = "cached"
+ESTIMATED = "estimated"
+
+# Safety net for writes that don't send signals
+CACHE_TIMEOUT = 300
+
+# Below this many rows an exact count is cheap and estimates are coarse
+ESTIMATE_THRESHOLD = 10000
+
+
+def _generation_key(model):
+    return f"count_generation:{model._meta.label_lower}"
+
+
+def _bump_generation(model):
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def invalidate_counts(model, using="default"):
+    """Drop every cached count of ``model``; again on commit if inside a transaction."""
+    _bump_generation(model)
+    if connections[using].in_atomic_block:
+        # A reader between now and the commit could cache the old count under the new generation
+        transaction.on_commit(lambda: _bump_generation(model), using=using)
+
+
+def cached_count(queryset):
+    queryset = queryset.order_by()
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    generation = cache.get(_generation_key(queryset.model), 0)
+    signature = hashlib.blake2b(repr((queryset.db, sql, params)).encode(), digest_size=16).hexdigest()
+    key = f"count:{queryset.model._meta.label_lower}:{generation}:{signature}"
+    value = cache.get(key)
+    if value is None:
+        value = queryset.count()
+        cache.set(key, value, timeout=CACHE_TIMEOUT)
+    return value
+
+
+def estimated_count(model, using="default"):
+    """The planner's row estimate for ``model``'s table, or None if there isn't one."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+            # -1 until the table is first vacuumed or analyzed
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # Each index row's stat starts with the row count; partial indexes see fewer rows
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+            counts = [int(stat.split()[0]) for (stat,) in cursor.fetchall() if stat]
+            return max(counts) if counts else None
+    return None
+
+
+def count(queryset, strategy=EXACT):
+    """``queryset.count()``, produced according to ``strategy``."""
+    if strategy == ESTIMATED:
+        query = queryset.query
+        if not query.has_filters() and not query.distinct and not query.is_sliced:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                return estimate
+        strategy = CACHED
+    if strategy == CACHED:
+        return cached_count(queryset)
+    return queryset.count()
+
+
+class CountingPaginator(Paginator):
+    """Django paginator whose ``count`` follows a count strategy"""
+
+    def __init__(self, *args, count_strategy=EXACT, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return count(self.object_list, self.count_strategy)
+        return super().count
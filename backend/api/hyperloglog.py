@@ -0,0 +1,96 @@
+"""HyperLogLog cardinality sketches for approximate unique-visitor counts.
+
+A sketch keeps ``2**p`` one-byte registers; with the default ``p=12`` that is
+4 KiB before compression. The relative standard error is ``1.04 / sqrt(2**p)``
+— about 1.6% at ``p=12`` — so roughly 95% of estimates land within ±3.3% of
+the true count, whatever the number of distinct values. Below ``2.5 * 2**p``
+(~10k) linear counting takes over and estimates are close to exact. Sketches
+merge losslessly (register-wise max), so the unique count of any date range is
+the count of the merged daily sketches.
+"""
+
+import hashlib
+import math
+import zlib
+
+DEFAULT_PRECISION = 12
+_HASH_BITS = 64
+_INV_POW2 = [2.0**-i for i in range(_HASH_BITS + 1)]
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (Flajolet et al., 2007)"""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: bytes | None = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            self.registers = bytearray(self.size)
+        elif len(registers) != self.size:
+            raise ValueError(f"expected {self.size} registers, got {len(registers)}")
+        else:
+            self.registers = bytearray(registers)
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of ``count()`` as a fraction of the true cardinality."""
+        return 1.04 / math.sqrt(self.size)
+
+    def add(self, value: str):
+        h = _hash(value)
+        index = h >> (_HASH_BITS - self.precision)
+        rest_bits = _HASH_BITS - self.precision
+        rank = rest_bits - (h & ((1 << rest_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog"):
+        """Fold ``other`` into this sketch (union of the counted sets)."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    @classmethod
+    def union(cls, sketches) -> "HyperLogLog":
+        """Merge many sketches in one register pass (much faster than repeated ``merge``)."""
+        sketches = list(sketches)
+        if not sketches:
+            return cls()
+        precision = sketches[0].precision
+        if any(sketch.precision != precision for sketch in sketches):
+            raise ValueError("cannot merge sketches of different precision")
+        if len(sketches) == 1:
+            return cls(precision, sketches[0].registers)
+        return cls(precision, bytes(map(max, *(sketch.registers for sketch in sketches))))
+
+    def count(self) -> int:
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(_INV_POW2[r] for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is far more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        """Compact form: precision byte + zlib-compressed registers (sparse days compress well)."""
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview | None) -> "HyperLogLog":
+        """Inverse of ``to_bytes()``; empty data yields an empty default sketch."""
+        if not data:
+            return cls()
+        data = bytes(data)
+        return cls(precision=data[0], registers=zlib.decompress(data[1:]))
@@ -0,0 +1,285 @@
+"""Background write buffers — keep per-request DB writes off the request path.
+
+Buffers are per-process (one per gunicorn worker). A daemon thread drains each
+buffer every ``FLUSH_INTERVAL_MS`` or as soon as ``BATCH_SIZE`` items are
+pending, and an ``atexit`` hook flushes whatever is left when the worker shuts
+down (graceful exit, ``--max-requests`` recycling). With ``ASYNC`` off — the
+test default — every item is written inline so assertions can read the DB
+right after the request.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import counters
+from .bloom import BloomFilter
+from .conditional import blog_list_changed
+from .models import BlogPost, PostViewFilter, SiteVisit
+from .rollups import apply_visits
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundFlusher:
+    """Periodic flush loop shared by the write-behind buffers.
+
+    Subclasses implement ``_drain()`` (detach pending work under the lock) and
+    ``_write(batch)`` (persist it). ``setting_name`` names a settings dict whose
+    keys override ``defaults``. Buffers whose pending work is rows in the
+    database set ``durable``: a failed flush leaves them there for the next one.
+    """
+
+    setting_name = None
+    durable = False
+    defaults = {
+        "ASYNC": True,
+        "BATCH_SIZE": 100,
+        "FLUSH_INTERVAL_MS": 1000,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._atexit_registered = False
+        self._stats = {
+            "flushes": 0,
+            "flushed": 0,
+            "errors": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    @property
+    def config(self):
+        return {**self.defaults, **getattr(settings, self.setting_name or "", {})}
+
+    def _drain(self):
+        raise NotImplementedError
+
+    def _write(self, batch):
+        raise NotImplementedError
+
+    def _pending(self):
+        return 0
+
+    def _ensure_worker(self):
+        """Start the flusher thread lazily, and again in a forked child."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=f"{type(self).__name__}-flusher", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.config["FLUSH_INTERVAL_MS"] / 1000)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+    def flush(self):
+        """Write all pending items now. Returns the number of items written."""
+        with self._flush_lock:
+            # Raising here would end the worker thread's loop (_run)
+            try:
+                batch = self._drain()
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"{type(self).__name__} drain failed, retrying next flush: {e}")
+                return 0
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            try:
+                self._write(batch)
+            except Exception as e:
+                self._stats["errors"] += 1
+                fate = "kept for the next flush" if self.durable else "lost"
+                logger.error(f"{type(self).__name__} flush failed ({len(batch)} items {fate}): {e}")
+                return 0
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats["flushes"] += 1
+            self._stats["flushed"] += len(batch)
+            self._stats["last_flush_ms"] = elapsed_ms
+            self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], elapsed_ms)
+            self._stats["total_flush_ms"] += elapsed_ms
+            return len(batch)
+
+    def stats(self):
+        """Snapshot of this worker's counters (flush latency in milliseconds)."""
+        data = dict(self._stats)
+        total = data.pop("total_flush_ms")
+        data["avg_flush_ms"] = round(total / data["flushes"], 3) if data["flushes"] else 0.0
+        data["last_flush_ms"] = round(data["last_flush_ms"], 3)
+        data["max_flush_ms"] = round(data["max_flush_ms"], 3)
+        data["pending"] = self._pending()
+        return data
+
+
+class VisitBuffer(BackgroundFlusher):
+    """Bounded queue of unsaved ``SiteVisit`` rows, written with ``bulk_create``
+    together with the daily rollups (api/rollups.py).
+
+    When the queue is full new visits are dropped and counted rather than
+    blocking the request — analytics are best-effort, page views are not.
+    """
+
+    setting_name = "VISIT_BUFFER"
+    defaults = {
+        **BackgroundFlusher.defaults,
+        "MAX_SIZE": 5000,
+        "BATCH_SIZE": 200,
+        "FLUSH_INTERVAL_MS": 2000,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._queue = deque()
+        self._stats["dropped"] = 0
+
+    def record(self, visit: SiteVisit):
+        config = self.config
+        if not config["ASYNC"]:
+            self._write([visit])
+            self._stats["flushed"] += 1
+            return
+
+        with self._lock:
+            if len(self._queue) >= config["MAX_SIZE"]:
+                self._stats["dropped"] += 1
+                dropped = self._stats["dropped"]
+            else:
+                self._queue.append(visit)
+                dropped = 0
+            pending = len(self._queue)
+
+        if dropped:
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(f"Visit buffer full ({config['MAX_SIZE']}), {dropped} visits dropped so far")
+            return
+
+        self._ensure_worker()
+        if pending >= config["BATCH_SIZE"]:
+            self._wake.set()
+
+    def _pending(self):
+        return len(self._queue)
+
+    def _drain(self):
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+        return batch
+
+    def _write(self, batch):
+        # Insert first so the transaction takes the write lock before the rollups read anything
+        with transaction.atomic():
+            SiteVisit.objects.bulk_create(batch, batch_size=self.config["BATCH_SIZE"])
+            apply_visits(batch)
+            counters.adjust("visits", len(batch))
+
+
+class ViewCountBuffer(BackgroundFlusher):
+    """Per-post views, deduplicated and applied as one ``UPDATE`` per post per flush.
+
+    Views are held as post id -> visitor keys. At flush time each post's
+    visitors are checked against that day's Bloom filter (``PostViewFilter``),
+    and only the ones not seen yet today are added to ``view_count``. A popular
+    post therefore gets one row update every ``FLUSH_INTERVAL_MS`` per worker
+    instead of one per view, and the displayed count lags by at most that
+    interval. Filters are sized for ``DEDUPE_CAPACITY`` visitors per post per
+    day at ``DEDUPE_ERROR_RATE``; previous days' filters are deleted.
+    """
+
+    setting_name = "VIEW_COUNT_BUFFER"
+    defaults = {
+        **BackgroundFlusher.defaults,
+        "BATCH_SIZE": 500,
+        "FLUSH_INTERVAL_MS": 5000,
+        "DEDUPE_CAPACITY": 10000,
+        "DEDUPE_ERROR_RATE": 0.01,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._visitors = defaultdict(set)
+        self._rotated_on = None
+
+    def record(self, post_id: int, visitor: str):
+        config = self.config
+        if not config["ASYNC"]:
+            self._write({post_id: {visitor}})
+            self._stats["flushed"] += 1
+            return
+
+        with self._lock:
+            self._visitors[post_id].add(visitor)
+            pending_posts = len(self._visitors)
+
+        self._ensure_worker()
+        if pending_posts >= config["BATCH_SIZE"]:
+            self._wake.set()
+
+    def _pending(self):
+        return sum(len(visitors) for visitors in self._visitors.values())
+
+    def _drain(self):
+        with self._lock:
+            batch, self._visitors = self._visitors, defaultdict(set)
+        return batch
+
+    def _write(self, batch):
+        today = timezone.localdate()
+        post_ids = sorted(batch)
+        counted = False
+        with transaction.atomic():
+            # Insert first so the transaction holds the write lock before reading any filter
+            PostViewFilter.objects.bulk_create(
+                [PostViewFilter(post_id=post_id, date=today) for post_id in post_ids], ignore_conflicts=True
+            )
+            filters = PostViewFilter.objects.select_for_update().filter(post_id__in=post_ids, date=today)
+            # Fixed id order so concurrent flushes from other workers can't deadlock
+            for view_filter in filters.order_by("post_id"):
+                new_views = self._mark_seen(view_filter, batch[view_filter.post_id])
+                if new_views:
+                    BlogPost.objects.filter(id=view_filter.post_id).update(view_count=F("view_count") + new_views)
+                    counted = True
+            if self._rotated_on != today:
+                PostViewFilter.objects.filter(date__lt=today).delete()
+                self._rotated_on = today
+        if counted:
+            blog_list_changed()
+
+    def _mark_seen(self, view_filter, visitors):
+        """Add ``visitors`` to the filter row; returns how many were new today."""
+        if view_filter.bits:
+            bloom = BloomFilter.from_bytes(view_filter.bits)
+        else:
+            bloom = BloomFilter.for_capacity(self.config["DEDUPE_CAPACITY"], self.config["DEDUPE_ERROR_RATE"])
+        new_views = sum(bloom.add(visitor) for visitor in visitors)
+        if new_views:
+            PostViewFilter.objects.filter(pk=view_filter.pk).update(bits=bloom.to_bytes())
+        return new_views
+
+
+visit_buffer = VisitBuffer()
+view_count_buffer = ViewCountBuffer()
@@ -0,0 +1,209 @@
+"""Like toggling with sharded like counters.
+
+``toggle_like`` used to run ``get_or_create``, maybe a delete, ``UPDATE likes
+= likes ± 1`` on the post or comment and ``refresh_from_db()`` — five or six
+statements, holding the write lock on the hot row. It is now three (four to
+unlike), none of which writes the post or comment row:
+
+1. ``INSERT ... ON CONFLICT DO NOTHING`` the like; when no row went in the IP
+   had already liked it, and the like is deleted instead;
+2. the ±1 is upserted into one of ``SHARDS`` ``LikeCounterShard`` rows of the
+   object, picked at random, so concurrent likes of one post update different
+   rows (PostgreSQL locks rows; SQLite serializes all writers regardless);
+3. the new count is read in one statement: ``likes`` plus the pending deltas.
+
+``LikeCounterFolder`` adds the shards into ``BlogPost.likes`` /
+``BlogComment.likes`` and deletes them every ``FLUSH_INTERVAL_MS``, on a worker
+thread like the write-behind buffers (api/ingest.py); with ``ASYNC`` off — the
+test default — it folds right after each toggle. Stored ``likes`` therefore
+lag by at most one interval; the count a toggle returns is always current.
+
+``liked_ids`` answers "which of these posts/comments has this IP liked" for a
+whole page with one ``IN`` query, caching the answers per IP briefly; a toggle
+drops that IP's cached answers.
+"""
+
+import random
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .conditional import blog_list_changed
+from .ingest import BackgroundFlusher
+from .models import BlogComment, BlogLike, BlogPost, CommentLike, LikeCounterShard
+
+# LikeCounterShard.target of each likeable model
+TARGETS = {BlogPost: "post", BlogComment: "comment"}
+MODELS = {target: model for model, target in TARGETS.items()}
+# target -> (like model, its field pointing at the liked object)
+LIKE_MODELS = {"post": (BlogLike, "post"), "comment": (CommentLike, "comment")}
+
+# Most ids one liked lookup request may ask about, per target
+MAX_LIKED_LOOKUP = 100
+# Liked-by-this-IP answers are cached per IP and target, up to LIKED_CACHE_SIZE ids, for LIKED_CACHE_TIMEOUT seconds
+LIKED_CACHE_TIMEOUT = 60
+LIKED_CACHE_SIZE = 1000
+
+
+class LikeCounterFolder(BackgroundFlusher):
+    """Folds ``LikeCounterShard`` rows into the ``likes`` columns"""
+
+    setting_name = "LIKE_COUNTERS"
+    durable = True
+    defaults = {
+        **BackgroundFlusher.defaults,
+        "SHARDS": 8,
+        "BATCH_SIZE": 1000,
+        "FLUSH_INTERVAL_MS": 5000,
+    }
+
+    def wake(self):
+        """Make sure this worker's fold thread runs; the shards are folded on its next tick, not now."""
+        self._ensure_worker()
+
+    def _pending(self):
+        return LikeCounterShard.objects.count()
+
+    def _drain(self):
+        return list(LikeCounterShard.objects.order_by("pk").values_list("pk", flat=True)[: self.config["BATCH_SIZE"]])
+
+    def _write(self, batch):
+        with transaction.atomic():
+            # No-op write first: it locks the rows (SQLite: the database) before their deltas are read,
+            # so a fold running in another worker waits instead of adding the same deltas again
+            LikeCounterShard.objects.filter(pk__in=batch).update(delta=F("delta"))
+            totals = defaultdict(int)
+            for target, object_id, delta in LikeCounterShard.objects.filter(pk__in=batch).values_list(
+                "target", "object_id", "delta"
+            ):
+                totals[target, object_id] += delta
+            # Fixed order so concurrent folds can't deadlock on the target rows
+            for (target, object_id), delta in sorted(totals.items()):
+                if delta:
+                    MODELS[target].objects.filter(pk=object_id).update(likes=F("likes") + delta)
+            LikeCounterShard.objects.filter(pk__in=batch).delete()
+        if any(delta for (target, _), delta in totals.items() if target == "post"):
+            blog_list_changed()
+
+        if len(batch) >= self.config["BATCH_SIZE"] and self.config["ASYNC"]:
+            self._wake.set()  # more shards waiting
+
+
+like_counter_folder = LikeCounterFolder()
+
+
+def _sql(model, field=None):
+    """Quoted table name, or column name of ``field``."""
+    if field is None:
+        return connection.ops.quote_name(model._meta.db_table)
+    return connection.ops.quote_name(model._meta.get_field(field).column)
+
+
+def toggle_like(obj, like_model, like_field, ip_address):
+    """Toggle a like on an object (one per IP).
+
+    Args:
+        obj: The object being liked (BlogPost or BlogComment)
+        like_model: The like model class (BlogLike or CommentLike)
+        like_field: The field name on the like model ('post' or 'comment')
+        ip_address: The IP address of the user
+
+    Returns:
+        dict with 'liked' (bool) and 'likes' (int)
+    """
+    config = like_counter_folder.config
+    model = type(obj)
+    target = TARGETS[model]
+    ip_value = like_model._meta.get_field("ip_address").get_db_prep_value(ip_address, connection)
+    created_value = like_model._meta.get_field("created_at").get_db_prep_value(timezone.now(), connection)
+
+    likes_table, liked_by, ip, created = (
+        _sql(like_model),
+        _sql(like_model, like_field),
+        _sql(like_model, "ip_address"),
+        _sql(like_model, "created_at"),
+    )
+    shards_table, shard_key, delta = (
+        _sql(LikeCounterShard),
+        ", ".join(_sql(LikeCounterShard, field) for field in ("target", "object_id", "shard")),
+        _sql(LikeCounterShard, "delta"),
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {likes_table} ({liked_by}, {ip}, {created}) VALUES (%s, %s, %s) "
+            f"ON CONFLICT ({liked_by}, {ip}) DO NOTHING",
+            [obj.pk, ip_value, created_value],
+        )
+        liked = cursor.rowcount == 1
+        if not liked:
+            cursor.execute(f"DELETE FROM {likes_table} WHERE {liked_by} = %s AND {ip} = %s", [obj.pk, ip_value])
+
+        cursor.execute(
+            f"INSERT INTO {shards_table} ({shard_key}, {delta}) VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT ({shard_key}) DO UPDATE SET {delta} = {shards_table}.{delta} + excluded.{delta}",
+            [target, obj.pk, random.randrange(config["SHARDS"]), 1 if liked else -1],
+        )
+
+        cursor.execute(
+            f"SELECT {_sql(model, 'likes')} + COALESCE((SELECT SUM({delta}) FROM {shards_table} "
+            f"WHERE {_sql(LikeCounterShard, 'target')} = %s AND {_sql(LikeCounterShard, 'object_id')} = %s), 0) "
+            f"FROM {_sql(model)} WHERE {_sql(model, 'id')} = %s",
+            [target, obj.pk, obj.pk],
+        )
+        row = cursor.fetchone()
+
+    cache.delete(_liked_key(target, ip_address))
+    if config["ASYNC"]:
+        like_counter_folder.wake()
+    else:
+        like_counter_folder.flush()
+    return {"liked": liked, "likes": row[0] if row else 0}
+
+
+def _liked_key(target, ip_address):
+    return f"liked:{target}:{ip_address}"
+
+
+def liked_ids(target, ip_address, ids) -> set[int]:
+    """The ``ids`` (posts or comments, per ``target``) this IP has liked.
+
+    Answers come from the IP's cached id -> liked map; ids not in it are
+    resolved with one ``IN`` query and added to it.
+    """
+    ids = set(ids)
+    if not ids:
+        return set()
+    key = _liked_key(target, ip_address)
+    known = cache.get(key) or {}
+    missing = ids - known.keys()
+    liked = {pk for pk in ids - missing if known[pk]}
+    if missing:
+        like_model, like_field = LIKE_MODELS[target]
+        found = set(
+            like_model.objects.filter(ip_address=ip_address, **{f"{like_field}_id__in": missing}).values_list(
+                f"{like_field}_id", flat=True
+            )
+        )
+        liked |= found
+        answers = {pk: pk in found for pk in missing}
+        known = {**known, **answers} if len(known) + len(answers) <= LIKED_CACHE_SIZE else answers
+        cache.set(key, known, timeout=LIKED_CACHE_TIMEOUT)
+    return liked
+
+
+def mark_liked(items, target, ip_address):
+    """Set ``liked`` on serialized posts or comments (and their nested ``replies``) in one lookup."""
+    nodes = []
+    stack = list(items)
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("replies") or ())
+    liked = liked_ids(target, ip_address, (node["id"] for node in nodes))
+    for node in nodes:
+        node["liked"] = node["id"] in liked
+    return items
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = "Refresh the planner statistics (ANALYZE) that ESTIMATED page counts read"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias (default: default)")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        # SQLite writes sqlite_stat1 only when asked; PostgreSQL's autovacuum also analyzes on its own
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.stdout.write(self.style.SUCCESS(f"Analyzed {connection.vendor} database {options['database']!r}."))
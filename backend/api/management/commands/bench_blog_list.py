@@ -0,0 +1,66 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.models import BlogPost
+from api.serializers import BLOG_POST_BODY_FIELDS, BlogPostListSerializer, BlogPostSerializer
+
+PARAGRAPH = "대규모 언어 모델의 추론 비용을 줄이는 방법을 실제 운영 사례와 함께 살펴봅니다. " * 8
+
+
+class Command(BaseCommand):
+    help = "Benchmark blog list payload size and latency: full serializer vs. card projection (rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1000, help="Posts to create (default: 1000)")
+        parser.add_argument("--paragraphs", type=int, default=20, help="Body paragraphs per post (default: 20)")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per case (default: 5)")
+
+    def _measure(self, serializer_class, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            payload = JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+            timings.append(time.perf_counter() - started)
+        return len(payload), statistics.median(timings)
+
+    def handle(self, *args, **options):
+        content = "\n\n".join([PARAGRAPH] * options["paragraphs"])
+        content_html = "".join(f"<p>{PARAGRAPH}</p>" for _ in range(options["paragraphs"]))
+        now = timezone.now()
+
+        with transaction.atomic():
+            BlogPost.objects.bulk_create(
+                [
+                    BlogPost(
+                        title=f"Benchmark post {i}",
+                        slug=f"bench-blog-list-{i}",
+                        description="카드에 표시되는 요약 설명입니다.",
+                        content=content,
+                        content_html=content_html,
+                        category="ai",
+                        tags=["llm", "inference"],
+                        date=now - timedelta(hours=i),
+                    )
+                    for i in range(options["posts"])
+                ],
+                batch_size=200,
+            )
+            published = BlogPost.objects.filter(is_published=True)
+
+            self.stdout.write(f"{published.count()} published posts, median of {options['repeat']} runs")
+            for page_size in (10, options["posts"]):
+                full_bytes, full_time = self._measure(BlogPostSerializer, published[:page_size], options["repeat"])
+                list_bytes, list_time = self._measure(
+                    BlogPostListSerializer, published.defer(*BLOG_POST_BODY_FIELDS)[:page_size], options["repeat"]
+                )
+                self.stdout.write(f"  page of {page_size}:")
+                self.stdout.write(f"    full serializer: {full_bytes / 1024:9.1f} KB {full_time * 1000:8.1f} ms")
+                self.stdout.write(f"    list projection: {list_bytes / 1024:9.1f} KB {list_time * 1000:8.1f} ms")
+
+            transaction.set_rollback(True)
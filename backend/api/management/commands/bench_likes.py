@@ -0,0 +1,78 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+
+from api.likes import like_counter_folder, toggle_like
+from api.models import BlogLike, BlogPost, LikeCounterShard
+
+
+def row_update_toggle(obj, like_model, like_field, ip_address):
+    """toggle_like as it was: get_or_create, UPDATE likes on the post row, refresh_from_db."""
+    with transaction.atomic():
+        like, created = like_model.objects.get_or_create(**{like_field: obj}, ip_address=ip_address)
+        if not created:
+            like.delete()
+        type(obj).objects.filter(id=obj.id).update(likes=F("likes") + (1 if created else -1))
+    obj.refresh_from_db()
+    return {"liked": created, "likes": obj.likes}
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent like toggling on one post: row update vs. sharded counters (cleans up after itself)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=50, help="Concurrent threads (default: 50)")
+        parser.add_argument("--toggles", type=int, default=40, help="Toggles per thread (default: 40)")
+
+    def _hammer(self, toggle, post, threads, toggles):
+        latencies, errors = [], []
+        start = threading.Barrier(threads)
+
+        def worker(n):
+            obj = BlogPost.objects.get(pk=post.pk)
+            start.wait()
+            for i in range(toggles):
+                # Each IP is liked, then unliked half-way through
+                ip_address = f"10.{n}.0.{i % (toggles // 2 or 1)}"
+                started = time.perf_counter()
+                try:
+                    toggle(obj, BlogLike, "post", ip_address)
+                except OperationalError as e:
+                    errors.append(e)
+                else:
+                    latencies.append(time.perf_counter() - started)
+            connection.close()
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return time.perf_counter() - started, sorted(latencies), errors
+
+    def handle(self, *args, **options):
+        threads, toggles = options["threads"], options["toggles"]
+        self.stdout.write(f"{threads} threads x {toggles} toggles on one post")
+        for label, toggle in (("row update", row_update_toggle), ("sharded counters", toggle_like)):
+            post = BlogPost.objects.create(title="Benchmark likes", description="D", content="C", category="ai")
+            try:
+                elapsed, latencies, errors = self._hammer(toggle, post, threads, toggles)
+                while like_counter_folder.flush():
+                    pass
+                post.refresh_from_db()
+                likes = BlogLike.objects.filter(post=post).count()
+                p50 = statistics.median(latencies) * 1000 if latencies else 0.0
+                p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+                self.stdout.write(
+                    f"  {label:16}: {len(latencies) / elapsed:7.1f} toggles/s   p50 {p50:7.2f} ms   "
+                    f"p99 {p99:7.2f} ms   {len(errors)} lock errors   "
+                    f"likes {post.likes} / {likes} rows{'' if post.likes == likes else '  MISMATCH'}"
+                )
+            finally:
+                LikeCounterShard.objects.filter(target="post", object_id=post.pk).delete()
+                post.delete()
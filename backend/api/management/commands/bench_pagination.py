@@ -0,0 +1,69 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import BlogPost
+from api.pagination import encode_cursor, keyset_paginate
+
+
+class Command(BaseCommand):
+    help = "Benchmark deep blog list pages: COUNT + OFFSET vs. keyset (rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=20000, help="Posts to create (default: 20000)")
+        parser.add_argument("--page-size", type=int, default=10, help="Page size (default: 10)")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per depth (default: 5)")
+
+    def _time(self, fetch, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fetch()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        page_size = options["page_size"]
+        with transaction.atomic():
+            BlogPost.objects.bulk_create(
+                [
+                    BlogPost(
+                        title=f"Benchmark post {i}",
+                        slug=f"bench-pagination-{i}",
+                        description="D",
+                        content="C",
+                        category="ai",
+                        date=now - timedelta(minutes=i),
+                    )
+                    for i in range(options["posts"])
+                ],
+                batch_size=500,
+            )
+            published = BlogPost.objects.filter(is_published=True).defer("content", "content_html")
+            ordering = ("-date", "-id")
+            rows = list(published.order_by(*ordering).values_list("date", "id"))
+
+            self.stdout.write(f"{len(rows)} published posts, page of {page_size}, median of {options['repeat']} runs")
+            for depth in (0.01, 0.5, 0.99):
+                offset = int(len(rows) * depth) // page_size * page_size
+
+                def by_offset():
+                    published.count()
+                    list(published.order_by(*ordering)[offset : offset + page_size])
+
+                cursor = encode_cursor(list(rows[offset - 1])) if offset else ""
+                offset_time = self._time(by_offset, options["repeat"])
+                keyset_time = self._time(
+                    lambda: keyset_paginate(published, ordering, cursor, page_size), options["repeat"]
+                )
+                self.stdout.write(
+                    f"  offset {offset:6}: COUNT+OFFSET {offset_time * 1000:7.2f} ms"
+                    f"   keyset {keyset_time * 1000:7.2f} ms"
+                )
+
+            transaction.set_rollback(True)
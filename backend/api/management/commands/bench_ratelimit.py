@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.ratelimit import SQLiteRateLimiter
+
+
+def _worker(location, rate, seconds, keys, limit, period, results):
+    """Issue `rate` hits per second for `seconds`, paced like a gunicorn worker under steady load."""
+    limiter = SQLiteRateLimiter(limit, period, LOCATION=location)
+    limiter.hit("warmup")
+    latencies = []
+    allowed = 0
+    interval = 1.0 / rate
+    next_at = time.perf_counter()
+    deadline = next_at + seconds
+    while next_at < deadline:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        key = f"10.0.{random.randrange(keys) // 256}.{random.randrange(256)}"
+        started = time.perf_counter()
+        allowed += limiter.hit(key)
+        latencies.append(time.perf_counter() - started)
+        next_at += interval
+    results.put((latencies, allowed))
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request overhead of the SQLite rate limiter across several processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=3, help="Concurrent processes (default: 3)")
+        parser.add_argument("--rate", type=int, default=1000, help="Total requests/second (default: 1000)")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration (default: 5)")
+        parser.add_argument("--keys", type=int, default=500, help="Distinct client IPs (default: 500)")
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        per_worker_rate = options["rate"] / workers
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            location = os.path.join(tmpdir, "ratelimit.sqlite3")
+            SQLiteRateLimiter(100, 3600, LOCATION=location).sweep()
+
+            ctx = multiprocessing.get_context("fork")
+            results = ctx.Queue()
+            procs = [
+                ctx.Process(
+                    target=_worker,
+                    args=(location, per_worker_rate, options["seconds"], options["keys"], 100, 3600, results),
+                )
+                for _ in range(workers)
+            ]
+            for proc in procs:
+                proc.start()
+            collected = [results.get() for _ in procs]
+            for proc in procs:
+                proc.join()
+
+        latencies = sorted(lat for worker_latencies, _ in collected for lat in worker_latencies)
+        allowed = sum(count for _, count in collected)
+        quantiles = statistics.quantiles(latencies, n=100)
+
+        self.stdout.write(f"{workers} workers, {len(latencies)} hits in {options['seconds']}s ({allowed} allowed)")
+        self.stdout.write(f"  achieved rate: {len(latencies) / options['seconds']:.0f} req/s")
+        self.stdout.write(f"  mean: {statistics.fmean(latencies) * 1e6:.1f} µs")
+        self.stdout.write(f"  p50:  {quantiles[49] * 1e6:.1f} µs")
+        self.stdout.write(f"  p95:  {quantiles[94] * 1e6:.1f} µs")
+        self.stdout.write(f"  p99:  {quantiles[98] * 1e6:.1f} µs")
+        self.stdout.write(f"  max:  {latencies[-1] * 1e6:.1f} µs")
@@ -0,0 +1,68 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from api.models import BlogPost
+from api.search import search_posts
+
+WORDS = (
+    "대규모 언어 모델 추론 비용 양자화 캐시 메모리 배포 파이프라인 데이터 학습 평가 검색 임베딩 "
+    "inference latency quantization retrieval embedding vector database training evaluation"
+).split()
+
+
+def _legacy(queryset, query):
+    """The previous ?search= filter"""
+    return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query) | Q(content__icontains=query))
+
+
+class Command(BaseCommand):
+    help = "Benchmark blog full-text search against the old icontains filter (rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=2000, help="Posts to create (default: 2000)")
+        parser.add_argument("--words", type=int, default=1500, help="Words per post body (default: 1500)")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per query (default: 5)")
+
+    def _time(self, build, query, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = build(BlogPost.objects.filter(is_published=True), query)
+            count = queryset.count()
+            list(queryset[:10])
+            timings.append(time.perf_counter() - started)
+        return count, statistics.median(timings)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        with transaction.atomic():
+            BlogPost.objects.bulk_create(
+                [
+                    BlogPost(
+                        title=" ".join(rng.choices(WORDS, k=6)),
+                        slug=f"bench-search-{i}",
+                        description=" ".join(rng.choices(WORDS, k=20)),
+                        content=" ".join(rng.choices(WORDS, k=options["words"])),
+                        category="ai",
+                    )
+                    for i in range(options["posts"])
+                ],
+                batch_size=200,
+            )
+            BlogPost.objects.filter(slug="bench-search-0").update(content="희귀한 토크나이저 문구가 들어 있는 글")
+
+            self.stdout.write(f"{options['posts']} posts x {options['words']} words, first page + count, median")
+            for query in ("토크나이저", "quantization", "언어 모델", "no such phrase here", "모델"):
+                legacy_count, legacy_time = self._time(_legacy, query, options["repeat"])
+                count, search_time = self._time(search_posts, query, options["repeat"])
+                self.stdout.write(
+                    f"  {query!r:24} icontains {legacy_time * 1000:8.1f} ms ({legacy_count} hits)"
+                    f"   search {search_time * 1000:8.1f} ms ({count} hits)"
+                )
+
+            transaction.set_rollback(True)
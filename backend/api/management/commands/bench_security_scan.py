@@ -0,0 +1,78 @@
+import re
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+from api.middleware import MALICIOUS_PATTERNS, RequestSecurityMiddleware
+
+LEGACY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in MALICIOUS_PATTERNS.values()]
+NAIVE_ALTERNATION = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in MALICIOUS_PATTERNS.items()), re.IGNORECASE
+)
+
+
+def _legacy_scan(request):
+    """The previous per-pattern loops over path, query values and the full body"""
+    for pattern in LEGACY_PATTERNS:
+        if pattern.search(request.path):
+            return True
+    for value in request.GET.values():
+        for pattern in LEGACY_PATTERNS:
+            if pattern.search(str(value)):
+                return True
+    if request.body:
+        body_str = request.body.decode("utf-8")
+        for pattern in LEGACY_PATTERNS:
+            if pattern.search(body_str):
+                return True
+    return False
+
+
+class Command(BaseCommand):
+    help = "Benchmark the request security pattern scan on large request bodies"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-mb", type=float, default=5.0, help="Body size in MB (default: 5)")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per case (default: 5)")
+
+    def _time(self, scan, request, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            scan(request)
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        size = int(options["size_mb"] * 1024 * 1024)
+        line = '{"title": "Weekly union meeting", "body": "Please select a time slot for the review."}\n'
+        benign = (line * (size // len(line) + 1))[:size]
+        bodies = {
+            "benign": benign,
+            "attack at end": benign[: -len("DROP TABLE users")] + "DROP TABLE users",
+        }
+
+        factory = RequestFactory()
+        middleware = RequestSecurityMiddleware(lambda request: None)
+        cap = settings.SECURITY_SCAN_MAX_BODY_BYTES
+
+        self.stdout.write(f"{size / 1024 / 1024:.1f} MB bodies, median of {options['repeat']} runs")
+        for label, body in bodies.items():
+            request = factory.post("/api/contact/?q=hello", data=body, content_type="application/json")
+            with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=None):
+                request.body  # read the stream once so every scan sees the cached body
+            legacy = self._time(_legacy_scan, request, options["repeat"])
+            naive = self._time(
+                lambda request: NAIVE_ALTERNATION.search(request.body.decode()), request, options["repeat"]
+            )
+            with override_settings(SECURITY_SCAN_MAX_BODY_BYTES=size):
+                uncapped = self._time(middleware.find_malicious_content, request, options["repeat"])
+            capped = self._time(middleware.find_malicious_content, request, options["repeat"])
+            self.stdout.write(f"  {label}:")
+            self.stdout.write(f"    legacy per-pattern loop: {legacy * 1000:8.1f} ms")
+            self.stdout.write(f"    naive named alternation: {naive * 1000:8.1f} ms")
+            self.stdout.write(f"    single pass, full body:  {uncapped * 1000:8.1f} ms")
+            self.stdout.write(f"    single pass, {cap // 1024} KB cap: {capped * 1000:8.1f} ms")
@@ -0,0 +1,90 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.constants import MAX_FAILED_CONTACT_ATTEMPTS
+from api.models import ContactAttempt
+from api.views import ContactView
+
+
+def separate_queries(ip_address, email):
+    """The spam check as it was: up to four ContactAttempt queries."""
+    now = timezone.now()
+    if ContactAttempt.objects.filter(
+        Q(ip_address=ip_address, is_blocked=True) | Q(email=email, is_blocked=True)
+    ).exists():
+        return True
+    ip_attempts = ContactAttempt.objects.filter(
+        ip_address=ip_address, last_attempt__gte=now - timedelta(hours=1)
+    ).first()
+    if ip_attempts and ip_attempts.attempt_count >= 3:
+        return True
+    if ContactAttempt.objects.filter(ip_address=ip_address, failure_count__gte=MAX_FAILED_CONTACT_ATTEMPTS).exists():
+        return True
+    email_attempts = ContactAttempt.objects.filter(email=email, last_attempt__gte=now - timedelta(days=1)).first()
+    return bool(email_attempts and email_attempts.attempt_count >= 2)
+
+
+class Command(BaseCommand):
+    help = "Benchmark the contact spam check against a large ContactAttempt table (rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--attempts", type=int, default=1000000, help="Attempts to create (default: 1000000)")
+        parser.add_argument("--checks", type=int, default=200, help="Spam checks per variant (default: 200)")
+
+    def _time(self, check, pairs):
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for ip_address, email in pairs:
+                started = time.perf_counter()
+                check(ip_address, email)
+                timings.append(time.perf_counter() - started)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.99) - 1], len(queries) / len(pairs)
+
+    def _report(self, label, check, pairs):
+        median, p99, queries = self._time(check, pairs)
+        self.stdout.write(
+            f"  {label:32}: median {median * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms   {queries:.1f} queries"
+        )
+
+    def handle(self, *args, **options):
+        total = options["attempts"]
+        view = ContactView()
+        with transaction.atomic():
+            for start in range(0, total, 10000):
+                ContactAttempt.objects.bulk_create(
+                    [
+                        ContactAttempt(
+                            ip_address=f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+                            email=f"user-{i}@example.com",
+                            attempt_count=1,
+                        )
+                        for i in range(start, min(start + 10000, total))
+                    ],
+                    batch_size=1000,
+                )
+            # Half the checks hit existing rows, half are first-time senders
+            step = max(total // options["checks"], 1)
+            pairs = [
+                (f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", f"user-{i}@example.com")
+                for i in range(0, total * 2, step * 2)
+            ][: options["checks"]]
+
+            connection.cursor().execute("ANALYZE")
+
+            self.stdout.write(f"{total} attempts, {len(pairs)} checks per variant")
+            self._report("one aggregate", view._is_spam_attempt, pairs)
+            self._report("separate queries", separate_queries, pairs)
+            # The previous index set had nothing on email (dropped inside the rolled-back transaction)
+            email_index = next(index for index in ContactAttempt._meta.indexes if index.fields[0] == "email")
+            connection.cursor().execute(f"DROP INDEX {connection.ops.quote_name(email_index.name)}")
+            self._report("separate queries, no email index", separate_queries, pairs)
+
+            transaction.set_rollback(True)
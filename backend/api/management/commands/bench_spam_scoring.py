@@ -0,0 +1,81 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.constants import SPAM_KEYWORDS
+from api.spam import SpamScorer
+
+WORDS = [
+    "hello",
+    "project",
+    "meeting",
+    "schedule",
+    "proposal",
+    "analysis",
+    "데이터",
+    "분석",
+    "문의",
+    "드립니다",
+    "the",
+    "and",
+    "money",
+    "online",
+]
+
+
+def substring_scan(keywords, text):
+    """The previous is_spam: one ``in`` test per keyword."""
+    text = text.lower()
+    return {keyword for keyword in keywords if keyword in text}
+
+
+class Command(BaseCommand):
+    help = "Benchmark spam keyword scanning throughput (MB/s): per-keyword substring search vs. compiled matcher"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-kb", type=int, default=2048, help="Text size in KB (default: 2048)")
+        parser.add_argument(
+            "--keywords",
+            type=int,
+            nargs="+",
+            default=[len(SPAM_KEYWORDS), 200, 1000],
+            help="Rule set sizes; built-ins plus random keywords (default: built-ins, 200, 1000)",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, best kept (default: 3)")
+
+    def _throughput(self, scan, text, repeat):
+        size_mb = len(text.encode()) / 1e6
+        best = min(self._elapsed(scan, text) for _ in range(repeat))
+        return size_mb / best
+
+    def _elapsed(self, scan, text):
+        started = time.perf_counter()
+        scan(text)
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        target = options["size_kb"] * 1024
+        words, length = [], 0
+        while length < target:
+            words.append(rng.choice(WORDS))
+            length += len(words[-1]) + 1
+        text = " ".join(words)
+
+        self.stdout.write(f"{len(text.encode()) / 1e6:.1f} MB of text, best of {options['repeat']} runs")
+        for size in options["keywords"]:
+            keywords = list(SPAM_KEYWORDS)
+            while len(keywords) < size:
+                keywords.append("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12))))
+            scorer = SpamScorer({keyword: 1 for keyword in keywords})
+            if scorer.matches(text) != substring_scan(keywords, text):
+                raise AssertionError("Compiled matcher and substring search disagree")
+
+            substring = self._throughput(lambda t: substring_scan(keywords, t), text, options["repeat"])
+            compiled = self._throughput(scorer.matches, text, options["repeat"])
+            self.stdout.write(
+                f"  {len(keywords):5} keywords: substring search {substring:7.1f} MB/s"
+                f"   compiled matcher {compiled:7.1f} MB/s"
+            )
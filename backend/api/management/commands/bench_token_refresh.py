@@ -0,0 +1,127 @@
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.tokens import rotate
+
+WRITES = ("INSERT", "UPDATE", "DELETE")
+
+
+def blacklist_and_issue(raw_token):
+    """token_refresh as it was: verify (blacklist join), blacklist(), look the user up, for_user()."""
+    old = RefreshToken(raw_token)
+    old.blacklist()
+    return RefreshToken.for_user(User.objects.get(id=old["user_id"]))
+
+
+def write_transactions(statements):
+    """Commits that wrote something; a write outside BEGIN ... COMMIT commits on its own."""
+    count, in_transaction, wrote = 0, False, False
+    for sql in statements:
+        if sql.startswith("BEGIN"):
+            in_transaction, wrote = True, False
+        elif sql.startswith("COMMIT"):
+            count += wrote
+            in_transaction = False
+        elif sql.startswith(WRITES):
+            if in_transaction:
+                wrote = True
+            else:
+                count += 1
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark refresh token rotation against a large token history, before and after prune_tokens "
+        "(creates and deletes its own user; prune_tokens also deletes other expired tokens)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--history", type=int, default=1000000, help="Expired tokens to create (default: 1000000)")
+        parser.add_argument("--refreshes", type=int, default=200, help="Refreshes per variant (default: 200)")
+
+    def _time(self, refresh, user, count):
+        token = str(RefreshToken.for_user(user))
+        timings = []
+        reset_queries()  # the query log is capped; the history inserts and prune_tokens filled it
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(count):
+                used = token
+                started = time.perf_counter()
+                token = str(refresh(token))
+                timings.append(time.perf_counter() - started)
+        # A rotated-out token must be refused
+        try:
+            refresh(used)
+        except TokenError:
+            replay = "refused"
+        else:
+            replay = "ACCEPTED"
+        statements = [q["sql"] for q in queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        timings.sort()
+        return (
+            statistics.median(timings),
+            timings[int(len(timings) * 0.99) - 1],
+            sum(not sql.startswith(("BEGIN", "COMMIT")) for sql in statements),
+            write_transactions(statements),
+            replay,
+        )
+
+    def _report(self, label, refresh, user, count):
+        median, p99, statements, transactions, replay = self._time(refresh, user, count)
+        self.stdout.write(
+            f"  {label:22}: median {median * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms   "
+            f"{statements / count:.1f} statements   {transactions / count:.1f} write transactions   replay {replay}"
+        )
+
+    def _create_history(self, user, total):
+        """Expired refresh tokens, every other one blacklisted, as a week-long rotation history leaves them."""
+        expired = timezone.now() - timedelta(days=1)
+        with transaction.atomic():
+            for start in range(0, total, 10000):
+                tokens = OutstandingToken.objects.bulk_create(
+                    [
+                        OutstandingToken(
+                            user=user, jti=uuid.uuid4().hex, token="expired", created_at=expired, expires_at=expired
+                        )
+                        for _ in range(start, min(start + 10000, total))
+                    ],
+                    batch_size=1000,
+                )
+                BlacklistedToken.objects.bulk_create(
+                    [BlacklistedToken(token=token) for token in tokens[::2]], batch_size=1000
+                )
+        connection.cursor().execute("ANALYZE")
+
+    def handle(self, *args, **options):
+        count = options["refreshes"]
+        user = User.objects.create_user(username=f"bench-{uuid.uuid4().hex[:12]}")
+        try:
+            started = time.perf_counter()
+            self._create_history(user, options["history"])
+            self.stdout.write(
+                f"{options['history']} expired tokens created in {time.perf_counter() - started:.1f} s; "
+                f"{count} chained refreshes per variant"
+            )
+            self._report("blacklist() + for_user", blacklist_and_issue, user, count)
+            self._report("rotate", rotate, user, count)
+
+            started = time.perf_counter()
+            call_command("prune_tokens", stdout=self.stdout)
+            self.stdout.write(f"prune_tokens took {time.perf_counter() - started:.1f} s")
+            self._report("rotate (pruned)", rotate, user, count)
+        finally:
+            OutstandingToken.objects.filter(user=user).delete()
+            user.delete()
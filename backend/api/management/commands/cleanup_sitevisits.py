@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 
+from api import counters
 from api.models import SiteVisit
 
 
@@ -37,5 +39,7 @@ class Command(BaseCommand):
             self.stdout.write("No old SiteVisit records to delete.")
             return
 
-        deleted, _ = queryset.delete()
+        with transaction.atomic():
+            deleted, _ = queryset.delete()
+            counters.adjust("visits", -deleted)
         self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} SiteVisit records older than {days} days."))
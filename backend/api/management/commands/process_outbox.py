@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.outbox import email_outbox
+
+
+class Command(BaseCommand):
+    help = "Send due emails from the outbound queue (once, or continuously with --loop)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when drained")
+
+    def handle(self, *args, **options):
+        batch_size = email_outbox.config["BATCH_SIZE"]
+        interval = email_outbox.config["FLUSH_INTERVAL_MS"] / 1000
+        while True:
+            while email_outbox.flush() >= batch_size:
+                pass
+            stats = email_outbox.stats()
+            self.stdout.write(
+                f"Sent {stats['sent']}, retrying {stats['retried']}, failed {stats['failed']}; "
+                f"{stats['pending']} pending."
+            )
+            if not options["loop"]:
+                return
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.models import BlogPost
+from api.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the blog post full-text search index from the posts table"
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search index for {BlogPost.objects.count()} posts"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute the admin_stats running totals exactly and report any drift"
+
+    def handle(self, *args, **options):
+        drift = reconcile()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Counters are exact."))
+            return
+        for field, (stored, exact) in drift.items():
+            self.stdout.write(self.style.WARNING(f"{field}: {stored} -> {exact} ({exact - stored:+d})"))
+        self.stdout.write(self.style.SUCCESS(f"Corrected {len(drift)} counter(s)."))
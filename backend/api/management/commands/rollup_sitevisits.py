@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from datetime import timedelta
+
+from api.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily SiteVisit rollups from raw visits (default: today and yesterday)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=2,
+            help="Rebuild this many most recent days, including today (default: 2)",
+        )
+
+    def handle(self, *args, **options):
+        days = max(1, options["days"])
+        since = timezone.localdate() - timedelta(days=days - 1)
+
+        rebuilt = rebuild(since)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {rebuilt} day(s) since {since.isoformat()}."))
@@ -5,6 +5,8 @@ from django.utils import timezone
 from datetime import timedelta
 import logging
 
+from api.ratelimit import build_rate_limiter
+
 logger = logging.getLogger("security")
 
 
@@ -81,16 +83,8 @@ class Command(BaseCommand):
         """Clean up old security logs"""
         self.stdout.write(self.style.SUCCESS("=== 보안 로그 정리 ==="))
 
-        # Clean rate limiting cache entries older than 7 days
-        # In production, use Redis SCAN; here we simulate
-        cleaned_count = 0
-
-        # Clean rate_limit_ pattern cache entries
-        cache_keys = [f"rate_limit_192.168.1.{i}" for i in range(1, 255)]
-        for key in cache_keys:
-            if cache.get(key) is not None:
-                cache.delete(key)
-                cleaned_count += 1
+        # Purge expired rate limiter state (IPs whose window has fully drained)
+        cleaned_count = build_rate_limiter().sweep()
 
         self.stdout.write(self.style.SUCCESS(f"✅ {cleaned_count}개의 오래된 캐시 항목이 정리되었습니다."))
 
@@ -111,8 +105,7 @@ class Command(BaseCommand):
             self.stdout.write("ℹ️  임시 차단 상태가 아닙니다.")
 
         # Reset rate limiting
-        rate_limit_key = f"rate_limit_{ip_address}"
-        cache.delete(rate_limit_key)
+        build_rate_limiter().reset(ip_address)
 
         # Reset block count
         block_count_key = f"block_count_{ip_address}"
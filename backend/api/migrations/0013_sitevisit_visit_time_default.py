@@ -0,0 +1,19 @@
+# Generated by Django 6.0.4 on 2026-10-17 00:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_contactattempt_failure_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sitevisit',
+            name='visit_time',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='방문 시간'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.4 on 2026-10-17 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_sitevisit_visit_time_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyVisitStat",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(unique=True, verbose_name="날짜")),
+                ("visits", models.PositiveIntegerField(default=0, verbose_name="방문 수")),
+                ("unique_visitors", models.PositiveIntegerField(default=0, verbose_name="순 방문자 수")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="수정일")),
+            ],
+            options={
+                "verbose_name": "일별 방문 통계",
+                "verbose_name_plural": "일별 방문 통계",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyPageStat",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(verbose_name="날짜")),
+                ("page_path", models.CharField(max_length=500, verbose_name="페이지 경로")),
+                ("visits", models.PositiveIntegerField(default=0, verbose_name="방문 수")),
+            ],
+            options={
+                "verbose_name": "일별 페이지 통계",
+                "verbose_name_plural": "일별 페이지 통계",
+                "unique_together": {("date", "page_path")},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.4 on 2026-10-17 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_daily_visit_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailyvisitstat",
+            name="visitor_sketch",
+            field=models.BinaryField(default=b"", verbose_name="방문자 스케치"),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+FTS_TABLE = "api_blogpost_fts"
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, content, content='api_blogpost', content_rowid='id', tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_blogpost BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description, content)
+        VALUES (new.id, new.title, new.description, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_blogpost BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description, content)
+        VALUES ('delete', old.id, old.title, old.description, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description, content ON api_blogpost
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description, content)
+        VALUES ('delete', old.id, old.title, old.description, old.content);
+        INSERT INTO {FTS_TABLE} (rowid, title, description, content)
+        VALUES (new.id, new.title, new.description, new.content);
+    END""",
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+TRGM_COLUMNS = ("title", "description", "content")
+# CREATE EXTENSION needs a superuser (or, from PostgreSQL 13, a database owner, pg_trgm being a
+# trusted extension). Where the migrating role is neither, have an administrator run
+# "CREATE EXTENSION pg_trgm" in the database first; IF NOT EXISTS then makes this a no-op.
+POSTGRES_FORWARD = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+    f"CREATE INDEX IF NOT EXISTS api_blogpost_{column}_trgm ON api_blogpost USING gin ({column} gin_trgm_ops)"
+    for column in TRGM_COLUMNS
+]
+POSTGRES_REVERSE = [f"DROP INDEX IF EXISTS api_blogpost_{column}_trgm" for column in TRGM_COLUMNS]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_dailyvisitstat_visitor_sketch"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.4 on 2026-10-17 00:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0016_blogpost_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostViewFilter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(verbose_name="날짜")),
+                ("bits", models.BinaryField(default=b"", verbose_name="블룸 필터")),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_filters",
+                        to="api.blogpost",
+                        verbose_name="포스트",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "조회 중복 필터",
+                "verbose_name_plural": "조회 중복 필터",
+                "unique_together": {("post", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.4 on 2026-10-17 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0017_post_view_filter"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(fields=["-date", "-id"], name="api_blogpos_date_2ef80b_idx"),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.4 on 2026-10-17 01:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    """Start the totals from exact counts"""
+    db = schema_editor.connection.alias
+    apps.get_model("api", "StatCounters").objects.using(db).create(
+        pk=1,
+        users=apps.get_model(settings.AUTH_USER_MODEL).objects.using(db).count(),
+        posts=apps.get_model("api", "BlogPost").objects.using(db).count(),
+        messages=apps.get_model("api", "Contact").objects.using(db).count(),
+        visits=apps.get_model("api", "SiteVisit").objects.using(db).count(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0018_blogpost_keyset_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatCounters",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("users", models.BigIntegerField(default=0, verbose_name="사용자 수")),
+                ("posts", models.BigIntegerField(default=0, verbose_name="포스트 수")),
+                ("messages", models.BigIntegerField(default=0, verbose_name="문의 수")),
+                ("visits", models.BigIntegerField(default=0, verbose_name="방문 수")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="수정일")),
+            ],
+            options={
+                "verbose_name": "통계 카운터",
+                "verbose_name_plural": "통계 카운터",
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.4 on 2026-10-17 01:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0019_stat_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboundEmail",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("subject", models.CharField(max_length=500, verbose_name="제목")),
+                ("body", models.TextField(verbose_name="본문")),
+                ("from_email", models.CharField(max_length=254, verbose_name="발신자")),
+                ("to", models.JSONField(default=list, verbose_name="수신자")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "대기"), ("sent", "발송 완료"), ("failed", "발송 실패")],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="상태",
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0, verbose_name="시도 횟수")),
+                ("next_attempt_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="다음 시도")),
+                ("last_error", models.TextField(blank=True, verbose_name="마지막 오류")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="생성일")),
+                ("sent_at", models.DateTimeField(blank=True, null=True, verbose_name="발송일")),
+            ],
+            options={
+                "verbose_name": "발송 대기 이메일",
+                "verbose_name_plural": "발송 대기 이메일",
+                "ordering": ["created_at"],
+                "indexes": [models.Index(fields=["status", "next_attempt_at"], name="api_outboun_status_d67332_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.4 on 2026-10-17 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0020_outbound_email"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contactattempt",
+            index=models.Index(fields=["email", "-last_attempt"], name="api_contact_email_933a39_idx"),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.4 on 2026-10-17 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0021_contactattempt_email_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SpamKeyword",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("keyword", models.CharField(max_length=100, unique=True, verbose_name="키워드")),
+                ("weight", models.PositiveSmallIntegerField(default=1, verbose_name="가중치")),
+                ("is_active", models.BooleanField(default=True, verbose_name="활성화")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="수정일")),
+            ],
+            options={
+                "verbose_name": "스팸 키워드",
+                "verbose_name_plural": "스팸 키워드",
+                "ordering": ["keyword"],
+            },
+        ),
+    ]
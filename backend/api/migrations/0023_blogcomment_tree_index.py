@@ -0,0 +1,17 @@
+# Generated by Django 6.0.4 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0022_spam_keyword"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogcomment",
+            index=models.Index(fields=["post", "parent", "-created_at", "-id"], name="api_blogcom_post_id_e091c0_idx"),
+        ),
+    ]
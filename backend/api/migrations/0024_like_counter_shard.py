@@ -0,0 +1,33 @@
+# Generated by Django 6.0.4 on 2026-10-17 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0023_blogcomment_tree_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LikeCounterShard",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[("post", "블로그 글"), ("comment", "댓글")], max_length=10, verbose_name="대상"
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField(verbose_name="대상 ID")),
+                ("shard", models.PositiveSmallIntegerField(verbose_name="샤드")),
+                ("delta", models.IntegerField(default=0, verbose_name="증감")),
+            ],
+            options={
+                "verbose_name": "좋아요 카운터 샤드",
+                "verbose_name_plural": "좋아요 카운터 샤드",
+                "unique_together": {("target", "object_id", "shard")},
+            },
+        ),
+    ]
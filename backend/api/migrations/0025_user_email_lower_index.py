@@ -0,0 +1,20 @@
+# Generated by Django 6.0.4 on 2026-10-17 09:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0024_like_counter_shard"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        # auth.User belongs to django.contrib.auth, so its index can't be declared in Meta.indexes;
+        # email__lower lookups (registered in ApiConfig.ready) compile to exactly this expression
+        migrations.RunSQL(
+            sql="CREATE INDEX auth_user_email_lower_idx ON auth_user (LOWER(email))",
+            reverse_sql="DROP INDEX auth_user_email_lower_idx",
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0.4 on 2026-10-17 10:05
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from api.hyperloglog import HyperLogLog
+
+
+def backfill_rollups(apps, schema_editor):
+    """Build the daily rollups from the SiteVisit rows still retained, as rollup_sitevisits does.
+
+    The analytics endpoints read only the rollups, which the visit buffer fills
+    from 0014 on; without this the history before the upgrade would be empty.
+    Runs after 0015 so the visitor sketches are built along with the counts.
+    """
+    db = schema_editor.connection.alias
+    SiteVisit = apps.get_model("api", "SiteVisit")
+    DailyVisitStat = apps.get_model("api", "DailyVisitStat")
+    DailyPageStat = apps.get_model("api", "DailyPageStat")
+
+    raw = SiteVisit.objects.using(db).annotate(date=TruncDate("visit_time"))
+    sketches = defaultdict(HyperLogLog)
+    for visit_time, ip_address in SiteVisit.objects.using(db).values_list("visit_time", "ip_address").iterator():
+        sketches[timezone.localdate(visit_time)].add(ip_address)
+
+    days = []
+    for entry in raw.values("date").annotate(visits=Count("id"), unique_visitors=Count("ip_address", distinct=True)):
+        days.append(entry["date"])
+        DailyVisitStat.objects.using(db).update_or_create(
+            date=entry["date"],
+            defaults={
+                "visits": entry["visits"],
+                "unique_visitors": entry["unique_visitors"],
+                "visitor_sketch": sketches[entry["date"]].to_bytes(),
+            },
+        )
+    DailyPageStat.objects.using(db).filter(date__in=days).delete()
+    DailyPageStat.objects.using(db).bulk_create(
+        (
+            DailyPageStat(date=entry["date"], page_path=entry["page_path"], visits=entry["visits"])
+            for entry in raw.values("date", "page_path").annotate(visits=Count("id"))
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0025_user_email_lower_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.4 on 2026-10-17 02:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0026_backfill_visit_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogPostSearchEntry",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="api.blogpost",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "api_blogpost_fts",
+                "managed": False,
+            },
+        ),
+    ]
@@ -46,6 +46,7 @@ class BlogPost(models.Model):
         verbose_name_plural = "블로그 포스트"
         indexes = [
             models.Index(fields=["is_published", "-date"]),
+            models.Index(fields=["-date", "-id"]),  # keyset pages (api.pagination)
             models.Index(fields=["category"]),
         ]
 
@@ -80,6 +81,27 @@ class BlogPost(models.Model):
         return self.title
 
 
+class BlogPostSearchEntry(models.Model):
+    """A row of the SQLite FTS5 index over BlogPost (migration 0016; see api.search).
+
+    Unmanaged: it only lets search queries join the index. The table doesn't
+    exist on PostgreSQL, so nothing but the SQLite search path may touch it.
+    """
+
+    post = models.OneToOneField(
+        BlogPost,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="search_entry",
+    )
+
+    class Meta:
+        managed = False
+        db_table = "api_blogpost_fts"
+
+
 class BlogLike(models.Model):
     """Tracks individual likes on blog posts (one per IP per post)."""
 
@@ -119,6 +141,8 @@ class BlogComment(models.Model):
         verbose_name_plural = "블로그 댓글"
         indexes = [
             models.Index(fields=["post", "-created_at"]),
+            # Comment tree loader (api/comments.py): all of a post's comments grouped by parent
+            models.Index(fields=["post", "parent", "-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -146,6 +170,32 @@ class CommentLike(models.Model):
         return f"Like on comment {self.comment_id} from {self.ip_address}"
 
 
+class LikeCounterShard(models.Model):
+    """Pending like-count change for a post or comment, folded into its ``likes`` (api/likes.py).
+
+    Each object's changes are spread over a few shard rows so concurrent
+    likes don't all update the same row.
+    """
+
+    TARGET_CHOICES = [
+        ("post", "블로그 글"),
+        ("comment", "댓글"),
+    ]
+
+    target = models.CharField(max_length=10, choices=TARGET_CHOICES, verbose_name="대상")
+    object_id = models.PositiveBigIntegerField(verbose_name="대상 ID")
+    shard = models.PositiveSmallIntegerField(verbose_name="샤드")
+    delta = models.IntegerField(default=0, verbose_name="증감")
+
+    class Meta:
+        unique_together = ["target", "object_id", "shard"]
+        verbose_name = "좋아요 카운터 샤드"
+        verbose_name_plural = "좋아요 카운터 샤드"
+
+    def __str__(self):
+        return f"{self.target} {self.object_id} [{self.shard}] {self.delta:+d}"
+
+
 class Contact(models.Model):
     INQUIRY_TYPE_CHOICES = [
         ("lecture", "강의 문의"),
@@ -207,12 +257,36 @@ class ContactAttempt(models.Model):
         verbose_name_plural = "문의 시도 로그"
         indexes = [
             models.Index(fields=["ip_address", "-last_attempt"]),
+            # ContactView._is_spam_attempt matches rows by IP OR email
+            models.Index(fields=["email", "-last_attempt"]),
         ]
 
     def __str__(self):
         return f"{self.ip_address} - {self.attempt_count}회 시도"
 
 
+class SpamKeyword(models.Model):
+    """Spam filter rule, merged over the built-in SPAM_KEYWORDS (api/spam.py)"""
+
+    keyword = models.CharField(max_length=100, unique=True, verbose_name="키워드")
+    # Weights of the distinct keywords in a text add up to SPAM_FILTER["THRESHOLD"]
+    weight = models.PositiveSmallIntegerField(default=1, verbose_name="가중치")
+    is_active = models.BooleanField(default=True, verbose_name="활성화")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        ordering = ["keyword"]
+        verbose_name = "스팸 키워드"
+        verbose_name_plural = "스팸 키워드"
+
+    def __str__(self):
+        return f"{self.keyword} ({self.weight})"
+
+    def save(self, *args, **kwargs):
+        self.keyword = self.keyword.strip().lower()
+        super().save(*args, **kwargs)
+
+
 class SiteVisit(models.Model):
     """Site visit log"""
 
@@ -220,7 +294,8 @@ class SiteVisit(models.Model):
     user_agent = models.TextField(verbose_name="사용자 에이전트")
     referer = models.URLField(blank=True, verbose_name="참조 URL")
     page_path = models.CharField(max_length=500, verbose_name="페이지 경로")
-    visit_time = models.DateTimeField(auto_now_add=True, verbose_name="방문 시간")
+    # Set when the request is served, not when the buffered row is flushed (api/ingest.py)
+    visit_time = models.DateTimeField(default=timezone.now, verbose_name="방문 시간")
     session_id = models.CharField(max_length=100, blank=True, verbose_name="세션 ID")
 
     class Meta:
@@ -235,6 +310,116 @@ class SiteVisit(models.Model):
         return f"{self.ip_address} - {self.page_path} ({self.visit_time.strftime('%Y-%m-%d %H:%M')})"
 
 
+class DailyVisitStat(models.Model):
+    """Per-day SiteVisit rollup read by the admin analytics endpoints.
+
+    Maintained incrementally by the visit buffer flush (api/rollups.py) and
+    rebuilt exactly by the rollup_sitevisits management command.
+    """
+
+    date = models.DateField(unique=True, verbose_name="날짜")
+    visits = models.PositiveIntegerField(default=0, verbose_name="방문 수")
+    # HyperLogLog estimate of the day's distinct IPs; visitor_sketch holds the sketch itself
+    unique_visitors = models.PositiveIntegerField(default=0, verbose_name="순 방문자 수")
+    visitor_sketch = models.BinaryField(default=b"", verbose_name="방문자 스케치")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name = "일별 방문 통계"
+        verbose_name_plural = "일별 방문 통계"
+
+    def __str__(self):
+        return f"{self.date} - {self.visits}회 ({self.unique_visitors}명)"
+
+
+class DailyPageStat(models.Model):
+    """Per-day, per-path SiteVisit rollup"""
+
+    date = models.DateField(verbose_name="날짜")
+    page_path = models.CharField(max_length=500, verbose_name="페이지 경로")
+    visits = models.PositiveIntegerField(default=0, verbose_name="방문 수")
+
+    class Meta:
+        unique_together = ["date", "page_path"]
+        verbose_name = "일별 페이지 통계"
+        verbose_name_plural = "일별 페이지 통계"
+
+    def __str__(self):
+        return f"{self.date} {self.page_path} - {self.visits}회"
+
+
+class PostViewFilter(models.Model):
+    """Bloom filter of the visitors already counted for a post on one day (api/bloom.py)"""
+
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name="view_filters", verbose_name="포스트")
+    date = models.DateField(verbose_name="날짜")
+    bits = models.BinaryField(default=b"", verbose_name="블룸 필터")
+
+    class Meta:
+        unique_together = ["post", "date"]
+        verbose_name = "조회 중복 필터"
+        verbose_name_plural = "조회 중복 필터"
+
+    def __str__(self):
+        return f"{self.post_id} {self.date}"
+
+
+class OutboundEmail(models.Model):
+    """Email waiting to be sent by the outbox worker (api/outbox.py)"""
+
+    STATUS_CHOICES = [
+        ("pending", "대기"),
+        ("sent", "발송 완료"),
+        ("failed", "발송 실패"),
+    ]
+
+    subject = models.CharField(max_length=500, verbose_name="제목")
+    body = models.TextField(verbose_name="본문")
+    from_email = models.CharField(max_length=254, verbose_name="발신자")
+    to = models.JSONField(default=list, verbose_name="수신자")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending", verbose_name="상태")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="시도 횟수")
+    # Due time for pending rows; pushed forward while a worker holds the row and between retries
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="다음 시도")
+    last_error = models.TextField(blank=True, verbose_name="마지막 오류")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="발송일")
+
+    class Meta:
+        ordering = ["created_at"]
+        verbose_name = "발송 대기 이메일"
+        verbose_name_plural = "발송 대기 이메일"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.get_status_display()})"
+
+
+class StatCounters(models.Model):
+    """Running totals read by admin_stats, kept in a single row (pk=1).
+
+    Maintained incrementally by signals and the visit buffer flush
+    (api/counters.py) and recomputed exactly by the reconcile_counters
+    management command.
+    """
+
+    users = models.BigIntegerField(default=0, verbose_name="사용자 수")
+    posts = models.BigIntegerField(default=0, verbose_name="포스트 수")
+    messages = models.BigIntegerField(default=0, verbose_name="문의 수")
+    visits = models.BigIntegerField(default=0, verbose_name="방문 수")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        verbose_name = "통계 카운터"
+        verbose_name_plural = "통계 카운터"
+
+    def __str__(self):
+        return f"users={self.users} posts={self.posts} messages={self.messages} visits={self.visits}"
+
+
 class Notification(models.Model):
     """User notification"""
 
@@ -0,0 +1,136 @@
+"""Outbound email queue — keep SMTP off the request path.
+
+``queue_email`` validates a message and stores it as an ``OutboundEmail`` row
+in the caller's transaction. Once that commits, this worker's ``EmailOutbox``
+thread wakes and sends every due row over one SMTP connection; it also polls
+every ``FLUSH_INTERVAL_MS`` for retries and for rows left by other workers or
+a restart (``manage.py process_outbox`` drains them from outside). A request
+therefore waits for an INSERT, not for the mail server.
+
+Workers claim a batch by pushing its rows' ``next_attempt_at`` a lease into the
+future, so concurrent workers don't send the same row; a worker that dies
+mid-batch leaves its rows to be retried when the lease runs out. Delivery is
+at-least-once. Failed sends are retried with exponential backoff, and a row is
+marked failed after ``EMAIL_MAX_RETRIES`` retries.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .ingest import BackgroundFlusher
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutbox(BackgroundFlusher):
+    """Sends due ``OutboundEmail`` rows in batches over one SMTP connection"""
+
+    setting_name = "EMAIL_OUTBOX"
+    durable = True
+    defaults = {
+        **BackgroundFlusher.defaults,
+        "BATCH_SIZE": 50,
+        "FLUSH_INTERVAL_MS": 30000,
+        "RETRY_BASE_SECONDS": 30,
+        "LEASE_SECONDS": 300,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._stats.update(sent=0, retried=0, failed=0)
+
+    def wake(self):
+        """Send due mail now, on the worker thread."""
+        self._ensure_worker()
+        self._wake.set()
+
+    def _pending(self):
+        return OutboundEmail.objects.filter(status="pending").count()
+
+    def _drain(self):
+        config = self.config
+        now = timezone.now()
+        due = list(
+            OutboundEmail.objects.filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at")
+            .values_list("pk", flat=True)[: config["BATCH_SIZE"]]
+        )
+        if not due:
+            return []
+        # The lease time doubles as this claim's marker: rows another worker claimed first won't match
+        lease = now + timedelta(seconds=config["LEASE_SECONDS"])
+        OutboundEmail.objects.filter(pk__in=due, status="pending", next_attempt_at__lte=now).update(
+            next_attempt_at=lease
+        )
+        return list(OutboundEmail.objects.filter(pk__in=due, status="pending", next_attempt_at=lease))
+
+    def _write(self, batch):
+        connection = get_connection(fail_silently=False)
+        try:
+            for index, email in enumerate(batch):
+                try:
+                    # No-op while the session is up; reconnects after a failed send closed it
+                    connection.open()
+                except Exception as e:
+                    # Server unreachable: don't wait out the timeout once per message
+                    for unsent in batch[index:]:
+                        self._failed(unsent, e)
+                    break
+                message = EmailMessage(email.subject, email.body, email.from_email, email.to, connection=connection)
+                try:
+                    message.send()
+                except Exception as e:
+                    connection.close()
+                    self._failed(email, e)
+                else:
+                    self._sent(email)
+        finally:
+            connection.close()
+
+        if len(batch) >= self.config["BATCH_SIZE"] and self.config["ASYNC"]:
+            self._wake.set()  # more may be due
+
+    def _sent(self, email):
+        email.status = "sent"
+        email.attempts += 1
+        email.sent_at = timezone.now()
+        email.save(update_fields=["status", "attempts", "sent_at"])
+        self._stats["sent"] += 1
+
+    def _failed(self, email, error):
+        email.attempts += 1
+        email.last_error = str(error)[:1000]
+        if email.attempts > settings.EMAIL_MAX_RETRIES:
+            email.status = "failed"
+            self._stats["failed"] += 1
+            logger.error(f"Email {email.pk} failed after {email.attempts} attempts: {error}")
+        else:
+            delay = self.config["RETRY_BASE_SECONDS"] * 2 ** (email.attempts - 1)
+            email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+            self._stats["retried"] += 1
+            logger.warning(f"Email {email.pk} send failed (attempt {email.attempts}), retrying in {delay}s: {error}")
+        email.save(update_fields=["status", "attempts", "last_error", "next_attempt_at"])
+
+
+email_outbox = EmailOutbox()
+
+
+def queue_email(subject, message, from_email, recipient_list):
+    """Queue an email, sent once the current transaction commits.
+
+    Headers are checked here, so header injection still raises
+    ``BadHeaderError`` in the caller as with ``send_mail``.
+    """
+    EmailMessage(subject, message, from_email, recipient_list).message()
+    email = OutboundEmail.objects.create(subject=subject, body=message, from_email=from_email, to=recipient_list)
+    if email_outbox.config["ASYNC"]:
+        transaction.on_commit(email_outbox.wake)
+    else:
+        email_outbox.flush()
+    return email
@@ -1,9 +1,138 @@
+"""Pagination: page numbers by default, keyset (cursor) pages on request.
+
+Page-number pages cost a ``COUNT`` plus an ``OFFSET`` that the database walks
+row by row, so deep pages get slower linearly. Keyset pages instead resume
+after the last row served (``WHERE (date, id) < (last_date, last_id)``), which
+an index answers directly at any depth, and fetch one extra row to tell
+whether a next page exists — no ``COUNT``.
+
+Keyset mode is selected with ``?pagination=cursor`` (first page) and carried
+on by ``?cursor=<token>`` from the previous response. Tokens are opaque
+URL-safe base64 of the last row's ordering values.
+"""
+
+import base64
+import binascii
+import json
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import serializers
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .counting import EXACT, CountingPaginator
+
+CURSOR_QUERY_PARAM = "cursor"
+MODE_QUERY_PARAM = "pagination"
+INVALID_CURSOR = "Invalid cursor."
+
+
+def requested_cursor(request):
+    """The cursor token if keyset mode was requested ("" for the first page), else None."""
+    cursor = request.query_params.get(CURSOR_QUERY_PARAM) or None
+    if cursor is None and request.query_params.get(MODE_QUERY_PARAM) == "cursor":
+        return ""
+    return cursor
+
+
+def _jsonable(value):
+    # Full-precision isoformat: DjangoJSONEncoder drops microseconds, which would skip or repeat rows
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, default=_jsonable).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, model, ordering):
+    """Ordering values from ``token``, converted to Python; ValueError if it isn't one of ours."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ValueError("invalid cursor")
+    try:
+        return [model._meta.get_field(name.lstrip("-")).to_python(value) for name, value in zip(ordering, values)]
+    except ValidationError:
+        raise ValueError("invalid cursor")
+
+
+def _after(ordering, values):
+    """Rows strictly after ``values`` in ``ordering``: (a, b) < (x, y) as a OR of prefixes."""
+    condition = Q()
+    equal = {}
+    for name, value in zip(ordering, values):
+        field = name.lstrip("-")
+        lookup = "lt" if name.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{field}__{lookup}": value})
+        equal[field] = value
+    # The redundant bound on the leading field lets the planner seek an index instead of scanning for the OR
+    first = ordering[0]
+    return Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]}) & condition
+
+
+def keyset_paginate(queryset, ordering, cursor, page_size):
+    """One keyset page: (items, next cursor or None).
+
+    ``ordering`` must end in a unique field so every row has a distinct
+    position. A malformed cursor raises a ValidationError (400), the same on
+    every endpoint that pages this way.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        try:
+            values = decode_cursor(cursor, queryset.model, ordering)
+        except ValueError:
+            raise serializers.ValidationError({CURSOR_QUERY_PARAM: [INVALID_CURSOR]})
+        queryset = queryset.filter(_after(ordering, values))
+    items = list(queryset[: page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+    items = items[:page_size]
+    last = items[-1]
+    return items, encode_cursor([getattr(last, name.lstrip("-")) for name in ordering])
 
 
 class StandardPagination(PageNumberPagination):
-    """Standard pagination with max page size protection"""
+    """Standard pagination with max page size protection.
+
+    Views choose how ``count`` is produced with a ``count_strategy``
+    (api.counting; exact by default). Views with a ``keyset_ordering`` (None to
+    opt out per request) also page by cursor when asked to; those responses
+    carry ``next`` and ``has_next`` but no ``count``.
+    """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, "keyset_ordering", None)
+        cursor = requested_cursor(request) if ordering else None
+        self.next_cursor = None
+        self.keyset = cursor is not None
+        if not self.keyset:
+            self.django_paginator_class = partial(
+                CountingPaginator, count_strategy=getattr(view, "count_strategy", EXACT)
+            )
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        items, self.next_cursor = keyset_paginate(queryset, ordering, cursor, self.get_page_size(request))
+        return items
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "has_next": self.next_cursor is not None, "results": data})
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), CURSOR_QUERY_PARAM, self.next_cursor)
@@ -0,0 +1,148 @@
+"""Per-IP request rate limiting for RequestSecurityMiddleware.
+
+The limiters implement GCRA (generic cell rate algorithm), a sliding-window
+limit that needs one number per key: the "theoretical arrival time" (TAT). With
+``limit`` requests per ``period`` each allowed request advances the TAT by
+``period / limit``, and a request is rejected while the TAT is more than
+``period - period / limit`` ahead of now. An idle client can therefore burst
+``limit`` requests, after which it gets one request every ``period / limit``
+seconds — there is no fixed window edge to game.
+
+Backends are selected by ``settings.RATE_LIMIT["BACKEND"]``:
+
+- ``SQLiteRateLimiter`` keeps one row per key in a WAL-mode SQLite file shared
+  by all gunicorn workers; a hit is a single atomic UPSERT ... RETURNING.
+- ``MemoryRateLimiter`` is per-instance, for tests and single-process dev.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("security")
+
+# Expired rows (TAT in the past) are equivalent to missing ones; purge them every N hits
+SWEEP_EVERY = 1000
+
+
+class RateLimiter:
+    """GCRA limiter interface: ``hit(key)`` records a request and says whether it is allowed."""
+
+    def __init__(self, limit: int, period: float, **options):
+        if limit < 1 or period <= 0:
+            raise ValueError("limit and period must be positive")
+        self.limit = limit
+        self.period = period
+        self.interval = period / limit
+        self.tolerance = period - self.interval
+        self._hits = 0
+
+    def hit(self, key: str, now: float | None = None) -> bool:
+        """Count one request for ``key``; False means it should be rejected (and was not counted)."""
+        raise NotImplementedError
+
+    def reset(self, key: str):
+        """Forget all state for ``key``."""
+        raise NotImplementedError
+
+    def sweep(self, now: float | None = None) -> int:
+        """Delete expired keys; returns how many were removed."""
+        raise NotImplementedError
+
+    def _maybe_sweep(self, now):
+        self._hits += 1
+        if self._hits % SWEEP_EVERY == 0:
+            self.sweep(now)
+
+
+class MemoryRateLimiter(RateLimiter):
+    """In-process GCRA state. Not shared between workers — use for tests and dev only."""
+
+    def __init__(self, limit: int, period: float, **options):
+        super().__init__(limit, period)
+        self._tat = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            tat = max(self._tat.get(key, now), now)
+            allowed = tat - now <= self.tolerance
+            if allowed:
+                self._tat[key] = tat + self.interval
+        self._maybe_sweep(now)
+        return allowed
+
+    def reset(self, key: str):
+        with self._lock:
+            self._tat.pop(key, None)
+
+    def sweep(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [key for key, tat in self._tat.items() if tat < now]
+            for key in expired:
+                del self._tat[key]
+        return len(expired)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """GCRA state in a WAL-mode SQLite file shared by every worker on the host.
+
+    Each hit is one ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` statement,
+    which SQLite executes atomically, so concurrent workers can't lose updates.
+    Connections are per thread and reopened after fork.
+    """
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS ratelimit (key TEXT PRIMARY KEY, tat REAL NOT NULL, denied INTEGER NOT NULL)"
+    HIT_SQL = """
+        INSERT INTO ratelimit (key, tat, denied) VALUES (:key, :now + :interval, 0)
+        ON CONFLICT (key) DO UPDATE SET
+            denied = max(tat, :now) - :now > :tolerance,
+            tat = CASE WHEN max(tat, :now) - :now > :tolerance THEN tat ELSE max(tat, :now) + :interval END
+        RETURNING denied
+    """
+
+    def __init__(self, limit: int, period: float, LOCATION=None, TIMEOUT=1.0, **options):
+        super().__init__(limit, period)
+        self.location = str(LOCATION or os.path.join(settings.BASE_DIR, "ratelimit.sqlite3"))
+        self.timeout = TIMEOUT
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.location, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Limiter state is disposable: skip the fsync on every commit
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(f"{self.SCHEMA} WITHOUT ROWID")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, key: str, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        params = {"key": key, "now": now, "interval": self.interval, "tolerance": self.tolerance}
+        (denied,) = self._connection().execute(self.HIT_SQL, params).fetchone()
+        self._maybe_sweep(now)
+        return not denied
+
+    def reset(self, key: str):
+        self._connection().execute("DELETE FROM ratelimit WHERE key = ?", (key,))
+
+    def sweep(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        return self._connection().execute("DELETE FROM ratelimit WHERE tat < ?", (now,)).rowcount
+
+
+def build_rate_limiter() -> RateLimiter:
+    """Instantiate the limiter configured in ``settings.RATE_LIMIT``."""
+    config = settings.RATE_LIMIT
+    backend = import_string(config["BACKEND"])
+    return backend(config["LIMIT"], config["PERIOD"], **config.get("OPTIONS", {}))
@@ -0,0 +1,117 @@
+"""Daily SiteVisit rollups for the admin analytics endpoints.
+
+``apply_visits()`` folds a batch of visits into the rollup rows and is called
+by the visit buffer in the same transaction that inserts the batch, so the
+analytics endpoints never have to scan raw ``SiteVisit`` rows. Unique visitors
+come from a per-day HyperLogLog sketch (api/hyperloglog.py). ``rebuild()``
+recomputes the rollups from the raw table (rollup_sitevisits command).
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .hyperloglog import HyperLogLog
+from .models import DailyPageStat, DailyVisitStat, SiteVisit
+
+
+def day_bounds(day):
+    """Aware [start, end) datetimes of a local calendar day."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _increment(model, lookup, **deltas):
+    """Add ``deltas`` to the row matching ``lookup``, creating it if missing."""
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Another worker created the row between our update and insert
+        model.objects.filter(**lookup).update(**updates)
+
+
+def _add_visitors(day, visits, ips):
+    """Add a batch to the day's row: bump visits, fold IPs into the sketch, refresh the estimate."""
+    stat, _ = DailyVisitStat.objects.select_for_update().get_or_create(date=day)
+    sketch = HyperLogLog.from_bytes(stat.visitor_sketch)
+    sketch.update(ips)
+    DailyVisitStat.objects.filter(pk=stat.pk).update(
+        visits=F("visits") + visits,
+        unique_visitors=sketch.count(),
+        visitor_sketch=sketch.to_bytes(),
+        updated_at=timezone.now(),
+    )
+
+
+def apply_visits(visits):
+    """Fold a batch of visits into the daily rollups (run it after the batch's insert, same transaction)."""
+    day_visits = Counter()
+    page_visits = Counter()
+    day_ips = defaultdict(set)
+    for visit in visits:
+        day = timezone.localdate(visit.visit_time)
+        day_visits[day] += 1
+        page_visits[(day, visit.page_path)] += 1
+        day_ips[day].add(visit.ip_address)
+
+    with transaction.atomic():
+        for day, count in day_visits.items():
+            _add_visitors(day, count, day_ips[day])
+        for (day, page_path), count in page_visits.items():
+            _increment(DailyPageStat, {"date": day, "page_path": page_path}, visits=count)
+
+
+def unique_visitors_between(start_date, end_date=None):
+    """Estimated distinct visitors over a date range, from the merged daily sketches."""
+    stats = DailyVisitStat.objects.filter(date__gte=start_date)
+    if end_date is not None:
+        stats = stats.filter(date__lte=end_date)
+    sketches = [HyperLogLog.from_bytes(data) for data in stats.values_list("visitor_sketch", flat=True)]
+    return HyperLogLog.union(sketches).count()
+
+
+def rebuild(since):
+    """Recompute rollups for every day from ``since`` that still has raw visits.
+
+    ``unique_visitors`` is set to the exact distinct count, the sketch is
+    rebuilt from the raw IPs. Days whose raw rows were already removed by
+    cleanup_sitevisits keep their existing rollups. Returns the number of days
+    rebuilt.
+    """
+    raw = SiteVisit.objects.filter(visit_time__gte=timezone.make_aware(datetime.combine(since, time.min)))
+    daily = (
+        raw.annotate(date=TruncDate("visit_time"))
+        .values("date")
+        .annotate(visits=Count("id"), unique_visitors=Count("ip_address", distinct=True))
+    )
+    pages = raw.annotate(date=TruncDate("visit_time")).values("date", "page_path").annotate(visits=Count("id"))
+
+    sketches = defaultdict(HyperLogLog)
+    for visit_time, ip_address in raw.values_list("visit_time", "ip_address").iterator():
+        sketches[timezone.localdate(visit_time)].add(ip_address)
+
+    with transaction.atomic():
+        days = []
+        for entry in daily:
+            days.append(entry["date"])
+            DailyVisitStat.objects.update_or_create(
+                date=entry["date"],
+                defaults={
+                    "visits": entry["visits"],
+                    "unique_visitors": entry["unique_visitors"],
+                    "visitor_sketch": sketches[entry["date"]].to_bytes(),
+                },
+            )
+        DailyPageStat.objects.filter(date__in=days).delete()
+        DailyPageStat.objects.bulk_create(
+            [DailyPageStat(date=entry["date"], page_path=entry["page_path"], visits=entry["visits"]) for entry in pages]
+        )
+    return len(days)
@@ -0,0 +1,85 @@
+"""Full-text search over blog posts (``?search=`` on the blog list).
+
+The index is chosen by database vendor and created by migration 0016:
+
+- SQLite: an FTS5 external-content table (``api_blogpost_fts``) with the
+  ``trigram`` tokenizer, kept in sync by triggers on ``api_blogpost`` — so
+  every write path (``save``, ``delete``, ``bulk_create``, ``update``) updates
+  it, while view/like counter updates don't touch it. Trigrams index every
+  3-character substring, which suits Korean: no word segmentation or
+  particle stripping is needed ("언어 모델" matches "언어 모델의").
+  Results are ranked by bm25 with title > description > content weights.
+  Queries join it through the unmanaged ``BlogPostSearchEntry`` model.
+- PostgreSQL: ``pg_trgm`` GIN indexes on the three columns, queried with
+  ``ILIKE`` (``icontains`` compiles to ``UPPER(col::text) LIKE``, which the
+  indexes don't cover); results are ranked by trigram word similarity with
+  the same weights.
+
+Search semantics match the old ``title|description|content icontains``
+filter: the whole query is one case-insensitive substring. Queries shorter
+than three characters can't use a trigram index and fall back to that filter.
+"""
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "api_blogpost_fts"
+
+# Column weights for ranking (title, description, content)
+WEIGHTS = (10.0, 5.0, 1.0)
+
+MIN_INDEXED_LENGTH = 3
+
+
+def rebuild_index(using="default"):
+    """Repopulate the index from ``api_blogpost`` (rebuild_search_index command)."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        elif connection.vendor == "postgresql":
+            for column in ("title", "description", "content"):
+                cursor.execute(f"REINDEX INDEX api_blogpost_{column}_trgm")
+
+
+def _fts_phrase(query):
+    """The query as one FTS5 phrase (a substring match under the trigram tokenizer)."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def search_posts(queryset, query):
+    """Filter ``queryset`` to posts containing ``query``, best matches first."""
+    vendor = connections[queryset.db].vendor
+    if len(query) >= MIN_INDEXED_LENGTH and vendor == "sqlite":
+        # A join rather than a correlated subquery, so MATCH runs once per query, not once per row
+        queryset = queryset.filter(search_entry__isnull=False)
+        fts = queryset.query.table_map[FTS_TABLE][0]
+        weights = ", ".join(str(weight) for weight in WEIGHTS)
+        # bm25() is lower for better matches
+        return (
+            queryset.filter(RawSQL(f"{fts} MATCH %s", [_fts_phrase(query)], output_field=BooleanField()))
+            .annotate(search_rank=RawSQL(f"bm25({fts}, {weights})", [], output_field=FloatField()))
+            .order_by("search_rank", "-date")
+        )
+
+    if len(query) >= MIN_INDEXED_LENGTH and vendor == "postgresql":
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        matches = RawSQL(
+            f"({table}.title ILIKE %s OR {table}.description ILIKE %s OR {table}.content ILIKE %s)",
+            [pattern, pattern, pattern],
+            output_field=BooleanField(),
+        )
+        title_weight, description_weight, content_weight = WEIGHTS
+        rank = RawSQL(
+            f"word_similarity(%s, {table}.title) * {title_weight}"
+            f" + word_similarity(%s, {table}.description) * {description_weight}"
+            f" + word_similarity(%s, {table}.content) * {content_weight}",
+            [query, query, query],
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank).order_by("-search_rank", "-date")
+
+    return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query) | Q(content__icontains=query))
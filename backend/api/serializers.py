@@ -2,8 +2,9 @@ from rest_framework import serializers
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
+from django.utils import timezone
 from .models import BlogPost, BlogComment, Contact, Notification, NotificationPreference, NewsletterSubscription
-from .constants import is_spam
+from .spam import is_spam
 import re
 
 
@@ -96,10 +97,7 @@ class BlogPostSerializer(serializers.ModelSerializer):
 
     def get_relative_date(self, obj):
         """Relative time display"""
-        from django.utils import timezone
-
-        now = timezone.now()
-        diff = now - obj.date
+        diff = self._now() - obj.date
 
         if diff.days > 365:
             years = diff.days // 365
@@ -118,6 +116,23 @@ class BlogPostSerializer(serializers.ModelSerializer):
         else:
             return "방금 전"
 
+    def _now(self):
+        # Read the clock once per serializer, so every row of a list is relative to the same instant
+        if not hasattr(self, "_now_value"):
+            self._now_value = timezone.now()
+        return self._now_value
+
+
+# Post body fields: left out of the list representation and deferred by the list query
+BLOG_POST_BODY_FIELDS = ("content", "content_html")
+
+
+class BlogPostListSerializer(BlogPostSerializer):
+    """Card fields for the blog list — BlogPostSerializer without the post body."""
+
+    class Meta(BlogPostSerializer.Meta):
+        fields = [field for field in BlogPostSerializer.Meta.fields if field not in BLOG_POST_BODY_FIELDS]
+
 
 class BlogPostWriteSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating blog posts (admin only)."""
@@ -169,8 +184,9 @@ class BlogCommentSerializer(serializers.ModelSerializer):
         }
 
     def get_replies(self, obj):
-        # Only include replies for top-level comments (avoid infinite recursion)
-        if obj.parent is not None:
+        # Only include replies for top-level comments (avoid infinite recursion);
+        # list views use the one-query tree loader instead (api/comments.py)
+        if obj.parent_id is not None:
             return []
         replies = obj.replies.all()
         return BlogCommentSerializer(replies, many=True).data
@@ -0,0 +1,80 @@
+"""Signal receivers, connected in ApiConfig.ready().
+
+Receivers are connected per sender: a ``post_delete`` receiver makes Django
+fetch and delete rows one by one for its sender instead of issuing a single
+``DELETE``, so models with bulk deletes (``SiteVisit``) get none.
+"""
+
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .authentication import user_changed
+from .conditional import blog_list_changed
+from .counters import COUNTED, adjust
+from .counting import invalidate_counts
+from .models import BlogPost, Contact, SiteVisit, SpamKeyword
+from .spam import rules_changed
+
+# Models whose paginated lists use cached counts (api.counting.CACHED)
+COUNTED_MODELS = (BlogPost, Contact, User)
+
+# Model -> StatCounters field
+TOTAL_FIELDS = {model: field for field, model in COUNTED.items()}
+
+
+def invalidate_cached_counts(sender, using="default", update_fields=None, **kwargs):
+    # A login's last_login stamp changes no row's membership in any counted list
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    invalidate_counts(sender, using)
+
+
+def count_created(sender, created, using="default", **kwargs):
+    if created:
+        adjust(TOTAL_FIELDS[sender], 1, using)
+
+
+def count_deleted(sender, using="default", **kwargs):
+    adjust(TOTAL_FIELDS[sender], -1, using)
+
+
+def reload_spam_rules(sender, using="default", **kwargs):
+    # After commit, so other workers reloading right away read the new rows
+    transaction.on_commit(rules_changed, using=using)
+
+
+def retire_list_etags(sender, using="default", **kwargs):
+    blog_list_changed(using)
+
+
+def forget_cached_user(sender, instance, using="default", update_fields=None, **kwargs):
+    # A login only stamps last_login, which nothing reads from the cached user
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    # After commit, so a request refilling the cache meanwhile can't keep the old row
+    transaction.on_commit(partial(user_changed, instance.pk), using=using)
+
+
+for model in COUNTED_MODELS:
+    post_save.connect(invalidate_cached_counts, sender=model, dispatch_uid=f"invalidate_counts_save_{model.__name__}")
+    post_delete.connect(
+        invalidate_cached_counts, sender=model, dispatch_uid=f"invalidate_counts_delete_{model.__name__}"
+    )
+
+for model in TOTAL_FIELDS:
+    post_save.connect(count_created, sender=model, dispatch_uid=f"count_created_{model.__name__}")
+    if model is not SiteVisit:
+        # cleanup_sitevisits adjusts the total itself, keeping its DELETE a single statement
+        post_delete.connect(count_deleted, sender=model, dispatch_uid=f"count_deleted_{model.__name__}")
+
+post_save.connect(reload_spam_rules, sender=SpamKeyword, dispatch_uid="reload_spam_rules_save")
+post_delete.connect(reload_spam_rules, sender=SpamKeyword, dispatch_uid="reload_spam_rules_delete")
+
+post_save.connect(retire_list_etags, sender=BlogPost, dispatch_uid="retire_list_etags_save")
+post_delete.connect(retire_list_etags, sender=BlogPost, dispatch_uid="retire_list_etags_delete")
+
+post_save.connect(forget_cached_user, sender=User, dispatch_uid="forget_cached_user_save")
+post_delete.connect(forget_cached_user, sender=User, dispatch_uid="forget_cached_user_delete")
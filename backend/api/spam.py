@@ -0,0 +1,184 @@
+"""Keyword spam scoring for contact messages and blog comments.
+
+Rules are keywords with weights, merged in this order (later wins):
+
+- the built-in ``SPAM_KEYWORDS`` (api/constants.py), weight 1;
+- ``SPAM_FILTER["RULES_FILE"]``, one ``keyword`` or ``keyword<TAB>weight`` per
+  line (``#`` comments);
+- ``SpamKeyword`` rows, editable in the Django admin.
+
+Weight 0 (or an inactive row) turns a keyword off. A text is spam when the
+weights of the distinct keywords it contains add up to ``THRESHOLD``.
+
+All keywords are compiled into one regex shaped like a trie — common prefixes
+factored out — so a text is scanned once by the C regex engine however many
+keywords there are, instead of one substring search per keyword.
+
+Workers pick up rule changes without a restart: saving or deleting a
+``SpamKeyword`` bumps a version in the shared cache (after commit), and each
+worker compares it, and the rules file's mtime, with what it loaded at most
+every ``RELOAD_INTERVAL`` seconds. Rule hit counters are per worker
+(``admin_metrics``).
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from .constants import CACHE_SPAM_RULES_VERSION, SPAM_KEYWORDS, SPAM_THRESHOLD
+from .models import SpamKeyword
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "THRESHOLD": SPAM_THRESHOLD,
+    "RULES_FILE": None,
+    "RELOAD_INTERVAL": 30,
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, "SPAM_FILTER", {})}
+
+
+def _trie_pattern(keywords) -> str:
+    """Alternation of ``keywords`` with shared prefixes factored out, e.g. ``ca(?:sino|sh)``."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional: the longest keyword at a position wins, shorter ones are implied
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class SpamScorer:
+    """Weighted keyword rules compiled into a single matcher."""
+
+    def __init__(self, rules: dict[str, int]):
+        self.rules = {keyword: weight for keyword, weight in rules.items() if keyword and weight > 0}
+        self.hits = Counter()
+        self._pattern = re.compile(_trie_pattern(self.rules)) if self.rules else None
+        # Keywords inside a longer one: a match of the longer keyword contains them too
+        self._implied = {
+            keyword: [other for other in self.rules if other != keyword and other in keyword] for keyword in self.rules
+        }
+
+    def matches(self, text: str) -> set[str]:
+        """Distinct keywords contained in ``text`` (overlapping ones included)."""
+        found = set()
+        if self._pattern is None:
+            return found
+        text = text.lower()
+        match = self._pattern.search(text)
+        while match:
+            keyword = match.group()
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._implied[keyword])
+            # Resume one character later, not after the match, so overlapping keywords are seen
+            match = self._pattern.search(text, match.start() + 1)
+        return found
+
+    def score(self, text: str) -> int:
+        found = self.matches(text)
+        self.hits.update(found)
+        return sum(self.rules[keyword] for keyword in found)
+
+    def stats(self):
+        return {"rules": len(self.rules), "hits": dict(self.hits.most_common())}
+
+
+def _read_rules_file(path):
+    rules = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            keyword, _, weight = line.partition("\t")
+            rules[keyword.strip().lower()] = int(weight) if weight.strip() else 1
+    return rules
+
+
+def load_rules(config=None) -> dict[str, int]:
+    """Merged rules from all sources; a broken file or missing table is logged and skipped."""
+    config = config or _config()
+    rules = {keyword: 1 for keyword in SPAM_KEYWORDS}
+    if config["RULES_FILE"]:
+        try:
+            rules.update(_read_rules_file(config["RULES_FILE"]))
+        except (OSError, ValueError) as e:
+            logger.error(f"Spam rules file {config['RULES_FILE']} not loaded: {e}")
+    try:
+        for keyword, weight, is_active in SpamKeyword.objects.values_list("keyword", "weight", "is_active"):
+            rules[keyword] = weight if is_active else 0
+    except DatabaseError as e:
+        logger.error(f"Spam keywords not loaded from the database: {e}")
+    return rules
+
+
+def _file_mtime(path):
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+_scorer = None
+_loaded = None  # (cache version, rules file, file mtime) the current scorer was built from
+_checked_at = float("-inf")
+_lock = threading.Lock()
+
+
+def get_scorer() -> SpamScorer:
+    """This worker's scorer, rebuilt when the rules changed (checked every RELOAD_INTERVAL seconds)."""
+    global _scorer, _loaded, _checked_at
+    config = _config()
+    now = time.monotonic()
+    if _scorer is not None and now - _checked_at < config["RELOAD_INTERVAL"]:
+        return _scorer
+    with _lock:
+        state = (cache.get(CACHE_SPAM_RULES_VERSION), config["RULES_FILE"], _file_mtime(config["RULES_FILE"]))
+        if _scorer is None or state != _loaded:
+            scorer = SpamScorer(load_rules(config))
+            if _scorer is not None:
+                scorer.hits.update({keyword: n for keyword, n in _scorer.hits.items() if keyword in scorer.rules})
+            _scorer, _loaded = scorer, state
+        _checked_at = now
+    return _scorer
+
+
+def rules_changed():
+    """Make every worker reload its rules at its next check, this one at its next call."""
+    global _loaded, _checked_at
+    cache.set(CACHE_SPAM_RULES_VERSION, uuid.uuid4().hex, timeout=None)
+    _loaded, _checked_at = None, float("-inf")
+
+
+def score(text: str) -> int:
+    return get_scorer().score(text)
+
+
+def is_spam(text: str) -> bool:
+    """Check if text's keyword score reaches the spam threshold."""
+    return score(text) >= _config()["THRESHOLD"]
@@ -16,6 +16,8 @@ from .models import (
     Notification,
     NotificationPreference,
     SiteVisit,
+    DailyVisitStat,
+    DailyPageStat,
     NewsletterSubscription,
 )
 from .utils import get_client_ip, _is_valid_ip
@@ -27,6 +29,10 @@ from django.conf import settings
 from datetime import datetime, timezone, timedelta
 from django.utils import timezone as django_timezone
 from django.contrib import admin
+from django.core.management import call_command
+from io import StringIO
+import os
+import time
 import requests
 
 # Disable throttling for all tests to avoid rate-limit interference
@@ -140,6 +146,32 @@ class BlogPostAPITestCase(APITestCase):
         self.blog_post.refresh_from_db()
         self.assertEqual(self.blog_post.view_count, 1)
 
+    def test_list_omits_post_body(self):
+        """List items carry the card fields only; the detail view still has the body"""
+        list_item = self.client.get(reverse("blog-list")).json()["results"][0]
+        detail = self.client.get(reverse("blog-detail", kwargs={"slug": self.blog_post.slug})).json()
+        self.assertNotIn("content", list_item)
+        self.assertNotIn("content_html", list_item)
+        self.assertEqual(detail["content"], "Test content")
+        # Card fields are identical to the full representation
+        for field in ("content", "content_html"):
+            detail.pop(field)
+        detail["view_count"] = list_item["view_count"]
+        self.assertEqual(list_item, detail)
+
+    def test_list_query_defers_post_body(self):
+        """The list query does not load content / content_html"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("blog-list"))
+        post_queries = [q["sql"] for q in queries if 'FROM "api_blogpost"' in q["sql"] and "COUNT" not in q["sql"]]
+        self.assertTrue(post_queries)
+        for sql in post_queries:
+            self.assertNotIn('"api_blogpost"."content"', sql)
+            self.assertNotIn('"api_blogpost"."content_html"', sql)
+
     def test_retrieve_nonexistent_post(self):
         """Test retrieving a post that doesn't exist"""
         url = reverse("blog-detail", kwargs={"slug": "non-existent-slug"})
@@ -147,7 +179,278 @@ class BlogPostAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class BlogSearchTestCase(TestCase):
+    """Tests for the full-text blog search index (api/search.py)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.title_hit = BlogPost.objects.create(
+            title="대규모 언어 모델 서빙", description="운영 가이드", content="배포 절차를 다룹니다.", category="ai"
+        )
+        cls.content_hit = BlogPost.objects.create(
+            title="GPU 비용 절감", description="인프라", content="대규모 언어 모델의 KV 캐시를 줄입니다.", category="ai"
+        )
+        cls.other = BlogPost.objects.create(
+            title="Data pipelines", description="ETL basics", content="Batch and streaming.", category="ds"
+        )
+
+    def _search(self, query):
+        from api.search import search_posts
+
+        return list(search_posts(BlogPost.objects.all(), query))
+
+    def test_korean_substring_match_ranked(self):
+        """A Korean phrase matches inside longer words; title matches rank first"""
+        self.assertEqual(self._search("언어 모델"), [self.title_hit, self.content_hit])
+
+    def test_case_insensitive(self):
+        self.assertEqual(self._search("PIPELINE"), [self.other])
+
+    def test_short_query_falls_back_to_icontains(self):
+        """Queries below the trigram length still work"""
+        self.assertEqual(set(self._search("모델")), {self.title_hit, self.content_hit})
+        self.assertEqual(self._search("KV"), [self.content_hit])
+
+    def test_query_syntax_is_literal(self):
+        """FTS operators and quotes in user input are searched literally"""
+        self.assertEqual(self._search('"언어 OR'), [])
+        self.assertEqual(self._search("Batch AND"), [self.other])
+
+    def test_index_follows_writes(self):
+        """Updates, deletes and bulk inserts are reflected immediately"""
+        post = BlogPost.objects.get(pk=self.other.pk)
+        post.title = "Feature stores"
+        post.save()
+        self.assertEqual(self._search("pipelines"), [])
+        self.assertEqual(self._search("feature store"), [post])
+
+        BlogPost.objects.filter(pk=post.pk).update(content="Now about vector databases")
+        self.assertEqual(self._search("vector data"), [post])
+
+        BlogPost.objects.bulk_create(
+            [BlogPost(title="Vector search", slug="vector-search", description="d", content="c", category="ai")]
+        )
+        self.assertEqual(len(self._search("vector")), 2)
+
+        post.delete()
+        self.assertEqual(len(self._search("vector")), 1)
+
+    def test_list_endpoint_uses_ranking(self):
+        response = self.client.get(reverse("blog-list"), {"search": "언어 모델"})
+        self.assertEqual([item["id"] for item in response.json()["results"]], [self.title_hit.id, self.content_hit.id])
+        self.assertEqual(response.json()["count"], 2)
+
+    def test_rebuild_command(self):
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO api_blogpost_fts (api_blogpost_fts) VALUES ('delete-all')")
+        self.assertEqual(self._search("언어 모델"), [])
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Rebuilt search index for 3 posts", out.getvalue())
+        self.assertEqual(self._search("언어 모델"), [self.title_hit, self.content_hit])
+
+
 @override_settings(REST_FRAMEWORK={**NO_THROTTLE})
+class KeysetPaginationTestCase(APITestCase):
+    """Cursor pages of the blog list (?pagination=cursor)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        # Ties on date (and sub-millisecond gaps) must neither skip nor repeat posts
+        dates = [base, base, base, base + timedelta(microseconds=1), base + timedelta(microseconds=2)]
+        dates += [base - timedelta(days=i) for i in range(1, 8)]
+        BlogPost.objects.bulk_create(
+            [
+                BlogPost(title=f"P{i}", slug=f"p{i}", description="D", content="C", category="ai", date=date)
+                for i, date in enumerate(dates)
+            ]
+        )
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def _walk(self, url, params):
+        slugs, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            slugs += [post["slug"] for post in response.data["results"]]
+            pages += 1
+            if not response.data["has_next"]:
+                self.assertIsNone(response.data["next"])
+                return slugs, pages
+            response = self.client.get(response.data["next"])
+
+    def test_walks_every_post_once_in_order(self):
+        slugs, pages = self._walk(reverse("blog-list"), {"pagination": "cursor", "page_size": 5})
+        expected = list(BlogPost.objects.order_by("-date", "-id").values_list("slug", flat=True))
+        self.assertEqual(slugs, expected)
+        self.assertEqual(pages, 3)
+
+    def test_exact_final_page_has_no_next(self):
+        response = self.client.get(reverse("blog-list"), {"pagination": "cursor", "page_size": 12})
+        self.assertEqual(len(response.data["results"]), 12)
+        self.assertFalse(response.data["has_next"])
+
+    def test_no_count_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("blog-list"), {"page": 1})
+        self.assertTrue([q for q in queries if '"__count"' in q["sql"]])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("blog-list"), {"pagination": "cursor"})
+        self.assertFalse([q for q in queries if '"__count"' in q["sql"]])
+
+    def test_cursor_page_runs_no_aggregate(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        first = self.client.get(reverse("blog-list"), {"pagination": "cursor", "page_size": 5})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(first.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Neither the paginator nor the list ETag (api.conditional) aggregates over the posts
+        aggregates = [q["sql"] for q in queries if any(f in q["sql"] for f in ("COUNT(", "SUM(", "MAX("))]
+        self.assertEqual(aggregates, [])
+
+    def test_filters_apply(self):
+        BlogPost.objects.filter(slug="p0").update(category="ml")
+        slugs, _ = self._walk(reverse("blog-list"), {"pagination": "cursor", "page_size": 2, "category": "ml"})
+        self.assertEqual(slugs, ["p0"])
+
+    def test_search_falls_back_to_page_numbers(self):
+        response = self.client.get(reverse("blog-list"), {"pagination": "cursor", "search": "P1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("count", response.data)
+
+    def test_invalid_cursor(self):
+        for cursor in ("not-a-cursor", "WyJ4Il0", "WyJ4IiwgMV0"):
+            response = self.client.get(reverse("blog-list"), {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("cursor", response.data)
+
+    def test_page_numbers_by_default(self):
+        response = self.client.get(reverse("blog-list"), {"page": 2})
+        self.assertEqual(response.data["count"], 12)
+
+
+class CountingTestCase(APITestCase):
+    """Count strategies for paginated responses (api.counting)"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        for i in range(3):
+            Contact.objects.create(name=f"T{i}", email="t@test.com", message="Hello")
+
+    def _count_queries(self, func):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            value = func()
+        return value, len([q for q in queries if "COUNT(" in q["sql"]])
+
+    def test_cached_count_reused_per_query(self):
+        from api.counting import CACHED, count
+
+        self.assertEqual(self._count_queries(lambda: count(Contact.objects.all(), CACHED)), (3, 1))
+        self.assertEqual(self._count_queries(lambda: count(Contact.objects.order_by("name"), CACHED)), (3, 0))
+        self.assertEqual(self._count_queries(lambda: count(Contact.objects.filter(name="T1"), CACHED)), (1, 1))
+
+    def test_cached_count_invalidated_on_save_and_delete(self):
+        from api.counting import CACHED, count
+
+        self.assertEqual(count(Contact.objects.all(), CACHED), 3)
+        contact = Contact.objects.create(name="T3", email="t@test.com", message="Hello")
+        self.assertEqual(count(Contact.objects.all(), CACHED), 4)
+        contact.delete()
+        self.assertEqual(count(Contact.objects.all(), CACHED), 3)
+
+    def test_login_keeps_cached_user_count(self):
+        """A last_login-only save leaves the User count cached; other saves drop it"""
+        from django.contrib.auth.models import update_last_login
+
+        from api.counting import CACHED, count
+
+        user = User.objects.create_user(username="counted", password="pw")
+        self.assertEqual(self._count_queries(lambda: count(User.objects.all(), CACHED)), (1, 1))
+        update_last_login(None, user)
+        self.assertEqual(self._count_queries(lambda: count(User.objects.all(), CACHED)), (1, 0))
+        user.save()
+        self.assertEqual(self._count_queries(lambda: count(User.objects.all(), CACHED)), (1, 1))
+
+    def test_invalidation_repeats_on_commit(self):
+        from api.counting import invalidate_counts
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            invalidate_counts(Contact)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_empty_result_set(self):
+        from api.counting import CACHED, count
+
+        self.assertEqual(count(Contact.objects.filter(pk__in=[]), CACHED), 0)
+
+    def test_estimated_count_uses_planner_statistics(self):
+        """Unfiltered querysets use the ANALYZE estimate; filtered ones are counted"""
+        from unittest import mock
+
+        from django.db import connection
+
+        from api.counting import ESTIMATED, count, estimated_count
+
+        self.assertIsNone(estimated_count(Contact))
+        self.assertEqual(count(Contact.objects.all(), ESTIMATED), 3)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE api_contact")
+        Contact.objects.create(name="T3", email="t@test.com", message="Hello")
+        self.assertEqual(estimated_count(Contact), 3)
+        with mock.patch("api.counting.ESTIMATE_THRESHOLD", 1):
+            self.assertEqual(count(Contact.objects.all(), ESTIMATED), 3)
+            self.assertEqual(count(Contact.objects.filter(name__startswith="T"), ESTIMATED), 4)
+        # Small tables are counted exactly
+        self.assertEqual(count(Contact.objects.all(), ESTIMATED), 4)
+
+    def test_analyze_db_writes_statistics(self):
+        """analyze_db gives SQLite the statistics ESTIMATED reads"""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from api.counting import estimated_count
+
+        self.assertIsNone(estimated_count(Contact))
+        call_command("analyze_db", stdout=StringIO())
+        self.assertEqual(estimated_count(Contact), 3)
+
+    def test_blog_list_count_is_cached(self):
+        """The blog list's page count is served from the cache until a post changes"""
+        from unittest import mock
+
+        BlogPost.objects.create(title="P", description="D", content="C", category="ai")
+        url = reverse("blog-list")
+        with mock.patch("api.views.log_site_visit"):
+            response, counts = self._count_queries(lambda: self.client.get(url, {"page": 1, "category": "ai"}))
+            self.assertEqual((response.data["count"], counts), (1, 1))
+            response, counts = self._count_queries(lambda: self.client.get(url, {"page": 1, "category": "ai"}))
+            self.assertEqual((response.data["count"], counts), (1, 0))
+
+            BlogPost.objects.create(title="Q", description="D", content="C", category="ai")
+            response = self.client.get(url, {"page": 1, "category": "ai"})
+            self.assertEqual(response.data["count"], 2)
+
+
 class BlogPostWriteAPITestCase(APITestCase):
     """Tests for BlogPost write API endpoints (create, update, delete)"""
 
@@ -313,6 +616,180 @@ class BlogLikeAPITestCase(APITestCase):
         self.assertEqual(BlogLike.objects.count(), 2)
 
 
+class LikeEngineTestCase(TestCase):
+    """Tests for toggle_like and the sharded like counters (api/likes.py)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = BlogPost.objects.create(title="Hot Post", description="Desc", content="Content", category="ai")
+        cls.comment = BlogComment.objects.create(post=cls.post, author_name="User1", content="Comment")
+
+    def _deferred(self):
+        """Settings that leave folding to the (patched out) worker thread"""
+        from unittest.mock import patch
+
+        self.enterContext(self.settings(LIKE_COUNTERS={**settings.LIKE_COUNTERS, "ASYNC": True, "SHARDS": 4}))
+        return self.enterContext(patch("api.likes.like_counter_folder.wake"))
+
+    def test_toggle_statements(self):
+        """Liking takes three statements and unliking four, none writing the post row"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from api.likes import toggle_like
+
+        self._deferred()
+        for liked, statements in ((True, 3), (False, 4)):
+            with CaptureQueriesContext(connection) as queries:
+                result = toggle_like(self.post, BlogLike, "post", "10.0.0.1")
+            self.assertEqual(result, {"liked": liked, "likes": int(liked)})
+            sql = [q["sql"] for q in queries if "SAVEPOINT" not in q["sql"]]
+            self.assertEqual(len(sql), statements, sql)
+            self.assertFalse(any(q.startswith("UPDATE") for q in sql))
+
+    def test_shards_fold_into_likes(self):
+        """Pending deltas are spread over shards, counted in responses, and folded into likes"""
+        from api.likes import like_counter_folder, toggle_like
+        from api.models import LikeCounterShard
+
+        wake = self._deferred()
+        for i in range(20):
+            result = toggle_like(self.post, BlogLike, "post", f"10.0.1.{i}")
+        self.assertEqual(result["likes"], 20)
+        self.assertEqual(wake.call_count, 20)
+        toggle_like(self.post, BlogLike, "post", "10.0.1.0")
+        result = toggle_like(self.comment, CommentLike, "comment", "10.0.1.0")
+        self.assertEqual(result["likes"], 1)
+
+        self.assertLessEqual(LikeCounterShard.objects.filter(target="post").count(), 4)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes, 0)
+
+        pending = LikeCounterShard.objects.count()
+        self.assertEqual(like_counter_folder.flush(), pending)
+        self.post.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertEqual((self.post.likes, self.comment.likes), (19, 1))
+        self.assertFalse(LikeCounterShard.objects.exists())
+        self.assertEqual(toggle_like(self.post, BlogLike, "post", "10.0.1.1")["likes"], 18)
+
+    def test_drain_error_is_logged_not_raised(self):
+        """A locked database while listing shards is counted; the shards stay and fold next time"""
+        from unittest.mock import patch
+
+        from django.db import OperationalError
+
+        from api.likes import like_counter_folder, toggle_like
+
+        self._deferred()
+        toggle_like(self.post, BlogLike, "post", "10.0.2.1")
+        errors = like_counter_folder.stats()["errors"]
+        with patch("api.likes.LikeCounterShard.objects.order_by", side_effect=OperationalError("database is locked")):
+            with self.assertLogs("api.ingest", level="ERROR") as logs:
+                self.assertEqual(like_counter_folder.flush(), 0)
+        self.assertIn("database is locked", logs.output[0])
+        self.assertEqual(like_counter_folder.stats()["errors"], errors + 1)
+        self.assertEqual(like_counter_folder.flush(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes, 1)
+
+    def test_ip_stored_like_the_orm(self):
+        """IPv6 addresses are normalized as the model field would store them"""
+        from api.likes import toggle_like
+
+        self.assertTrue(toggle_like(self.post, BlogLike, "post", "2001:0db8:0000::0001")["liked"])
+        like = BlogLike.objects.get(post=self.post)
+        self.assertEqual(like.ip_address, "2001:db8::1")
+        self.assertIsNotNone(like.created_at)
+        self.assertFalse(toggle_like(self.post, BlogLike, "post", "2001:db8::1")["liked"])
+
+
+@override_settings(REST_FRAMEWORK={**NO_THROTTLE})
+class LikedLookupAPITestCase(APITestCase):
+    """Tests for the batch liked lookup and ?include=liked"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.posts = [
+            BlogPost.objects.create(title=f"Post {i}", description="D", content="C", category="ai") for i in range(3)
+        ]
+        cls.comment = BlogComment.objects.create(post=cls.posts[0], author_name="User1", content="Top")
+        cls.reply = BlogComment.objects.create(
+            post=cls.posts[0], parent=cls.comment, author_name="User2", content="Reply"
+        )
+        BlogLike.objects.create(post=cls.posts[0], ip_address="10.0.0.1")
+        BlogLike.objects.create(post=cls.posts[2], ip_address="10.0.0.1")
+        BlogLike.objects.create(post=cls.posts[1], ip_address="10.0.0.2")
+        CommentLike.objects.create(comment=cls.reply, ip_address="10.0.0.1")
+        cls.url = reverse("liked-lookup")
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()  # liked answers are cached per IP, and ids repeat across test databases
+
+    def test_lookup_one_query_per_list(self):
+        """Liked ids of the client's IP only, one IN query per requested list"""
+        ids = ",".join(str(post.pk) for post in self.posts)
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.url, {"posts": ids, "comments": f"{self.comment.pk},{self.reply.pk}"}, REMOTE_ADDR="10.0.0.1"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"posts": [self.posts[0].pk, self.posts[2].pk], "comments": [self.reply.pk]})
+        self.assertIn("private", response["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.json(), {"posts": [], "comments": []})
+
+    def test_lookup_validation(self):
+        """Non-integer ids and more than MAX_LIKED_LOOKUP ids are rejected"""
+        from api.likes import MAX_LIKED_LOOKUP
+
+        self.assertEqual(self.client.get(self.url, {"posts": "1,abc"}).status_code, 400)
+        too_many = ",".join(str(i) for i in range(1, MAX_LIKED_LOOKUP + 2))
+        self.assertEqual(self.client.get(self.url, {"comments": too_many}).status_code, 400)
+        at_cap = ",".join(str(i) for i in range(1, MAX_LIKED_LOOKUP + 1))
+        self.assertEqual(self.client.get(self.url, {"comments": at_cap}).status_code, 200)
+
+    def test_cached_per_ip_until_toggle(self):
+        """Answers are cached per IP; toggling a like drops that IP's cached answers"""
+        from api.likes import liked_ids, toggle_like
+
+        ids = [post.pk for post in self.posts]
+        self.assertEqual(liked_ids("post", "10.0.0.1", ids), {self.posts[0].pk, self.posts[2].pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(liked_ids("post", "10.0.0.1", ids[:2]), {self.posts[0].pk})
+        with self.assertNumQueries(1):
+            self.assertEqual(liked_ids("post", "10.0.0.2", ids), {self.posts[1].pk})
+
+        toggle_like(self.posts[1], BlogLike, "post", "10.0.0.1")
+        with self.assertNumQueries(1):
+            self.assertEqual(liked_ids("post", "10.0.0.1", ids), set(ids))
+
+    def test_include_liked_on_post_list(self):
+        """?include=liked flags each listed post and makes the response private"""
+        response = self.client.get(reverse("blog-list"), {"include": "liked"}, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 200)
+        liked = {post["id"]: post["liked"] for post in response.json()["results"]}
+        self.assertEqual(liked, {self.posts[0].pk: True, self.posts[1].pk: False, self.posts[2].pk: True})
+        self.assertIn("private", response["Cache-Control"])
+
+        response = self.client.get(reverse("blog-list"))
+        self.assertNotIn("liked", response.json()["results"][0])
+
+    def test_include_liked_on_comment_tree(self):
+        """?include=liked flags comments at every level with one extra query"""
+        url = reverse("blog-comment-list", kwargs={"post_pk": self.posts[0].pk})
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"include": "liked"}, REMOTE_ADDR="10.0.0.1")
+        self.assertIn("private", response["Cache-Control"])
+        top = response.json()[0]
+        self.assertFalse(top["liked"])
+        self.assertTrue(top["replies"][0]["liked"])
+
+
 @override_settings(REST_FRAMEWORK={**NO_THROTTLE})
 class BlogCommentAPITestCase(APITestCase):
     """Tests for blog comment API"""
@@ -425,6 +902,71 @@ class BlogCommentAPITestCase(APITestCase):
         response = self.client.get(self.comments_url)
         self.assertEqual(len(response.data), 1)
 
+    def _thread(self, depth):
+        """A top-level comment with a chain of ``depth`` nested replies; returns all of them"""
+        comments = [BlogComment.objects.create(post=self.post, author_name="Root", content="Level 0")]
+        for level in range(1, depth + 1):
+            comments.append(
+                BlogComment.objects.create(
+                    post=self.post, author_name=f"User{level}", content=f"Level {level}", parent=comments[-1]
+                )
+            )
+        return comments
+
+    def test_list_comments_single_query(self):
+        """The whole tree is loaded with one query, however many comments and levels"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for _ in range(3):
+            root, *_ = self._thread(4)
+            BlogComment.objects.create(post=self.post, author_name="Sibling", content="Reply", parent=root)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.comments_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(queries), 1)
+
+    def test_list_comments_nested_depth(self):
+        """Replies to replies are nested level by level"""
+        self._thread(3)
+        response = self.client.get(self.comments_url)
+        node = response.data[0]
+        for level in range(1, 4):
+            self.assertEqual(len(node["replies"]), 1)
+            node = node["replies"][0]
+            self.assertEqual(node["content"], f"Level {level}")
+        self.assertEqual(node["replies"], [])
+
+    def test_list_comments_depth_cap_flattens(self):
+        """Replies below the depth cap are listed at the last level, depth-first"""
+        comments = self._thread(5)
+        with self.settings(COMMENT_MAX_DEPTH=2):
+            response = self.client.get(self.comments_url)
+        level1 = response.data[0]["replies"][0]
+        self.assertEqual(level1["id"], comments[1].id)
+        self.assertEqual([reply["id"] for reply in level1["replies"]], [c.id for c in comments[2:]])
+        self.assertTrue(all(reply["replies"] == [] for reply in level1["replies"]))
+
+        response = self.client.get(self.comments_url, {"depth": 1})
+        self.assertEqual([reply["id"] for reply in response.data[0]["replies"]], [c.id for c in comments[1:]])
+        response = self.client.get(self.comments_url, {"depth": 0})
+        self.assertEqual(response.data[0]["replies"], [])
+        response = self.client.get(self.comments_url, {"depth": "deep"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_comments_matches_serializer(self):
+        """Tree nodes have the same fields and values as BlogCommentSerializer"""
+        from .serializers import BlogCommentSerializer
+
+        parent = BlogComment.objects.create(post=self.post, author_name="User1", content="Parent")
+        older = BlogComment.objects.create(post=self.post, author_name="User2", content="Older", parent=parent)
+        newer = BlogComment.objects.create(post=self.post, author_name="User3", content="Newer", parent=parent)
+        BlogComment.objects.filter(pk=older.pk).update(created_at=django_timezone.now() - timedelta(hours=1))
+        response = self.client.get(self.comments_url)
+        self.assertEqual(response.data, BlogCommentSerializer([parent], many=True).data)
+        self.assertEqual([reply["id"] for reply in response.data[0]["replies"]], [newer.id, older.id])
+
 
 class BlogPostModelTestCase(TestCase):
     """Tests for BlogPost model"""
@@ -926,6 +1468,89 @@ class AuthenticationAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(REST_FRAMEWORK={**NO_THROTTLE})
+class UserEmailLookupTestCase(APITestCase):
+    """Tests for case-insensitive email lookups (email__lower and its index)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="mixedcase", email="Mixed.Case@Example.com", password="testpass12345"
+        )
+        cls.admin = User.objects.create_superuser(
+            username="lookupadmin", email="la@example.com", password="adminpass12345"
+        )
+
+    def test_index_used(self):
+        """Login, update_user and admin search lookups are answered from the LOWER(email) index"""
+        from django.db import connection
+        from django.db.models import Q
+
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN output is SQLite's")
+        for queryset in (
+            User.objects.filter(email__lower="mixed.case@example.com"),
+            User.objects.filter(email__lower="mixed.case@example.com").exclude(id=self.admin.pk),
+            User.objects.filter(Q(email__lower="mixed.case@example.com") | Q(username="mixed.case@example.com")),
+        ):
+            plan = queryset.explain()
+            self.assertIn("USING INDEX auth_user_email_lower_idx", plan)
+            self.assertNotIn("SCAN auth_user", plan)
+
+    def test_login_email_any_case(self):
+        """Login by email ignores case"""
+        response = self.client.post(
+            reverse("login"), {"username": " mixed.case@EXAMPLE.com", "password": "testpass12345"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["username"], "mixedcase")
+
+    def test_login_email_shared_by_two_accounts(self):
+        """When emails differ only in case, the account whose password matches logs in"""
+        User.objects.create_user(username="other", email="mixed.case@example.com", password="otherpass12345")
+        for password, username in (("testpass12345", "mixedcase"), ("otherpass12345", "other")):
+            response = self.client.post(
+                reverse("login"), {"username": "mixed.case@example.com", "password": password}, format="json"
+            )
+            self.assertEqual(response.data["user"]["username"], username)
+
+    def test_update_user_email_taken_in_other_case(self):
+        """An email differing only in case from another user's is rejected"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.put(reverse("update_user"), {"email": "MIXED.case@example.com"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.put(reverse("update_user"), {"email": "mixed.case@example.com"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_user_email_stored_normalized(self):
+        """The stored email is the stripped one the duplicate check saw, with the domain lowercased"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.put(reverse("update_user"), {"email": "  New.Address@Example.COM "}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, "New.Address@example.com")
+
+    def test_update_user_email_not_a_string(self):
+        """A null or numeric email is a 400, not a server error"""
+        self.client.force_authenticate(user=self.user)
+        for email in (None, 42):
+            response = self.client.put(reverse("update_user"), {"email": email}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_search(self):
+        """A whole address matches exactly in any case; anything else is still a substring search"""
+        self.client.force_authenticate(user=self.admin)
+        for search, expected in (
+            ("MIXED.CASE@example.com", ["mixedcase"]),
+            ("case@example.com", []),
+            ("case@exam", ["mixedcase"]),
+            ("lookup", ["lookupadmin"]),
+        ):
+            response = self.client.get(reverse("admin-users"), {"search": search})
+            self.assertEqual([user["username"] for user in response.data["results"]], expected, search)
+
+
 class CategoryListAPITestCase(APITestCase):
     """Tests for Category List API endpoint"""
 
@@ -1057,6 +1682,185 @@ class CategoryCacheTestCase(APITestCase):
         self.assertIsNone(cache.get("blog_categories"))
 
 
+class ConditionalGetTestCase(APITestCase):
+    """ETag / Last-Modified revalidation of the public blog endpoints"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.post = BlogPost.objects.create(
+            title="P", description="D", content="C", category="ai", date=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+
+    def _revalidate(self, url, response, **extra):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"], **extra)
+
+    def _count_queries(self, request):
+        """Queries made by ``request()``, not counting the visit log (synchronous under test)"""
+        from unittest import mock
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with mock.patch("api.views.log_site_visit"), CaptureQueriesContext(connection) as queries:
+            response = request()
+        return response, len(queries)
+
+    def test_list_not_modified(self):
+        """A matching If-None-Match gets an empty 304 with the same validators"""
+        url = reverse("blog-list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("s-maxage=", response["Cache-Control"])
+
+        revalidated = self._revalidate(url, response)
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+        self.assertIn("public", revalidated["Cache-Control"])
+
+    def test_list_304_skips_serialization(self):
+        """Revalidating a filtered list reads only the cached list generation, not the posts"""
+        url = reverse("blog-list") + "?category=ai"
+        response = self.client.get(url)
+        revalidated, queries = self._count_queries(lambda: self._revalidate(url, response))
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(queries, 0)
+
+    def test_list_validators_do_not_scan_posts(self):
+        """A list request runs no aggregate over the filtered posts for its ETag"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.get(reverse("blog-list"))
+        for params in ({"page": 2}, {"category": "ai"}, {"pagination": "cursor"}, {"search": "P"}):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse("blog-list"), params)
+            self.assertFalse([q for q in queries if "SUM(" in q["sql"] or "MAX(" in q["sql"]], params)
+
+    def test_list_etag_changes(self):
+        """Edits, counter bumps, deletions and filter parameters all change the list ETag"""
+        url = reverse("blog-list")
+        etag = self.client.get(url)["ETag"]
+        self.assertNotEqual(self.client.get(url + "?category=ai")["ETag"], etag)
+        self.assertNotEqual(self.client.get(url + "?category=ml")["ETag"], etag)
+
+        response = self.client.get(url + "?featured=false")
+        self.client.get(reverse("blog-detail", kwargs={"slug": self.post.slug}), REMOTE_ADDR="203.0.113.1")
+        self.assertEqual(self._revalidate(url + "?featured=false", response).status_code, status.HTTP_200_OK)
+        response = self.client.get(url + "?featured=false")
+        self.client.post(reverse("blog-like", kwargs={"slug": self.post.slug}), REMOTE_ADDR="203.0.113.1")
+        self.assertEqual(self._revalidate(url + "?featured=false", response).status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url + "?featured=false")
+        other = BlogPost.objects.create(title="Q", description="D", content="C", category="ai")
+        self.assertEqual(self._revalidate(url + "?featured=false", response).status_code, status.HTTP_200_OK)
+        response = self.client.get(url + "?featured=false")
+        other.delete()
+        self.assertEqual(self._revalidate(url + "?featured=false", response).status_code, status.HTTP_200_OK)
+
+    def test_cached_list_revalidates_without_queries(self):
+        """The cached public list keeps its validators, so a 304 needs no database work"""
+        url = reverse("blog-list")
+        response = self.client.get(url)
+        revalidated, queries = self._count_queries(lambda: self._revalidate(url, response))
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(queries, 0)
+
+    def test_staff_list_is_private(self):
+        """Staff lists include drafts: private, and tagged differently from the public list"""
+        url = reverse("blog-list")
+        public_etag = self.client.get(url)["ETag"]
+        admin = User.objects.create_superuser(username="admin", password="adminpass12345")
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(url)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("public", response["Cache-Control"])
+        self.assertNotEqual(response["ETag"], public_etag)
+        self.assertIn("Authorization", response["Vary"])
+
+    def test_list_ignores_if_modified_since(self):
+        """Lists are revalidated by ETag only: a deleted or unpublished post leaves max(updated_at) alone"""
+        from django.utils.http import http_date
+
+        since = http_date(django_timezone.now().timestamp() + 60)
+        for url in (reverse("blog-list") + "?category=ai", reverse("category-list")):
+            other = BlogPost.objects.create(title="Q", description="D", content="C", category="ai")
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+            BlogPost.objects.filter(pk=other.pk).update(is_published=False)
+            revalidated = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+            self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+            self.assertNotIn("Last-Modified", revalidated)
+
+    def test_detail_not_modified_still_counts_view(self):
+        """A revalidated detail is a 304, and the view is still recorded"""
+        from unittest import mock
+
+        url = reverse("blog-detail", kwargs={"slug": self.post.slug})
+        with mock.patch("api.views.view_count_buffer.record") as record:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            revalidated = self._revalidate(url, response)
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(record.call_count, 2)
+
+    def test_detail_etag_tracks_counters(self):
+        """The detail ETag changes with updated_at and with the view/like counters"""
+        from unittest import mock
+
+        url = reverse("blog-detail", kwargs={"slug": self.post.slug})
+        with mock.patch("api.views.view_count_buffer.record"):
+            response = self.client.get(url)
+            self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+            BlogPost.objects.filter(pk=self.post.pk).update(likes=3)
+            revalidated = self._revalidate(url, response)
+            self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+            self.assertEqual(revalidated.data["likes"], 3)
+
+            self.post.refresh_from_db()
+            self.post.title = "Edited"
+            self.post.save()
+            self.assertEqual(self._revalidate(url, revalidated).status_code, status.HTTP_200_OK)
+
+    def test_categories_not_modified(self):
+        """Categories revalidate from the cache, and a new post changes their ETag"""
+        url = reverse("category-list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        from django.core.cache import cache
+
+        cache.clear()
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+        BlogPost.objects.create(title="Q", description="D", content="C", category="ml")
+        revalidated = self._revalidate(url, response)
+        self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(revalidated.data), 2)
+
+    def test_search_list_has_etag(self):
+        """The aggregate works on full-text search querysets too"""
+        url = reverse("blog-list") + "?search=PPP"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._revalidate(url, response).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_clock_bucket_follows_newest_post(self):
+        """Lists with a fresh post re-tag every minute, older lists daily"""
+        from api.conditional import _clock_bucket
+
+        now = datetime(2024, 6, 1, 12, 0, 30, tzinfo=timezone.utc)
+        fresh = now - timedelta(minutes=5)
+        old = now - timedelta(days=3)
+        self.assertNotEqual(_clock_bucket(fresh, now), _clock_bucket(fresh, now + timedelta(minutes=1)))
+        self.assertEqual(_clock_bucket(old, now), _clock_bucket(old, now + timedelta(minutes=1)))
+        self.assertIsNone(_clock_bucket(None, now))
+
+
 class HealthCheckAPITestCase(APITestCase):
     """Tests for Health Check API endpoint"""
 
@@ -1186,6 +1990,32 @@ class AdminAPITestCase(APITestCase):
         response = self.client.get(reverse("admin-messages"), {"page": 0})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_admin_messages_cursor_pages(self):
+        """Cursor mode walks messages newest first, ties included, without a count"""
+        created = django_timezone.now()
+        for i in range(4):
+            Contact.objects.create(name=f"T{i}", email="t@test.com", message="Hello")
+        Contact.objects.update(created_at=created)
+        self.client.force_authenticate(user=self.admin)
+
+        ids, params = [], {"pagination": "cursor", "page_size": 2}
+        while True:
+            response = self.client.get(reverse("admin-messages"), params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            ids += [item["id"] for item in response.data["results"]]
+            if not response.data["has_next"]:
+                break
+            params = {"cursor": response.data["next"], "page_size": 2}
+        self.assertEqual(sorted(ids), sorted(str(pk) for pk in Contact.objects.values_list("id", flat=True)))
+        self.assertEqual(len(ids), 5)
+
+    def test_admin_messages_invalid_cursor(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("admin-messages"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", response.data)
+
     def test_admin_message_detail_invalid_uuid(self):
         """Invalid UUID returns 404"""
         self.client.force_authenticate(user=self.admin)
@@ -1229,6 +2059,22 @@ class AdminUserManagementTestCase(APITestCase):
         self.assertEqual(response.data["count"], 4)
         self.assertEqual(response.data["next"], 2)
 
+    def test_list_users_cursor_pagination(self):
+        """Cursor mode pages newest users first and honours the filters"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("admin-users"), {"pagination": "cursor", "page_size": 1, "role": "user"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["has_next"])
+        self.assertNotIn("count", response.data)
+        first = response.data["results"][0]["username"]
+
+        response = self.client.get(
+            reverse("admin-users"), {"cursor": response.data["next"], "page_size": 1, "role": "user"}
+        )
+        self.assertFalse(response.data["has_next"])
+        self.assertIsNone(response.data["next"])
+        self.assertEqual({first, response.data["results"][0]["username"]}, {"regular", "another"})
+
     def test_list_users_search_by_username(self):
         """Search filters by username"""
         self.client.force_authenticate(user=self.admin)
@@ -1471,6 +2317,8 @@ class AdminAnalyticsTestCase(APITestCase):
             page_path="/",
             visit_time=now,
         )
+        # Rows created directly bypass the visit buffer, so build the rollups the endpoints read
+        call_command("rollup_sitevisits", "--days", "7", stdout=StringIO())
 
     # --- Visits endpoint ---
 
@@ -1563,7 +2411,7 @@ class AdminAnalyticsTestCase(APITestCase):
 
     def test_visits_empty_range(self):
         """Empty date range returns empty data array"""
-        SiteVisit.objects.all().delete()
+        DailyVisitStat.objects.all().delete()
         self.client.force_authenticate(user=self.admin)
         response = self.client.get(reverse("admin-analytics-visits"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1588,6 +2436,319 @@ class AdminAnalyticsTestCase(APITestCase):
         self.assertEqual(response.data["period"], 1)
 
 
+class SiteVisitRollupTestCase(TestCase):
+    """Tests for the daily SiteVisit rollups (api.rollups, rollup_sitevisits command)"""
+
+    def _record(self, ip, path="/", visit_time=None):
+        from api.ingest import visit_buffer
+
+        visit_buffer.record(
+            SiteVisit(
+                ip_address=ip,
+                user_agent="ua",
+                page_path=path,
+                visit_time=visit_time or django_timezone.now(),
+            )
+        )
+
+    def test_migration_backfills_existing_visits(self):
+        """Migration 0026 builds rollups for visits recorded before the rollup tables existed"""
+        from importlib import import_module
+        from types import SimpleNamespace
+
+        from django.apps import apps
+        from django.db import connection
+
+        from api.rollups import unique_visitors_between
+
+        yesterday = django_timezone.now() - timedelta(days=1)
+        SiteVisit.objects.bulk_create(
+            SiteVisit(ip_address=ip, user_agent="ua", page_path=path, visit_time=visit_time)
+            for ip, path, visit_time in (
+                ("10.0.0.1", "/", yesterday),
+                ("10.0.0.2", "/blog", yesterday),
+                ("10.0.0.1", "/", django_timezone.now()),
+            )
+        )
+        self.assertFalse(DailyVisitStat.objects.exists())
+
+        migration = import_module("api.migrations.0026_backfill_visit_rollups")
+        migration.backfill_rollups(apps, SimpleNamespace(connection=connection))
+
+        day = django_timezone.localdate(yesterday)
+        stat = DailyVisitStat.objects.get(date=day)
+        self.assertEqual((stat.visits, stat.unique_visitors), (2, 2))
+        self.assertEqual(DailyPageStat.objects.get(date=day, page_path="/blog").visits, 1)
+        self.assertEqual(unique_visitors_between(day), 2)
+
+    def test_flush_maintains_daily_rollups(self):
+        """Each buffered write increments visits, unique visitors and per-path counts"""
+        self._record("10.0.0.1", "/")
+        self._record("10.0.0.1", "/blog")
+        self._record("10.0.0.2", "/")
+
+        today = django_timezone.localdate()
+        stat = DailyVisitStat.objects.get(date=today)
+        self.assertEqual(stat.visits, 3)
+        self.assertEqual(stat.unique_visitors, 2)
+        self.assertEqual(DailyPageStat.objects.get(date=today, page_path="/").visits, 2)
+        self.assertEqual(DailyPageStat.objects.get(date=today, page_path="/blog").visits, 1)
+
+    def test_rollups_split_by_local_day(self):
+        """Visits are bucketed by the local (TIME_ZONE) calendar day"""
+        yesterday = django_timezone.now() - timedelta(days=1)
+        self._record("10.0.0.1", visit_time=yesterday)
+        self._record("10.0.0.1")
+
+        self.assertEqual(DailyVisitStat.objects.count(), 2)
+        for stat in DailyVisitStat.objects.all():
+            self.assertEqual(stat.visits, 1)
+            self.assertEqual(stat.unique_visitors, 1)
+
+    def test_batch_with_repeat_ips_counts_once(self):
+        """A single flush with the same IP twice adds one unique visitor"""
+        from unittest.mock import patch
+        from api.ingest import VisitBuffer
+
+        with self.settings(VISIT_BUFFER={"ASYNC": True, "FLUSH_INTERVAL_MS": 60000}):
+            buffer = VisitBuffer()
+            with patch.object(buffer, "_ensure_worker"):
+                for _ in range(3):
+                    buffer.record(SiteVisit(ip_address="10.0.0.9", user_agent="ua", page_path="/"))
+            buffer.flush()
+
+        stat = DailyVisitStat.objects.get()
+        self.assertEqual(stat.visits, 3)
+        self.assertEqual(stat.unique_visitors, 1)
+
+    def test_rebuild_command_recomputes_from_raw_rows(self):
+        """rollup_sitevisits repairs drifted rollups from the raw table"""
+        self._record("10.0.0.1")
+        self._record("10.0.0.2", "/blog")
+        DailyVisitStat.objects.update(visits=99, unique_visitors=99)
+        DailyPageStat.objects.all().delete()
+
+        out = StringIO()
+        call_command("rollup_sitevisits", stdout=out)
+        self.assertIn("Rebuilt rollups for 1 day(s)", out.getvalue())
+
+        stat = DailyVisitStat.objects.get()
+        self.assertEqual(stat.visits, 2)
+        self.assertEqual(stat.unique_visitors, 2)
+        self.assertEqual(DailyPageStat.objects.count(), 2)
+
+    def test_rebuild_keeps_rollups_of_cleaned_up_days(self):
+        """Days whose raw rows were already deleted keep their rollups"""
+        old_day = django_timezone.localdate() - timedelta(days=200)
+        DailyVisitStat.objects.create(date=old_day, visits=7, unique_visitors=3)
+
+        call_command("rollup_sitevisits", "--days", "365", stdout=StringIO())
+        self.assertEqual(DailyVisitStat.objects.get(date=old_day).visits, 7)
+
+    def test_analytics_does_not_read_raw_visits(self):
+        """The analytics endpoints answer from rollups even when raw rows are gone"""
+        from rest_framework.test import APIClient
+
+        self._record("10.0.0.1", "/")
+        SiteVisit.objects.all().delete()
+
+        admin_user = User.objects.create_superuser(username="admin", email="a@example.com", password="adminpass12345")
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        visits = client.get(reverse("admin-analytics-visits")).data["data"]
+        pages = client.get(reverse("admin-analytics-pages")).data["data"]
+        self.assertEqual(visits[-1]["visits"], 1)
+        self.assertEqual(pages, [{"page_path": "/", "visits": 1}])
+
+    def test_flush_updates_visitor_sketch(self):
+        """Buffered writes fold IPs into the day's HyperLogLog sketch"""
+        from api.hyperloglog import HyperLogLog
+
+        for i in range(20):
+            self._record(f"10.0.1.{i}")
+        self._record("10.0.1.0")
+
+        stat = DailyVisitStat.objects.get()
+        self.assertEqual(stat.visits, 21)
+        self.assertEqual(stat.unique_visitors, 20)
+        self.assertEqual(HyperLogLog.from_bytes(stat.visitor_sketch).count(), 20)
+
+    def test_range_unique_visitors_merge_daily_sketches(self):
+        """A visitor seen on several days counts once in the range total"""
+        from rest_framework.test import APIClient
+
+        for days_ago in range(3):
+            self._record("10.0.0.1", visit_time=django_timezone.now() - timedelta(days=days_ago))
+        self._record("10.0.0.2")
+
+        admin_user = User.objects.create_superuser(username="admin", email="a@example.com", password="adminpass12345")
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        response = client.get(reverse("admin-analytics-visits"), {"days": 7})
+        self.assertFalse(response.data["exact"])
+        self.assertEqual(response.data["total_unique_visitors"], 2)
+        self.assertEqual(sum(entry["unique_visitors"] for entry in response.data["data"]), 4)
+
+    def test_exact_mode_counts_raw_rows(self):
+        """?exact=true bypasses the sketches and recounts distinct IPs from raw visits"""
+        from rest_framework.test import APIClient
+
+        self._record("10.0.0.1")
+        self._record("10.0.0.2")
+        DailyVisitStat.objects.update(unique_visitors=0, visitor_sketch=b"")
+
+        admin_user = User.objects.create_superuser(username="admin", email="a@example.com", password="adminpass12345")
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        response = client.get(reverse("admin-analytics-visits"), {"exact": "true"})
+        self.assertTrue(response.data["exact"])
+        self.assertEqual(response.data["total_unique_visitors"], 2)
+        self.assertEqual(response.data["data"][-1]["unique_visitors"], 2)
+
+        approximate = client.get(reverse("admin-analytics-visits"))
+        self.assertEqual(approximate.data["data"][-1]["unique_visitors"], 0)
+
+
+class StatCountersTestCase(APITestCase):
+    """Tests for the admin_stats running totals (api.counters, reconcile_counters command)"""
+
+    def _totals(self):
+        from api import counters
+
+        return counters.read()
+
+    def test_signals_adjust_totals(self):
+        """Creating and deleting users, posts and messages moves the totals"""
+        before = self._totals()
+        user = User.objects.create_user(username="u1", password="pass12345")
+        post = BlogPost.objects.create(title="P", description="D", content="C", category="ai")
+        contact = Contact.objects.create(name="T", email="t@test.com", message="Hello")
+        after = self._totals()
+        for field in ("users", "posts", "messages"):
+            self.assertEqual(after[field], before[field] + 1)
+
+        post.title = "Edited"
+        post.save()
+        self.assertEqual(self._totals()["posts"], after["posts"])
+
+        user.delete()
+        post.delete()
+        contact.delete()
+        self.assertEqual(self._totals(), before)
+
+    def test_visit_flush_adds_batch(self):
+        from api.ingest import visit_buffer
+
+        before = self._totals()["visits"]
+        visit_buffer.record(SiteVisit(ip_address="10.0.0.1", user_agent="ua", page_path="/"))
+        self.assertEqual(self._totals()["visits"], before + 1)
+
+    def test_cleanup_subtracts_deleted_visits(self):
+        """cleanup_sitevisits keeps the total exact and its DELETE a single statement"""
+        from django.db.models.deletion import Collector
+
+        old = SiteVisit.objects.create(ip_address="10.0.0.1", user_agent="ua", page_path="/")
+        SiteVisit.objects.filter(pk=old.pk).update(visit_time=django_timezone.now() - timedelta(days=100))
+        SiteVisit.objects.create(ip_address="10.0.0.2", user_agent="ua", page_path="/")
+        self.assertEqual(self._totals()["visits"], 2)
+        self.assertTrue(Collector(using="default").can_fast_delete(SiteVisit.objects.all()))
+
+        call_command("cleanup_sitevisits", "--days", "90", stdout=StringIO())
+        self.assertEqual(self._totals()["visits"], 1)
+
+    def test_admin_stats_is_one_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        admin_user = User.objects.create_superuser(username="admin", password="adminpass12345")
+        self.client.force_authenticate(user=admin_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("admin-stats"))
+        self.assertEqual(response.data["totalUsers"], 1)
+        self.assertEqual(len(queries), 1)
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        from api.counters import reconcile
+
+        SiteVisit.objects.bulk_create([SiteVisit(ip_address="10.0.0.1", user_agent="ua", page_path="/")] * 3)
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        self.assertIn("visits: 0 -> 3 (+3)", out.getvalue())
+        self.assertEqual(self._totals()["visits"], 3)
+        self.assertEqual(reconcile(), {})
+
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        self.assertIn("Counters are exact.", out.getvalue())
+
+    def test_missing_row_is_rebuilt(self):
+        from api.models import StatCounters
+
+        Contact.objects.create(name="T", email="t@test.com", message="Hello")
+        StatCounters.objects.all().delete()
+        Contact.objects.create(name="T2", email="t@test.com", message="Hello")
+        self.assertEqual(self._totals()["messages"], 2)
+        StatCounters.objects.all().delete()
+        self.assertEqual(self._totals()["messages"], 2)
+
+
+class HyperLogLogTestCase(TestCase):
+    """Tests for api.hyperloglog.HyperLogLog"""
+
+    def _sketch(self, values):
+        from api.hyperloglog import HyperLogLog
+
+        sketch = HyperLogLog()
+        sketch.update(values)
+        return sketch
+
+    def test_small_cardinalities_are_exact(self):
+        """Linear counting keeps small sets (near-)exact"""
+        for n in (0, 1, 10):
+            self.assertEqual(self._sketch(f"ip-{i}" for i in range(n)).count(), n)
+        self.assertAlmostEqual(self._sketch(f"ip-{i}" for i in range(100)).count(), 100, delta=2)
+
+    def test_duplicates_do_not_inflate_count(self):
+        """Adding the same value repeatedly counts once"""
+        self.assertEqual(self._sketch(["10.0.0.1"] * 1000).count(), 1)
+
+    def test_large_cardinality_within_error_bound(self):
+        """Estimate stays within 3 standard errors for 50k distinct values"""
+        sketch = self._sketch(f"192.0.{i // 256}.{i % 256}" for i in range(50000))
+        self.assertLess(abs(sketch.count() - 50000) / 50000, 3 * sketch.relative_error)
+
+    def test_union_matches_union_of_sets(self):
+        """Merged sketches estimate the cardinality of the union"""
+        from api.hyperloglog import HyperLogLog
+
+        a = self._sketch(f"ip-{i}" for i in range(0, 3000))
+        b = self._sketch(f"ip-{i}" for i in range(2000, 5000))
+        union = HyperLogLog.union([a, b])
+        self.assertLess(abs(union.count() - 5000) / 5000, 3 * union.relative_error)
+
+        a.merge(b)
+        self.assertEqual(a.count(), union.count())
+
+    def test_bytes_roundtrip(self):
+        """to_bytes/from_bytes preserve registers and compress sparse sketches"""
+        from api.hyperloglog import HyperLogLog
+
+        sketch = self._sketch(f"ip-{i}" for i in range(50))
+        data = sketch.to_bytes()
+        self.assertLess(len(data), sketch.size)
+        self.assertEqual(HyperLogLog.from_bytes(data).registers, sketch.registers)
+        self.assertEqual(HyperLogLog.from_bytes(b"").count(), 0)
+
+    def test_precision_mismatch_rejected(self):
+        """Sketches of different precision cannot be merged"""
+        from api.hyperloglog import HyperLogLog
+
+        with self.assertRaises(ValueError):
+            HyperLogLog(12).merge(HyperLogLog(10))
+        with self.assertRaises(ValueError):
+            HyperLogLog(3)
+
+
 @override_settings(REST_FRAMEWORK={**NO_THROTTLE})
 class NotificationPreferenceTestCase(APITestCase):
     """Tests for Notification Preferences API"""
@@ -1674,6 +2835,100 @@ class CookieJWTAuthenticationTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(
+    REST_FRAMEWORK={**NO_THROTTLE}, AUTH_USER_CACHE={"TIMEOUT": 30, "MAX_ENTRIES": 1000, "CHECK_INTERVAL": 0}
+)
+class AuthUserCacheTestCase(APITestCase):
+    """Tests for the per-worker user cache of CookieJWTAuthentication"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="cacheduser", email="cached@example.com", password="testpass12345")
+        cls.admin = User.objects.create_superuser(
+            username="cacheadmin", email="ca@example.com", password="testpass12345"
+        )
+
+    def setUp(self):
+        from api.authentication import user_cache
+
+        user_cache.clear()
+
+    def _user_queries(self, client, url, **kwargs):
+        """(response, number of auth_user SELECTs it took)"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, **kwargs)
+        return response, sum('FROM "auth_user"' in q["sql"] for q in queries if q["sql"].startswith("SELECT"))
+
+    def test_user_loaded_once_per_token(self):
+        """Admin endpoints polled with one token load the user once; a new token loads it again"""
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.admin).access_token)
+        for url, expected in ((reverse("admin-metrics"), 1), (reverse("admin-metrics"), 0), (reverse("get_user"), 0)):
+            response, queries = self._user_queries(self.client, url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(queries, expected, url)
+
+        token = RefreshToken.for_user(self.admin).access_token
+        token["iat"] -= 60
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        del self.client.cookies["access_token"]
+        self.assertEqual(self._user_queries(self.client, reverse("get_user"))[1], 1)
+
+    def test_update_user_invalidates(self):
+        """A profile update is visible on the next request with the same token"""
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.user).access_token)
+        self.client.get(reverse("get_user"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(reverse("update_user"), {"first_name": "Renamed"}, format="json")
+        response, queries = self._user_queries(self.client, reverse("get_user"))
+        self.assertEqual((response.data["first_name"], queries), ("Renamed", 1))
+
+    def test_admin_deactivation_invalidates(self):
+        """A user deactivated through admin_user_detail is rejected right away"""
+        from rest_framework.test import APIClient
+
+        user_client = APIClient()
+        user_client.cookies["access_token"] = str(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(user_client.get(reverse("get_user")).status_code, 200)
+
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("admin-user-detail", kwargs={"pk": self.user.pk}), {"is_active": False}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(user_client.get(reverse("get_user")).status_code, 401)
+
+    def test_change_in_other_worker(self):
+        """Another worker's change (a new shared version for the user) drops only that user"""
+        from django.core.cache import cache
+        from rest_framework.test import APIClient
+
+        from api.constants import CACHE_AUTH_USER_VERSION
+
+        admin_client = APIClient()
+        admin_client.cookies["access_token"] = str(RefreshToken.for_user(self.admin).access_token)
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.user).access_token)
+        self.client.get(reverse("get_user"))
+        admin_client.get(reverse("get_user"))
+        self.assertEqual(self._user_queries(self.client, reverse("get_user"))[1], 0)
+        cache.set(f"{CACHE_AUTH_USER_VERSION}{self.user.pk}", "other-worker", timeout=None)
+        self.assertEqual(self._user_queries(self.client, reverse("get_user"))[1], 1)
+        self.assertEqual(self._user_queries(admin_client, reverse("get_user"))[1], 0)
+
+    def test_login_keeps_cached_users(self):
+        """The last_login stamp of a login doesn't invalidate the user's cached entries"""
+        from django.contrib.auth.models import update_last_login
+
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.user).access_token)
+        self.client.get(reverse("get_user"))
+        with self.captureOnCommitCallbacks(execute=True):
+            update_last_login(None, self.user)
+        self.assertEqual(self._user_queries(self.client, reverse("get_user"))[1], 0)
+
+
 @override_settings(REST_FRAMEWORK={**NO_THROTTLE})
 class TokenRefreshTestCase(APITestCase):
     """Tests for custom token_refresh endpoint (cookie + body support)"""
@@ -1767,6 +3022,94 @@ class TokenRefreshTestCase(APITestCase):
         self.assertEqual(response.cookies["access_token"]["max-age"], 0)
 
 
+class TokenRotationTestCase(TestCase):
+    """Tests for refresh token rotation and pruning (api/tokens.py, prune_tokens)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="rotator", password="testpass12345")
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def _rotate(self, raw):
+        from api.tokens import rotate
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return rotate(raw)
+
+    def test_one_write_transaction(self):
+        """A refresh blacklists the old token and records the new one in two statements, one transaction"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+        with CaptureQueriesContext(connection) as queries:
+            new = self._rotate(self.refresh)
+        sql = [q["sql"] for q in queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        self.assertEqual(len(sql), 2, sql)
+        self.assertTrue(all(q.startswith("INSERT") for q in sql))
+
+        old_jti = RefreshToken(self.refresh, verify=False)["jti"]
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=old_jti).exists())
+        self.assertEqual(OutstandingToken.objects.get(jti=new["jti"]).user, self.user)
+
+    def test_replay_refused(self):
+        """A rotated-out token is refused from the cache, and by the database when the cache lost it"""
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework_simplejwt.exceptions import TokenError
+
+        from api.tokens import _blacklisted_key
+
+        new = self._rotate(self.refresh)
+        with CaptureQueriesContext(connection) as queries, self.assertRaises(TokenError):
+            self._rotate(self.refresh)
+        self.assertEqual(len(queries), 0)
+
+        cache.delete(_blacklisted_key(RefreshToken(self.refresh, verify=False)["jti"]))
+        with self.assertRaises(TokenError):
+            self._rotate(self.refresh)
+        self.assertTrue(self._rotate(str(new)))
+
+    def test_deleted_user_refused(self):
+        """A token of a deleted user is not rotated"""
+        from rest_framework_simplejwt.exceptions import TokenError
+
+        self.user.delete()
+        with self.assertRaises((TokenError, User.DoesNotExist)):
+            self._rotate(self.refresh)
+
+    def test_token_without_outstanding_row(self):
+        """Tokens issued before the blacklist app are blacklisted the slow way"""
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+        jti = RefreshToken(self.refresh, verify=False)["jti"]
+        OutstandingToken.objects.filter(jti=jti).delete()
+        self._rotate(self.refresh)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=jti).exists())
+
+    def test_prune_tokens(self):
+        """Only expired tokens are deleted, with their blacklist rows, across batches"""
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+        expired = django_timezone.now() - timedelta(days=1)
+        tokens = OutstandingToken.objects.bulk_create(
+            OutstandingToken(user=self.user, jti=f"expired-{i}", token="t", expires_at=expired) for i in range(5)
+        )
+        BlacklistedToken.objects.bulk_create(BlacklistedToken(token=token) for token in tokens[:2])
+        self._rotate(self.refresh)
+
+        out = StringIO()
+        call_command("prune_tokens", "--dry-run", stdout=out)
+        self.assertIn("Would delete 5", out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 7)
+
+        out = StringIO()
+        call_command("prune_tokens", "--batch-size", "2", stdout=out)
+        self.assertIn("Deleted 5 expired outstanding tokens (2 blacklisted)", out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+
 class UtilityFunctionTestCase(TestCase):
     """Tests for utility functions in views"""
 
@@ -2101,21 +3444,32 @@ class RequestSecurityMiddlewareTestCase(TestCase):
         response = self.client.get("/api/health/", REMOTE_ADDR="5.6.7.8")
         self.assertEqual(response.status_code, 403)
 
+    @override_settings(RATE_LIMIT={**settings.RATE_LIMIT, "LIMIT": 2})
     def test_rate_limiting_returns_429(self):
         """Exceeding rate limit returns 429"""
-        from django.core.cache import cache
-
-        # Set counter above threshold (use /api/categories/ — /api/health/ is exempt)
-        cache.set("rate_limit_9.9.9.9", 100, 3600)
+        # Exhaust the burst (use /api/categories/ — /api/health/ is exempt)
+        for _ in range(2):
+            self.assertEqual(self.client.get("/api/categories/", REMOTE_ADDR="9.9.9.9").status_code, 200)
         response = self.client.get("/api/categories/", REMOTE_ADDR="9.9.9.9")
         self.assertEqual(response.status_code, 429)
+        # Other IPs are unaffected
+        self.assertEqual(self.client.get("/api/categories/", REMOTE_ADDR="9.9.9.10").status_code, 200)
 
+    @override_settings(RATE_LIMIT={**settings.RATE_LIMIT, "LIMIT": 1})
     def test_health_check_exempt_from_rate_limiting(self):
         """Health check bypasses rate limiting even when IP is exhausted"""
-        from django.core.cache import cache
+        self.client.get("/api/categories/")
+        for _ in range(3):
+            response = self.client.get("/api/health/")
+            self.assertEqual(response.status_code, 200)
 
-        cache.set("rate_limit_127.0.0.1", 200, 3600)
-        response = self.client.get("/api/health/")
+    def test_rate_limiter_error_fails_open(self):
+        """A broken limiter backend lets requests through instead of failing them"""
+        from unittest.mock import patch
+        from api.ratelimit import MemoryRateLimiter
+
+        with patch.object(MemoryRateLimiter, "hit", side_effect=RuntimeError("disk I/O error")):
+            response = self.client.get("/api/categories/", REMOTE_ADDR="9.9.9.11")
         self.assertEqual(response.status_code, 200)
 
     def test_malicious_xss_in_path_blocked(self):
@@ -2168,6 +3522,53 @@ class RequestSecurityMiddlewareTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 403)
 
+    def test_malicious_request_logs_matched_rule(self):
+        """The security log names the rule that fired and where it matched"""
+        with self.assertLogs("security", level="ERROR") as logs:
+            self.client.post(
+                "/api/health/", data="DROP TABLE users", content_type="text/plain", REMOTE_ADDR="77.77.77.78"
+            )
+        self.assertIn("rule=sqli_drop_table, in body", logs.output[0])
+
+    def test_query_values_scanned_separately(self):
+        """Values of different query params are not joined into one match"""
+        response = self.client.get("/api/health/", {"a": "union", "b": "select"}, REMOTE_ADDR="77.77.77.79")
+        self.assertEqual(response.status_code, 200)
+
+    def test_script_tag_split_across_query_values_passes(self):
+        """A rule spanning two query values doesn't block the request or the IP"""
+        from django.core.cache import cache
+
+        response = self.client.get("/api/health/", {"a": "<script>", "b": "</script>"}, REMOTE_ADDR="77.77.77.82")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get("temp_blocked_77.77.77.82"))
+        response = self.client.get("/api/health/", {"a": "<script>x</script>"}, REMOTE_ADDR="77.77.77.83")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(SECURITY_SCAN_MAX_BODY_BYTES=100)
+    def test_body_scan_capped(self):
+        """Only the first SECURITY_SCAN_MAX_BODY_BYTES of the body are scanned"""
+        response = self.client.post(
+            "/api/health/", data="a" * 100 + "DROP TABLE users", content_type="text/plain", REMOTE_ADDR="77.77.77.80"
+        )
+        self.assertNotEqual(response.status_code, 403)
+
+    @override_settings(SECURITY_SCAN_MAX_BODY_BYTES=12)
+    def test_body_scan_cap_inside_multibyte_character(self):
+        """A UTF-8 character split by the cap does not stop the scan"""
+        response = self.client.post(
+            "/api/health/", data="DROP TABLE 가나다", content_type="text/plain", REMOTE_ADDR="77.77.77.81"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_multipart_body_not_scanned(self):
+        """Multipart upload bodies are skipped"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile("notes.txt", b"DROP TABLE users", content_type="text/plain")
+        response = self.client.post("/api/health/", {"file": upload}, REMOTE_ADDR="77.77.77.82")
+        self.assertNotEqual(response.status_code, 403)
+
     # ---- False-positive regression guards ----
     # The attack patterns are specific (e.g. `union\s+select`, not bare `union`)
     # but regex changes under maintenance can accidentally broaden them. These
@@ -2221,6 +3622,86 @@ class RequestSecurityMiddlewareTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class RateLimiterTestCase(TestCase):
+    """Tests for the GCRA rate limiters (api.ratelimit)"""
+
+    def _sqlite_limiter(self, limit, period):
+        import tempfile
+        from api.ratelimit import SQLiteRateLimiter
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        return SQLiteRateLimiter(limit, period, LOCATION=os.path.join(tmpdir.name, "ratelimit.sqlite3"))
+
+    def _limiters(self, limit, period):
+        from api.ratelimit import MemoryRateLimiter
+
+        return [MemoryRateLimiter(limit, period), self._sqlite_limiter(limit, period)]
+
+    def test_burst_then_reject(self):
+        """An idle key may burst `limit` requests; the next one is rejected"""
+        for limiter in self._limiters(3, 60):
+            with self.subTest(backend=type(limiter).__name__):
+                self.assertEqual([limiter.hit("ip", now=1000) for _ in range(4)], [True, True, True, False])
+
+    def test_sliding_window_refills_one_interval_at_a_time(self):
+        """After the burst, capacity returns at period/limit per request — no fixed window edge"""
+        for limiter in self._limiters(3, 60):
+            with self.subTest(backend=type(limiter).__name__):
+                for _ in range(3):
+                    limiter.hit("ip", now=1000)
+                self.assertFalse(limiter.hit("ip", now=1019))
+                self.assertTrue(limiter.hit("ip", now=1020))
+                self.assertFalse(limiter.hit("ip", now=1021))
+                self.assertTrue(limiter.hit("ip", now=1040))
+
+    def test_rejected_hits_are_not_counted(self):
+        """Hammering while limited does not push the window further out"""
+        for limiter in self._limiters(1, 10):
+            with self.subTest(backend=type(limiter).__name__):
+                limiter.hit("ip", now=0)
+                for t in range(1, 10):
+                    self.assertFalse(limiter.hit("ip", now=t))
+                self.assertTrue(limiter.hit("ip", now=10))
+
+    def test_reset_and_sweep(self):
+        """reset() clears one key; sweep() purges keys whose window has drained"""
+        for limiter in self._limiters(1, 10):
+            with self.subTest(backend=type(limiter).__name__):
+                limiter.hit("a", now=0)
+                limiter.hit("b", now=100)
+                limiter.reset("b")
+                self.assertTrue(limiter.hit("b", now=100))
+                self.assertEqual(limiter.sweep(now=50), 1)
+                self.assertEqual(limiter.sweep(now=50), 0)
+
+    def test_sqlite_state_is_shared_between_instances(self):
+        """Two SQLite limiters on one file (as in two gunicorn workers) share one budget"""
+        from api.ratelimit import SQLiteRateLimiter
+
+        first = self._sqlite_limiter(2, 60)
+        second = SQLiteRateLimiter(2, 60, LOCATION=first.location)
+        self.assertTrue(first.hit("ip", now=0))
+        self.assertTrue(second.hit("ip", now=0))
+        self.assertFalse(first.hit("ip", now=0))
+
+    def test_build_rate_limiter_uses_settings(self):
+        """build_rate_limiter instantiates settings.RATE_LIMIT['BACKEND']"""
+        from api.ratelimit import MemoryRateLimiter, build_rate_limiter
+
+        with self.settings(RATE_LIMIT={"BACKEND": "api.ratelimit.MemoryRateLimiter", "LIMIT": 5, "PERIOD": 10}):
+            limiter = build_rate_limiter()
+        self.assertIsInstance(limiter, MemoryRateLimiter)
+        self.assertEqual(limiter.interval, 2)
+
+    def test_invalid_configuration_rejected(self):
+        """Zero limits are a configuration error"""
+        from api.ratelimit import MemoryRateLimiter
+
+        with self.assertRaises(ValueError):
+            MemoryRateLimiter(0, 60)
+
+
 class ContentSecurityMiddlewareTestCase(TestCase):
     """Tests for ContentSecurityMiddleware — security headers"""
 
@@ -2283,7 +3764,12 @@ class IsValidIpEdgeCasesTestCase(TestCase):
     RECAPTCHA_PRIVATE_KEY="test-secret-key",
 )
 class VerifyRecaptchaTestCase(TestCase):
-    """Tests for verify_recaptcha function (lines 114-153)"""
+    """Tests for verify_recaptcha function (api/recaptcha.py)"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
 
     def test_empty_recaptcha_response_returns_false(self):
         """Empty recaptcha response returns False"""
@@ -2306,7 +3792,7 @@ class VerifyRecaptchaTestCase(TestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"success": True}
 
-        with patch("api.views.requests.post", return_value=mock_response):
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response):
             self.assertTrue(verify_recaptcha("valid-token", "1.2.3.4"))
 
     def test_recaptcha_failure(self):
@@ -2318,7 +3804,7 @@ class VerifyRecaptchaTestCase(TestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"success": False, "error-codes": ["invalid-input-response"]}
 
-        with patch("api.views.requests.post", return_value=mock_response):
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response):
             self.assertFalse(verify_recaptcha("invalid-token"))
 
     def test_recaptcha_non_200_status(self):
@@ -2329,7 +3815,7 @@ class VerifyRecaptchaTestCase(TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 500
 
-        with patch("api.views.requests.post", return_value=mock_response):
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response):
             self.assertFalse(verify_recaptcha("some-token"))
 
     def test_recaptcha_network_error(self):
@@ -2337,7 +3823,7 @@ class VerifyRecaptchaTestCase(TestCase):
         from unittest.mock import patch
         from api.views import verify_recaptcha
 
-        with patch("api.views.requests.post", side_effect=requests.RequestException("timeout")):
+        with patch("api.recaptcha.requests.Session.post", side_effect=requests.RequestException("timeout")):
             self.assertFalse(verify_recaptcha("some-token"))
 
     def test_recaptcha_json_decode_error(self):
@@ -2349,7 +3835,7 @@ class VerifyRecaptchaTestCase(TestCase):
         mock_response.status_code = 200
         mock_response.json.side_effect = ValueError("bad json")
 
-        with patch("api.views.requests.post", return_value=mock_response):
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response):
             self.assertFalse(verify_recaptcha("some-token"))
 
     def test_recaptcha_unexpected_exception(self):
@@ -2357,7 +3843,7 @@ class VerifyRecaptchaTestCase(TestCase):
         from unittest.mock import patch
         from api.views import verify_recaptcha
 
-        with patch("api.views.requests.post", side_effect=RuntimeError("unexpected")):
+        with patch("api.recaptcha.requests.Session.post", side_effect=RuntimeError("unexpected")):
             self.assertFalse(verify_recaptcha("some-token"))
 
     @override_settings(RECAPTCHA_PRIVATE_KEY=None, DEBUG=True)
@@ -2377,6 +3863,103 @@ class VerifyRecaptchaTestCase(TestCase):
         with self.assertRaises(ImproperlyConfigured):
             verify_recaptcha("any-token")
 
+    def test_verified_token_is_cached(self):
+        """A token that verified is not sent to Google again from the same IP"""
+        from unittest.mock import patch, MagicMock
+        from api.views import verify_recaptcha
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"success": True}
+
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response) as post:
+            self.assertTrue(verify_recaptcha("valid-token", "1.2.3.4"))
+            self.assertTrue(verify_recaptcha("valid-token", "1.2.3.4"))
+            self.assertEqual(post.call_count, 1)
+            # Another client presenting the same token is verified again
+            self.assertTrue(verify_recaptcha("valid-token", "5.6.7.8"))
+            self.assertEqual(post.call_count, 2)
+
+    def test_failed_token_is_not_cached(self):
+        """A rejected token is checked again on the next attempt"""
+        from unittest.mock import patch, MagicMock
+        from api.views import verify_recaptcha
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"success": False}
+
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response) as post:
+            self.assertFalse(verify_recaptcha("bad-token"))
+            self.assertFalse(verify_recaptcha("bad-token"))
+            self.assertEqual(post.call_count, 2)
+
+    def test_split_timeouts(self):
+        """Verification uses separate connect/read timeouts"""
+        from unittest.mock import patch, MagicMock
+        from api.views import verify_recaptcha
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"success": True}
+
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response) as post:
+            verify_recaptcha("valid-token")
+            self.assertEqual(post.call_args.kwargs["timeout"], (3.05, 5))
+
+    def test_static_verifier(self):
+        """RECAPTCHA_VERIFIER selects the backend; StaticVerifier makes no request"""
+        from unittest.mock import patch
+        from api.views import verify_recaptcha
+
+        config = {"BACKEND": "api.recaptcha.StaticVerifier", "OPTIONS": {"SUCCESS": False}}
+        with override_settings(RECAPTCHA_VERIFIER=config), patch("api.recaptcha.requests.Session.post") as post:
+            self.assertFalse(verify_recaptcha("any-token"))
+            post.assert_not_called()
+
+    def test_session_reuses_connection(self):
+        """Consecutive verifications share one keep-alive connection to the verify server"""
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        from api.views import verify_recaptcha
+
+        connections = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                body = json.dumps({"success": True}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/siteverify"
+            config = {"BACKEND": "api.recaptcha.SiteVerifyVerifier", "OPTIONS": {"URL": url}}
+            with override_settings(RECAPTCHA_VERIFIER=config):
+                for i in range(5):
+                    self.assertTrue(verify_recaptcha(f"token-{i}"))
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(len(connections), 1)
+
 
 class LogSiteVisitTestCase(TestCase):
     """Tests for log_site_visit (lines 172-173)"""
@@ -2391,12 +3974,710 @@ class LogSiteVisitTestCase(TestCase):
         request.META["REMOTE_ADDR"] = "10.0.0.1"
         request.session = type("Session", (), {"session_key": "abc123"})()
 
-        with patch("api.views.SiteVisit.objects.create", side_effect=Exception("DB error")):
+        with patch("api.ingest.SiteVisit.objects.bulk_create", side_effect=Exception("DB error")):
             # Should not raise, just log the error
             log_site_visit(request)
 
 
+class VisitBufferTestCase(TestCase):
+    """Tests for the buffered SiteVisit writer (api.ingest.VisitBuffer)"""
+
+    ASYNC_BUFFER = {"ASYNC": True, "MAX_SIZE": 3, "BATCH_SIZE": 2, "FLUSH_INTERVAL_MS": 60000}
+
+    def _visit(self, path="/"):
+        return SiteVisit(ip_address="10.0.0.1", user_agent="ua", page_path=path)
+
+    def _buffer(self):
+        from unittest.mock import patch
+        from api.ingest import VisitBuffer
+
+        buffer = VisitBuffer()
+        # Flush from the test thread: a background connection can't see the test transaction
+        patcher = patch.object(buffer, "_ensure_worker")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return buffer
+
+    def test_inline_mode_writes_immediately(self):
+        """With ASYNC off (test settings) each visit is written on record()"""
+        from api.ingest import VisitBuffer
+
+        VisitBuffer().record(self._visit())
+        self.assertEqual(SiteVisit.objects.count(), 1)
+
+    def test_request_logs_visit(self):
+        """Public endpoints still produce a SiteVisit row per request"""
+        self.client.get(reverse("category-list"), REMOTE_ADDR="203.0.113.5")
+        visit = SiteVisit.objects.get()
+        self.assertEqual(visit.ip_address, "203.0.113.5")
+        self.assertEqual(visit.page_path, "/api/categories/")
+
+    def test_async_mode_defers_until_flush(self):
+        """Queued visits are written in one batch by flush()"""
+        with self.settings(VISIT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            buffer.record(self._visit("/a"))
+            self.assertEqual(SiteVisit.objects.count(), 0)
+            self.assertEqual(buffer.stats()["pending"], 1)
+
+            self.assertEqual(buffer.flush(), 1)
+            self.assertEqual(SiteVisit.objects.count(), 1)
+            stats = buffer.stats()
+            self.assertEqual(stats["pending"], 0)
+            self.assertEqual(stats["flushes"], 1)
+            self.assertEqual(stats["flushed"], 1)
+
+    def test_batch_size_wakes_flusher(self):
+        """Reaching BATCH_SIZE signals the flusher thread without waiting for the interval"""
+        with self.settings(VISIT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            buffer.record(self._visit())
+            self.assertFalse(buffer._wake.is_set())
+            buffer.record(self._visit())
+            self.assertTrue(buffer._wake.is_set())
+
+    def test_full_buffer_drops_and_counts(self):
+        """Visits beyond MAX_SIZE are dropped and counted instead of blocking"""
+        with self.settings(VISIT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            for _ in range(5):
+                buffer.record(self._visit())
+            stats = buffer.stats()
+            self.assertEqual(stats["pending"], 3)
+            self.assertEqual(stats["dropped"], 2)
+            buffer.flush()
+            self.assertEqual(SiteVisit.objects.count(), 3)
+
+    def test_visit_time_is_request_time(self):
+        """visit_time records when the visit was queued, not when it was flushed"""
+        queued_at = django_timezone.now() - timedelta(minutes=5)
+        with self.settings(VISIT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            visit = self._visit()
+            visit.visit_time = queued_at
+            buffer.record(visit)
+            buffer.flush()
+        self.assertEqual(SiteVisit.objects.get().visit_time, queued_at)
+
+    def test_flush_error_is_counted(self):
+        """A failed flush is logged and counted, not raised"""
+        from unittest.mock import patch
+
+        with self.settings(VISIT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            buffer.record(self._visit())
+            with patch("api.ingest.SiteVisit.objects.bulk_create", side_effect=Exception("DB error")):
+                self.assertEqual(buffer.flush(), 0)
+            self.assertEqual(buffer.stats()["errors"], 1)
+
+    def test_admin_metrics_exposes_buffer_stats(self):
+        """The admin metrics endpoint reports this worker's buffer counters"""
+        admin_user = User.objects.create_superuser(username="admin", email="a@example.com", password="adminpass12345")
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        response = client.get(reverse("admin-metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("pid", response.json())
+        for key in ("pending", "dropped", "flushed", "last_flush_ms", "max_flush_ms", "avg_flush_ms"):
+            self.assertIn(key, response.json()["visit_buffer"])
+        for key in ("hits", "misses", "shared_hits", "shared_misses", "hit_rate", "size"):
+            self.assertIn(key, response.json()["cache"])
+        self.assertIn("pending", response.json()["view_count_buffer"])
+
+
+class BloomFilterTestCase(TestCase):
+    """Tests for the Bloom filter behind the daily view dedupe (api/bloom.py)"""
+
+    def test_no_false_negatives(self):
+        from api.bloom import BloomFilter
+
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        added = [bloom.add(f"192.0.2.{i}:{i}") for i in range(1000)]
+        self.assertTrue(all(f"192.0.2.{i}:{i}" in bloom for i in range(1000)))
+        # Almost every distinct item is reported as new on insert
+        self.assertGreater(sum(added), 990)
+        self.assertFalse(bloom.add("192.0.2.5:5"))
+
+    def test_false_positive_rate_matches_configuration(self):
+        """At capacity, the measured false-positive rate is close to the configured one"""
+        from api.bloom import BloomFilter
+
+        for error_rate in (0.01, 0.05):
+            bloom = BloomFilter.for_capacity(2000, error_rate)
+            for i in range(2000):
+                bloom.add(f"member-{i}")
+            trials = 50000
+            false_positives = sum(f"outsider-{i}" in bloom for i in range(trials))
+            self.assertLess(false_positives / trials, error_rate * 1.3)
+            self.assertGreater(false_positives / trials, error_rate * 0.5)
+
+    def test_sizing(self):
+        from api.bloom import BloomFilter
+
+        bloom = BloomFilter.for_capacity(10000, 0.01)
+        self.assertEqual(bloom.num_bits, 95851)
+        self.assertEqual(bloom.num_hashes, 7)
+
+    def test_serialization_round_trip(self):
+        from api.bloom import BloomFilter
+
+        bloom = BloomFilter.for_capacity(10000, 0.01)
+        bloom.add("203.0.113.1")
+        data = bloom.to_bytes()
+        # Sparse filters compress far below the 12 KB bit array
+        self.assertLess(len(data), 500)
+        restored = BloomFilter.from_bytes(data)
+        self.assertIn("203.0.113.1", restored)
+        self.assertNotIn("203.0.113.2", restored)
+        self.assertEqual((restored.num_bits, restored.num_hashes), (bloom.num_bits, bloom.num_hashes))
+
+
+class ViewCountBufferTestCase(TestCase):
+    """Tests for write-behind blog view counts (api.ingest.ViewCountBuffer)"""
+
+    ASYNC_BUFFER = {"ASYNC": True, "BATCH_SIZE": 2, "FLUSH_INTERVAL_MS": 60000}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = BlogPost.objects.create(title="Viral", description="d", content="c", category="ai")
+        cls.other = BlogPost.objects.create(title="Quiet", description="d", content="c", category="ai")
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def _buffer(self):
+        from unittest.mock import patch
+        from api.ingest import ViewCountBuffer
+
+        buffer = ViewCountBuffer()
+        # Flush from the test thread: a background connection can't see the test transaction
+        patcher = patch.object(buffer, "_ensure_worker")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return buffer
+
+    def test_views_folded_into_one_update_per_post(self):
+        """Many views of one post become a single UPDATE at flush time"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with self.settings(VIEW_COUNT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            for i in range(5):
+                buffer.record(self.post.id, f"10.0.0.{i}")
+            buffer.record(self.post.id, "10.0.0.0")
+            buffer.record(self.other.id, "10.0.0.0")
+            self.assertEqual(buffer.stats()["pending"], 6)
+            self.post.refresh_from_db()
+            self.assertEqual(self.post.view_count, 0)
+
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(buffer.flush(), 2)
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "api_blogpost"')]
+        self.assertEqual(len(updates), 2)
+        self.post.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.post.view_count, self.other.view_count), (5, 1))
+        self.assertEqual(buffer.stats()["pending"], 0)
+
+    def test_batch_size_wakes_flusher(self):
+        """BATCH_SIZE distinct pending posts trigger an early flush"""
+        with self.settings(VIEW_COUNT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            buffer.record(self.post.id, "10.0.0.1")
+            buffer.record(self.post.id, "10.0.0.2")
+            self.assertFalse(buffer._wake.is_set())
+            buffer.record(self.other.id, "10.0.0.1")
+            self.assertTrue(buffer._wake.is_set())
+
+    def test_repeat_views_from_same_ip_counted_once(self):
+        """The once-per-IP-per-day dedupe still applies"""
+        url = reverse("blog-detail", kwargs={"slug": self.post.slug})
+        for _ in range(3):
+            self.client.get(url, REMOTE_ADDR="203.0.113.7")
+        self.client.get(url, REMOTE_ADDR="203.0.113.8")
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 2)
+
+    def test_dedupe_spans_flushes(self):
+        """A visitor already counted today is not counted again by a later flush"""
+        from api.models import PostViewFilter
+
+        with self.settings(VIEW_COUNT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            buffer.record(self.post.id, "10.0.0.1")
+            buffer.flush()
+            buffer.record(self.post.id, "10.0.0.1")
+            buffer.record(self.post.id, "10.0.0.2")
+            buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 2)
+        self.assertEqual(PostViewFilter.objects.filter(post=self.post).count(), 1)
+
+    def test_filters_rotate_daily(self):
+        """The next day counts returning visitors again and drops old filters"""
+        from datetime import date
+        from unittest.mock import patch
+        from api.models import PostViewFilter
+
+        buffer = self._buffer()
+        with patch("api.ingest.timezone.localdate", return_value=date(2026, 1, 1)):
+            buffer.record(self.post.id, "10.0.0.1")
+        with patch("api.ingest.timezone.localdate", return_value=date(2026, 1, 2)):
+            buffer.record(self.post.id, "10.0.0.1")
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 2)
+        self.assertEqual(list(PostViewFilter.objects.values_list("date", flat=True)), [date(2026, 1, 2)])
+
+    def test_retrieve_defers_update_in_async_mode(self):
+        """With ASYNC on, the request itself doesn't touch the post row"""
+        from unittest.mock import patch
+
+        with self.settings(VIEW_COUNT_BUFFER=self.ASYNC_BUFFER):
+            buffer = self._buffer()
+            with patch("api.views.view_count_buffer", buffer):
+                self.client.get(reverse("blog-detail", kwargs={"slug": self.post.slug}), REMOTE_ADDR="203.0.113.9")
+            self.post.refresh_from_db()
+            self.assertEqual(self.post.view_count, 0)
+            buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+
+class TieredCacheTestCase(TestCase):
+    """Tests for the per-worker L1 tier in front of the shared cache (api/cache.py)"""
+
+    OPTIONS = {
+        "L1_MAX_ENTRIES": 100,
+        "L1_TIMEOUT": 1,
+        "L1_TIMEOUTS": {"blog_": 300, "counter_": 0},
+        "EPOCH_CHECK_INTERVAL": 60,
+    }
+
+    def setUp(self):
+        from django.core.cache import caches
+
+        caches["shared"].clear()
+
+    def tearDown(self):
+        from django.core.cache import caches
+
+        caches["shared"].clear()
+
+    def _worker(self, **options):
+        """A TieredCache with its own local tier, as if in a separate process"""
+        from api.cache import TieredCache, _LocalStore
+
+        worker = TieredCache("shared", {"OPTIONS": {**self.OPTIONS, **options}})
+        worker._store = _LocalStore()
+        return worker
+
+    def test_repeated_get_served_locally(self):
+        """After one shared read the value comes from the local tier"""
+        worker = self._worker()
+        worker.set("blog_categories", ["AI"])
+        self.assertEqual(worker.get("blog_categories"), ["AI"])
+        self.assertEqual(worker.get("blog_categories"), ["AI"])
+        stats = worker.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["shared_hits"], 0)
+
+    def test_missing_key_cached_locally(self):
+        """A shared miss is remembered too, and the caller's default is returned"""
+        worker = self._worker()
+        self.assertEqual(worker.get("blog_missing", "fallback"), "fallback")
+        self.assertIsNone(worker.get("blog_missing"))
+        self.assertEqual(worker.stats()["shared_misses"], 1)
+        self.assertEqual(worker.stats()["hits"], 1)
+
+    def test_local_values_are_copies(self):
+        """Mutating a returned value does not change what the next get returns"""
+        worker = self._worker()
+        worker.set("blog_list", {"results": [1]})
+        worker.get("blog_list")["results"].append(2)
+        self.assertEqual(worker.get("blog_list"), {"results": [1]})
+
+    def test_delete_propagates_to_other_workers(self):
+        """A delete bumps the shared epoch; other workers drop their local tier at the next check"""
+        writer, reader = self._worker(), self._worker()
+        writer.set("blog_post_list", ["old"])
+        self.assertEqual(reader.get("blog_post_list"), ["old"])
+
+        writer.delete("blog_post_list")
+        # Within the check interval the reader still serves its local copy
+        self.assertEqual(reader.get("blog_post_list"), ["old"])
+        reader._store.epoch_checked_at = 0
+        self.assertIsNone(reader.get("blog_post_list"))
+        self.assertEqual(reader.stats()["resets"], 1)
+        # The writer's own bump does not reset its local tier
+        self.assertEqual(writer.stats()["resets"], 0)
+
+    def test_short_local_ttl_does_not_bump_epoch(self):
+        """Keys cached locally no longer than the check interval skip the epoch bump"""
+        from django.core.cache import caches
+        from api.cache import EPOCH_KEY
+
+        worker = self._worker(EPOCH_CHECK_INTERVAL=1)
+        worker.delete("temp_blocked_1.2.3.4")
+        self.assertIsNone(caches["shared"].get(EPOCH_KEY))
+        worker.delete("blog_categories")
+        self.assertEqual(caches["shared"].get(EPOCH_KEY), 1)
+
+    def test_refill_does_not_reset_other_workers(self):
+        """set/add after a miss write through without bumping the epoch"""
+        from django.core.cache import caches
+        from api.cache import EPOCH_KEY
+
+        writer, reader = self._worker(), self._worker()
+        reader.set("blog_categories", ["AI"])
+        writer.set("blog_post_list", ["new"])
+        writer.add("blog_other", 1)
+        self.assertIsNone(caches["shared"].get(EPOCH_KEY))
+        reader._store.epoch_checked_at = 0
+        self.assertEqual(reader.get("blog_categories"), ["AI"])
+        self.assertEqual(reader.stats()["resets"], 0)
+
+    def test_zero_local_ttl_bypasses_local_tier(self):
+        """Keys with L1 TTL 0 are always read from the shared tier"""
+        first, second = self._worker(), self._worker()
+        first.set("counter_a", 1)
+        self.assertEqual(second.get("counter_a"), 1)
+        second.set("counter_a", 2)
+        self.assertEqual(first.get("counter_a"), 2)
+        self.assertEqual(first.stats()["size"], 0)
+
+    def test_local_tier_is_bounded(self):
+        """The least recently used entries are evicted past L1_MAX_ENTRIES"""
+        worker = self._worker(L1_MAX_ENTRIES=2)
+        worker.set("blog_a", 1)
+        worker.set("blog_b", 2)
+        worker.get("blog_a")
+        worker.set("blog_c", 3)
+        stats = worker.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        # blog_b was evicted locally but is still in the shared tier
+        self.assertEqual(worker.get("blog_b"), 2)
+        self.assertEqual(worker.stats()["shared_hits"], 1)
+
+    def test_incr_goes_to_shared_tier(self):
+        """incr updates the shared value and drops the stale local copy"""
+        worker = self._worker()
+        worker.set("blog_hits", 1)
+        self.assertEqual(worker.incr("blog_hits"), 2)
+        self.assertEqual(worker.get("blog_hits"), 2)
+
+
+class SQLiteCacheTestCase(TestCase):
+    """Tests for the SQLite-file cache backend shared by workers (api/cache.py)"""
+
+    def setUp(self):
+        import tempfile
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.location = os.path.join(self.tmpdir.name, "cache.sqlite3")
+        self.cache = self._cache()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _cache(self, **options):
+        from api.cache import SQLiteCache
+
+        return SQLiteCache(self.location, {"TIMEOUT": 300, "OPTIONS": {"MAX_ENTRIES": 10000, **options}})
+
+    def test_values_round_trip(self):
+        """Ints, bools and pickled values come back with their types"""
+        for key, value in {"int": 7, "bool": True, "dict": {"a": [1, 2]}, "big": 2**70, "none": None}.items():
+            self.cache.set(key, value)
+            self.assertEqual(self.cache.get(key, "missing"), value)
+            self.assertIs(type(self.cache.get(key, "missing")), type(value))
+        self.assertEqual(self.cache.get("absent", "missing"), "missing")
+
+    def test_shared_between_instances(self):
+        """Another connection to the same file (another worker) sees writes"""
+        self.cache.set("temp_blocked_1.2.3.4", True)
+        self.assertTrue(self._cache().get("temp_blocked_1.2.3.4"))
+        self._cache().delete("temp_blocked_1.2.3.4")
+        self.assertFalse(self.cache.has_key("temp_blocked_1.2.3.4"))
+
+    def test_expired_entries_are_invisible(self):
+        """Expired rows read as missing and can be re-added"""
+        from unittest.mock import patch
+
+        self.cache.set("short", "value", timeout=10)
+        self.assertFalse(self.cache.add("short", "other"))
+        with patch("time.time", return_value=time.time() + 11):
+            self.assertIsNone(self.cache.get("short"))
+            self.assertFalse(self.cache.has_key("short"))
+            self.assertTrue(self.cache.add("short", "other"))
+        self.assertEqual(self.cache.get("short"), "other")
+
+    def test_timeout_none_never_expires(self):
+        from unittest.mock import patch
+
+        self.cache.set("forever", 1, timeout=None)
+        with patch("time.time", return_value=time.time() + 10**9):
+            self.assertEqual(self.cache.get("forever"), 1)
+
+    def test_touch(self):
+        from unittest.mock import patch
+
+        self.cache.set("key", "value", timeout=10)
+        self.assertTrue(self.cache.touch("key", timeout=100))
+        with patch("time.time", return_value=time.time() + 50):
+            self.assertEqual(self.cache.get("key"), "value")
+        self.assertFalse(self.cache.touch("absent"))
+
+    def test_incr_is_atomic_across_connections(self):
+        """Concurrent increments from separate connections are never lost"""
+        import threading
+
+        self.cache.set("counter", 0)
+
+        def worker():
+            cache = self._cache()
+            for _ in range(200):
+                cache.incr("counter")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.get("counter"), 1600)
+        self.assertEqual(self.cache.decr("counter", 600), 1000)
+
+    def test_incr_missing_or_pickled(self):
+        """incr raises for missing keys and still works for non-int numbers"""
+        with self.assertRaises(ValueError):
+            self.cache.incr("absent")
+        self.cache.set("float", 1.5)
+        self.assertEqual(self.cache.incr("float"), 2.5)
+
+    def test_get_many_set_many(self):
+        """Batched reads and writes, across more keys than one SQL chunk"""
+        data = {f"key_{i}": i for i in range(1200)}
+        self.assertEqual(self.cache.set_many(data), [])
+        found = self.cache.get_many([*data, "absent"])
+        self.assertEqual(found, data)
+        self.cache.delete_many(list(data)[:1000])
+        self.assertEqual(len(self.cache.get_many(data)), 200)
+
+    def test_sweep_removes_expired_in_batches(self):
+        """A sweep deletes at most SWEEP_BATCH expired rows"""
+        from unittest.mock import patch
+
+        cache = self._cache(SWEEP_BATCH=5, SWEEP_EVERY=10**6)
+        cache.set_many({f"old_{i}": i for i in range(8)}, timeout=10)
+        cache.set("fresh", 1, timeout=1000)
+        with patch("time.time", return_value=time.time() + 20):
+            self.assertEqual(cache.sweep(), 5)
+            self.assertEqual(cache.sweep(), 3)
+            self.assertEqual(cache.sweep(), 0)
+        self.assertEqual(cache.get("fresh"), 1)
+
+    def test_sweep_runs_every_n_writes(self):
+        """Writes trigger a sweep; entries past MAX_ENTRIES are culled soonest-expiring first"""
+        cache = self._cache(MAX_ENTRIES=10, CULL_FREQUENCY=2, SWEEP_EVERY=12)
+        cache.set("keep", 0, timeout=None)
+        for i in range(11):
+            cache.set(f"key_{i}", i, timeout=100 + i)
+        (count,) = cache._connection().execute("SELECT count(*) FROM cache").fetchone()
+        self.assertEqual(count, 6)
+        self.assertEqual(cache.get("keep"), 0)
+        self.assertIsNone(cache.get("key_0"))
+        self.assertEqual(cache.get("key_10"), 10)
+
+    def test_clear(self):
+        self.cache.set_many({"a": 1, "b": 2})
+        self.cache.clear()
+        self.assertEqual(self.cache.get_many(["a", "b"]), {})
+
+    def test_row_count_tracked_without_counting(self):
+        """cache_size follows inserts and deletes but not overwrites, and counts an older file once"""
+        import sqlite3
+
+        def size():
+            return self.cache._connection().execute("SELECT rows FROM cache_size").fetchone()[0]
+
+        self.cache.set_many({"a": 1, "b": 2, "c": 3})
+        self.cache.set("a", 10)
+        self.assertFalse(self.cache.add("b", 20))
+        self.assertEqual(size(), 3)
+        self.cache.delete("a")
+        self.cache.delete_many(["b", "absent"])
+        self.assertEqual(size(), 1)
+        self.cache.clear()
+        self.assertEqual(size(), 0)
+
+        # A file written before the triggers existed
+        self.cache.set_many({"a": 1, "b": 2})
+        conn = sqlite3.connect(self.location)
+        conn.executescript("DROP TRIGGER cache_inserted; DROP TRIGGER cache_deleted; DROP TABLE cache_size;")
+        conn.close()
+        self.assertEqual(self._cache()._connection().execute("SELECT rows FROM cache_size").fetchone()[0], 2)
+
+
 @override_settings(REST_FRAMEWORK={**NO_THROTTLE})
+@override_settings(REST_FRAMEWORK={**NO_THROTTLE}, RECAPTCHA_PRIVATE_KEY=None, DEBUG=True)
+class EmailOutboxTestCase(APITestCase):
+    """Tests for the outbound email queue (api.outbox, process_outbox command)"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def _queue(self, n=1):
+        from api.outbox import queue_email
+
+        with self.settings(EMAIL_OUTBOX={"ASYNC": True}), self.captureOnCommitCallbacks():
+            return [queue_email(f"Subject {i}", "Body", "from@example.com", ["to@example.com"]) for i in range(n)]
+
+    def _make_due(self):
+        from api.models import OutboundEmail
+
+        OutboundEmail.objects.filter(status="pending").update(next_attempt_at=django_timezone.now())
+
+    def test_contact_queues_and_sends_email(self):
+        """The contact endpoint stores the notification; the outbox delivers it"""
+        from django.core import mail
+
+        from api.models import OutboundEmail
+
+        data = {
+            "name": "Tester",
+            "email": "john@example.com",
+            "inquiry_type": "general",
+            "subject": "Test Subject",
+            "message": "This is a test message with sufficient length.",
+        }
+        response = self.client.post(reverse("contact-create"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.status, "sent")
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("Tester", mail.outbox[0].subject)
+
+    def test_async_contact_returns_before_sending(self):
+        """With ASYNC on, the request only wakes the worker after commit"""
+        from unittest import mock
+
+        from django.core import mail
+
+        from api.outbox import email_outbox
+
+        data = {
+            "name": "Tester",
+            "email": "john@example.com",
+            "inquiry_type": "general",
+            "subject": "Test Subject",
+            "message": "This is a test message with sufficient length.",
+        }
+        with self.settings(EMAIL_OUTBOX={"ASYNC": True}), mock.patch.object(email_outbox, "wake") as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse("contact-create"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+        wake.assert_called_once()
+
+    def test_bad_header_rejected_at_queue_time(self):
+        from api.models import OutboundEmail
+        from api.outbox import queue_email
+
+        with self.assertRaises(BadHeaderError):
+            queue_email("Bad\nSubject", "Body", "from@example.com", ["to@example.com"])
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_batch_shares_one_connection(self):
+        from unittest import mock
+
+        from django.core import mail
+        from django.core.mail import get_connection
+
+        from api.outbox import email_outbox
+
+        self._queue(3)
+        with mock.patch("api.outbox.get_connection", wraps=get_connection) as connect:
+            self.assertEqual(email_outbox.flush(), 3)
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_retries_with_backoff_then_fails(self):
+        from unittest import mock
+
+        from api.outbox import email_outbox
+
+        (email,) = self._queue()
+        with mock.patch("api.outbox.EmailMessage.send", side_effect=OSError("SMTP down")):
+            delays = []
+            for _ in range(settings.EMAIL_MAX_RETRIES + 1):
+                started = django_timezone.now()
+                email_outbox.flush()
+                email.refresh_from_db()
+                delays.append(round((email.next_attempt_at - started).total_seconds()))
+                self._make_due()
+        self.assertEqual(email.status, "failed")
+        self.assertEqual(email.attempts, settings.EMAIL_MAX_RETRIES + 1)
+        self.assertEqual(email.last_error, "SMTP down")
+        self.assertEqual(delays[:3], [30, 60, 120])
+        self.assertEqual(email_outbox.flush(), 0)
+
+    def test_unreachable_server_fails_batch_once(self):
+        from unittest import mock
+
+        from api.models import OutboundEmail
+        from api.outbox import email_outbox
+
+        self._queue(3)
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.open", side_effect=OSError("refused")) as opened:
+            email_outbox.flush()
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(list(OutboundEmail.objects.values_list("attempts", "status")), [(1, "pending")] * 3)
+
+    def test_claimed_rows_are_skipped(self):
+        """Rows leased by another worker (next_attempt_at in the future) are not sent twice"""
+        from api.models import OutboundEmail
+        from api.outbox import email_outbox
+
+        first, second = self._queue(2)
+        OutboundEmail.objects.filter(pk=first.pk).update(next_attempt_at=django_timezone.now() + timedelta(minutes=5))
+        self.assertEqual(email_outbox.flush(), 1)
+        first.refresh_from_db()
+        self.assertEqual(first.status, "pending")
+
+    def test_drain_error_is_logged_not_raised(self):
+        """A locked database while claiming rows is counted and retried; the worker loop survives"""
+        from unittest import mock
+
+        from django.db import OperationalError
+
+        from api.models import OutboundEmail
+        from api.outbox import email_outbox
+
+        self._queue(2)
+        errors = email_outbox.stats()["errors"]
+        with mock.patch.object(email_outbox, "_drain", side_effect=OperationalError("database is locked")):
+            with self.assertLogs("api.ingest", level="ERROR") as logs:
+                self.assertEqual(email_outbox.flush(), 0)
+        self.assertIn("database is locked", logs.output[0])
+        self.assertEqual(email_outbox.stats()["errors"], errors + 1)
+        self.assertEqual(email_outbox.flush(), 2)
+        self.assertFalse(OutboundEmail.objects.filter(status="pending").exists())
+
+    def test_process_outbox_command(self):
+        self._queue(2)
+        out = StringIO()
+        call_command("process_outbox", stdout=out)
+        self.assertIn("0 pending", out.getvalue())
+
+
 class BlogImageUploadTestCase(APITestCase):
     """Tests for BlogImageUploadView (lines 306-334)"""
 
@@ -2513,7 +4794,7 @@ class ContactSpamCheckTestCase(APITestCase):
         from unittest.mock import patch
 
         url = reverse("contact-create")
-        with patch("api.views.send_mail", side_effect=BadHeaderError("bad header")):
+        with patch("api.views.queue_email", side_effect=BadHeaderError("bad header")):
             response = self.client.post(url, self._contact_data(), format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
@@ -2522,7 +4803,7 @@ class ContactSpamCheckTestCase(APITestCase):
         from unittest.mock import patch
 
         url = reverse("contact-create")
-        with patch("api.views.send_mail", side_effect=Exception("SMTP down")):
+        with patch("api.views.queue_email", side_effect=Exception("DB down")):
             response = self.client.post(url, self._contact_data(), format="json")
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -2610,6 +4891,152 @@ class ContactSpamCheckTestCase(APITestCase):
         view = ContactView()
         self.assertFalse(view._is_spam_attempt("192.168.1.2", "clean@example.com"))
 
+    def test_is_spam_attempt_single_query(self):
+        """All ContactAttempt rules are evaluated in one query"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        ContactAttempt.objects.create(ip_address="10.0.0.5", email="one@example.com", attempt_count=1)
+        view = ContactView()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(view._is_spam_attempt("10.0.0.5", "two@example.com"))
+        self.assertEqual(len(queries), 1)
+
+    def test_is_spam_attempt_matches_normalized_email(self):
+        """Attempts are logged lowercased, so the email check normalizes too"""
+        view = ContactView()
+        view._log_contact_attempt("10.0.0.6", "Repeat@Example.com", True)
+        view._log_contact_attempt("10.0.0.7", "Repeat@Example.com", True)
+        ContactAttempt.objects.filter(ip_address="10.0.0.6").update(attempt_count=2)
+        self.assertTrue(view._is_spam_attempt("10.0.0.8", "  REPEAT@example.com "))
+
+    def test_is_spam_attempt_ip_limit_across_emails(self):
+        """The hourly IP limit applies whichever of the IP's rows reached it"""
+        ContactAttempt.objects.create(ip_address="10.0.0.9", email="a@example.com", attempt_count=1)
+        ContactAttempt.objects.create(ip_address="10.0.0.9", email="b@example.com", attempt_count=3)
+        view = ContactView()
+        self.assertTrue(view._is_spam_attempt("10.0.0.9", "c@example.com"))
+
+    def test_old_email_attempts_are_ignored(self):
+        """Email attempts older than a day don't count toward the daily limit"""
+        ContactAttempt.objects.create(ip_address="10.0.0.10", email="old@example.com", attempt_count=5)
+        ContactAttempt.objects.filter(email="old@example.com").update(
+            last_attempt=django_timezone.now() - timedelta(days=2)
+        )
+        view = ContactView()
+        self.assertFalse(view._is_spam_attempt("10.0.0.11", "old@example.com"))
+
+
+class SpamScoringTestCase(TestCase):
+    """Tests for the keyword spam scorer (api/spam.py)"""
+
+    def setUp(self):
+        from api import spam
+
+        # Rows created by a test are rolled back; make the next call rebuild from the DB
+        self.addCleanup(spam.rules_changed)
+        spam.rules_changed()
+
+    def test_builtin_keywords(self):
+        """Two built-in keywords make a text spam, one does not"""
+        from api.spam import is_spam
+
+        self.assertTrue(is_spam("Visit our CASINO and buy Bitcoin today"))
+        self.assertFalse(is_spam("Our casino project needs a data pipeline"))
+        self.assertTrue(is_spam("광고 및 홍보 문의드립니다"))
+
+    def test_overlapping_keywords(self):
+        """Keywords overlapping or contained in each other are all found"""
+        from api.spam import SpamScorer
+
+        scorer = SpamScorer({"casino": 1, "nobody": 1, "ca": 1, "sin": 1})
+        self.assertEqual(scorer.matches("CASINOBODY"), {"casino", "nobody", "ca", "sin"})
+        self.assertEqual(scorer.matches("cash"), {"ca"})
+        self.assertEqual(scorer.matches("nothing here"), set())
+
+    def test_matches_substring_search(self):
+        """The compiled matcher finds exactly the keywords a substring search finds"""
+        import random
+
+        from api.constants import SPAM_KEYWORDS
+        from api.spam import SpamScorer
+
+        rng = random.Random(7)
+        keywords = list(SPAM_KEYWORDS) + ["ab", "abc", "bca", "cab", "a.b", "b+"]
+        scorer = SpamScorer({keyword: 1 for keyword in keywords})
+        alphabet = "abc.+ 광고카지노"
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            if rng.random() < 0.3:
+                text += rng.choice(keywords)
+            self.assertEqual(scorer.matches(text), {keyword for keyword in keywords if keyword in text}, text)
+
+    def test_weights_and_hit_counters(self):
+        """Weights add up per distinct keyword; hits are counted per rule"""
+        from api.spam import SpamScorer
+
+        scorer = SpamScorer({"casino": 2, "bitcoin": 1, "off": 0})
+        self.assertEqual(scorer.score("casino casino bitcoin off"), 3)
+        scorer.score("casino")
+        self.assertEqual(scorer.stats(), {"rules": 2, "hits": {"casino": 2, "bitcoin": 1}})
+
+    def test_database_keywords(self):
+        """SpamKeyword rows add keywords, change weights and turn built-ins off"""
+        from api.models import SpamKeyword
+        from api.spam import is_spam
+
+        self.assertFalse(is_spam("cheap watches"))
+        with self.captureOnCommitCallbacks(execute=True):
+            SpamKeyword.objects.create(keyword="Cheap Watches", weight=2)
+        self.assertTrue(is_spam("CHEAP watches"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SpamKeyword.objects.create(keyword="casino", is_active=False)
+        self.assertFalse(is_spam("casino bitcoin"))
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+        SPAM_FILTER={"RELOAD_INTERVAL": 0},
+    )
+    def test_reload_on_version_change(self):
+        """A version bumped by another worker makes this one reload its rules"""
+        from django.core.cache import cache
+
+        from api.constants import CACHE_SPAM_RULES_VERSION
+        from api.models import SpamKeyword
+        from api.spam import is_spam
+
+        self.assertFalse(is_spam("cheap watches"))
+        # bulk_create skips the signal, like a row saved by another worker
+        SpamKeyword.objects.bulk_create([SpamKeyword(keyword="cheap watches", weight=2)])
+        self.assertFalse(is_spam("cheap watches"))
+        cache.set(CACHE_SPAM_RULES_VERSION, "other-worker")
+        self.assertTrue(is_spam("cheap watches"))
+
+    def test_rules_file(self):
+        """Rules are read from SPAM_FILTER["RULES_FILE"] and reloaded when it changes"""
+        import tempfile
+
+        from api.spam import is_spam
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spam_rules.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# comment\nreplica watches\t2\n")
+            with self.settings(SPAM_FILTER={"RULES_FILE": path, "RELOAD_INTERVAL": 0}):
+                self.assertTrue(is_spam("Replica watches"))
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("replica watches\t1\n")
+                os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+                self.assertFalse(is_spam("Replica watches"))
+
+    def test_missing_rules_file_falls_back(self):
+        """An unreadable rules file is logged and the other sources still apply"""
+        from api.spam import is_spam
+
+        with self.settings(SPAM_FILTER={"RULES_FILE": "/nonexistent/spam_rules.txt", "RELOAD_INTERVAL": 0}):
+            self.assertTrue(is_spam("casino bitcoin"))
+
 
 @override_settings(
     REST_FRAMEWORK={**NO_THROTTLE},
@@ -2641,7 +5068,7 @@ class ContactRecaptchaFailureTestCase(APITestCase):
             "message": "This is a valid test message with enough length.",
             "recaptcha_token": "bad-token",
         }
-        with patch("api.views.requests.post", return_value=mock_response):
+        with patch("api.recaptcha.requests.Session.post", return_value=mock_response):
             response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
@@ -3850,34 +6277,43 @@ class SecurityCheckCommandTestCase(TestCase):
     def test_clean_action(self):
         """Clean action runs and reports cleaned cache entries"""
         from io import StringIO
-        from django.core.cache import cache
+        from unittest.mock import patch
+        from api.ratelimit import MemoryRateLimiter
 
-        # Seed some cache entries
-        cache.set("rate_limit_192.168.1.1", 5, 3600)
-        cache.set("rate_limit_192.168.1.2", 10, 3600)
+        # Seed limiter state that has already drained
+        limiter = MemoryRateLimiter(100, 3600)
+        limiter.hit("192.168.1.1", now=0)
+        limiter.hit("192.168.1.2", now=0)
 
         out = StringIO()
-        self.call_command("security_check", "--action=clean", stdout=out)
+        with patch("api.management.commands.security_check.build_rate_limiter", return_value=limiter):
+            self.call_command("security_check", "--action=clean", stdout=out)
         output = out.getvalue()
         self.assertIn("보안 로그 정리", output)
-        self.assertIn("캐시 항목이 정리되었습니다", output)
+        self.assertIn("2개의 오래된 캐시 항목이 정리되었습니다", output)
 
     def test_unblock_action_with_blocked_ip(self):
         """Unblock action removes temporary block for given IP"""
         from io import StringIO
         from django.core.cache import cache
 
+        from unittest.mock import patch
+        from api.ratelimit import MemoryRateLimiter
+
         cache.set("temp_blocked_1.2.3.4", True, 3600)
-        cache.set("rate_limit_1.2.3.4", 50, 3600)
         cache.set("block_count_1.2.3.4", 2, 86400)
+        limiter = MemoryRateLimiter(1, 3600)
+        limiter.hit("1.2.3.4")
+        self.assertFalse(limiter.hit("1.2.3.4"))
 
         out = StringIO()
-        self.call_command("security_check", "--action=unblock", "--ip=1.2.3.4", stdout=out)
+        with patch("api.management.commands.security_check.build_rate_limiter", return_value=limiter):
+            self.call_command("security_check", "--action=unblock", "--ip=1.2.3.4", stdout=out)
         output = out.getvalue()
         self.assertIn("임시 차단이 해제되었습니다", output)
         self.assertIn("모든 제한이 해제되었습니다", output)
         self.assertIsNone(cache.get("temp_blocked_1.2.3.4"))
-        self.assertIsNone(cache.get("rate_limit_1.2.3.4"))
+        self.assertTrue(limiter.hit("1.2.3.4"))
         self.assertIsNone(cache.get("block_count_1.2.3.4"))
 
     def test_unblock_action_without_block(self):
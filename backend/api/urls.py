@@ -9,6 +9,7 @@ from .views import (
     BlogCommentViewSet,
     BlogImageUploadView,
     ContactView,
+    LikedLookupView,
     NewsletterView,
     NotificationViewSet,
     health_check,
@@ -17,6 +18,7 @@ from .views import (
 )
 from .admin_views import (
     admin_stats,
+    admin_metrics,
     admin_content,
     admin_messages,
     admin_message_detail,
@@ -53,6 +55,8 @@ urlpatterns = [
     path("blog-posts/<int:post_pk>/comments/<int:pk>/like/", comment_like, name="blog-comment-like"),
     # API endpoints
     path("", include(router.urls)),
+    # Liked state of many posts/comments for the client's IP
+    path("likes/", LikedLookupView.as_view(), name="liked-lookup"),
     # Contact and Newsletter
     path("contact/", ContactView.as_view(), name="contact-create"),
     path("newsletter/", NewsletterView.as_view(), name="newsletter-subscribe"),
@@ -62,6 +66,7 @@ urlpatterns = [
     path("health/", health_check, name="health-check"),
     # Admin endpoints
     path("admin/stats/", admin_stats, name="admin-stats"),
+    path("admin/metrics/", admin_metrics, name="admin-metrics"),
     path("admin/content/", admin_content, name="admin-content"),
     path("admin/messages/", admin_messages, name="admin-messages"),
     path("admin/messages/<uuid:pk>/", admin_message_detail, name="admin-message-detail"),
@@ -1,7 +1,7 @@
 import ipaddress
 
-from django.db import transaction
-from django.db.models import F
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
 from django.http import HttpRequest
 
 
@@ -39,22 +39,10 @@ def _is_valid_ip(ip: str) -> bool:
         return False
 
 
-def toggle_like(obj, like_model, like_field, ip_address):
-    """Toggle a like on an object (one per IP).
-
-    Args:
-        obj: The object being liked (BlogPost or BlogComment)
-        like_model: The like model class (BlogLike or CommentLike)
-        like_field: The field name on the like model ('post' or 'comment')
-        ip_address: The IP address of the user
-
-    Returns:
-        dict with 'liked' (bool) and 'likes' (int)
-    """
-    with transaction.atomic():
-        like, created = like_model.objects.get_or_create(**{like_field: obj}, ip_address=ip_address)
-        if not created:
-            like.delete()
-        type(obj).objects.filter(id=obj.id).update(likes=F("likes") + (1 if created else -1))
-    obj.refresh_from_db()
-    return {"liked": created, "likes": obj.likes}
+def is_email(value: str) -> bool:
+    """Whether value is a whole email address"""
+    try:
+        validate_email(value)
+        return True
+    except ValidationError:
+        return False
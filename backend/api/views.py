@@ -6,31 +6,41 @@ from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from django.core.mail import send_mail, BadHeaderError
 from django.conf import settings
-from django.db.models import Q, F, Count
+from django.db import transaction
+from django.db.models import Q, F, Count, Max
 from django.utils import timezone
 from django.core.cache import cache
 from django.http import HttpRequest
+from django.utils.cache import patch_cache_control
 from django.core.validators import validate_email
-from django.core.exceptions import ImproperlyConfigured, ValidationError as DjangoValidationError
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.exceptions import ValidationError
 from datetime import timedelta
-import hashlib
 import logging
 import os
 import re
 import uuid as uuid_mod
 
+from .comments import load_comment_tree, max_depth_setting
+from .conditional import (
+    category_validators,
+    not_modified,
+    post_list_validators,
+    post_validators,
+    set_validators,
+)
+from .counting import CACHED
 from .constants import (
-    ONE_DAY,
     ONE_HOUR,
     CACHE_BLOG_CATEGORIES,
     CACHE_BLOG_POST_LIST,
     MAX_FAILED_CONTACT_ATTEMPTS,
-    is_spam,
 )
-from .utils import get_client_ip, toggle_like
-
-import requests
+from .ingest import view_count_buffer, visit_buffer
+from .likes import MAX_LIKED_LOOKUP, liked_ids, mark_liked, toggle_like
+from .outbox import queue_email
+from .recaptcha import verify_recaptcha
+from .utils import get_client_ip
 
 from .models import (
     BlogPost,
@@ -44,7 +54,11 @@ from .models import (
     SiteVisit,
     NewsletterSubscription,
 )
+from .search import search_posts
+from .spam import is_spam
 from .serializers import (
+    BLOG_POST_BODY_FIELDS,
+    BlogPostListSerializer,
     BlogPostSerializer,
     BlogPostWriteSerializer,
     BlogCommentSerializer,
@@ -57,6 +71,15 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 
+# Suspicious contact email patterns, one compiled alternation
+SUSPICIOUS_EMAIL_PATTERN = re.compile(
+    r"[0-9]{10,}"  # Excessively long numbers
+    r"|(.)\1{5,}"  # Repeated characters
+    r"|test.*test"  # Test patterns
+    r"|spam|phishing|scam"  # Spam keywords
+)
+
+
 class ContactRateThrottle(AnonRateThrottle):
     """Contact form rate throttle"""
 
@@ -89,58 +112,8 @@ class AdminRateThrottle(UserRateThrottle):
     rate = "120/hour"
 
 
-def verify_recaptcha(recaptcha_response: str, request_ip: str = None) -> bool:
-    """Verify reCAPTCHA response (security-hardened)"""
-    if not settings.RECAPTCHA_PRIVATE_KEY:
-        if not settings.DEBUG:
-            raise ImproperlyConfigured("RECAPTCHA_PRIVATE_KEY not configured in production")
-        return True
-
-    # Input validation
-    if not recaptcha_response or len(recaptcha_response) > 1000:
-        return False
-
-    data = {"secret": settings.RECAPTCHA_PRIVATE_KEY, "response": recaptcha_response}
-
-    # Add IP address (optional)
-    if request_ip:
-        data["remoteip"] = request_ip
-
-    try:
-        response = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data=data,
-            timeout=10,
-            headers={"User-Agent": "EmelmujiroBot/1.0"},
-        )
-
-        if response.status_code != 200:
-            logger.error(f"reCAPTCHA API returned status {response.status_code}")
-            return False
-
-        result = response.json()
-        success = result.get("success", False)
-
-        # Log error codes
-        if not success:
-            error_codes = result.get("error-codes", [])
-            logger.warning(f"reCAPTCHA failed with errors: {error_codes}")
-
-        return success
-
-    except requests.RequestException as e:
-        logger.error(f"reCAPTCHA network error: {e}")
-        return False
-    except ValueError as e:
-        logger.error(f"reCAPTCHA JSON decode error: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"reCAPTCHA verification failed: {e}")
-        return False
-
-
 def log_site_visit(request: HttpRequest):
-    """Log site visit"""
+    """Queue a site visit for the background writer (see api.ingest)"""
     try:
         ip_address = get_client_ip(request)
         user_agent = request.META.get("HTTP_USER_AGENT", "")
@@ -148,12 +121,15 @@ def log_site_visit(request: HttpRequest):
         page_path = request.path
         session_id = request.session.session_key or ""
 
-        SiteVisit.objects.create(
-            ip_address=ip_address,
-            user_agent=user_agent,
-            referer=referer,
-            page_path=page_path,
-            session_id=session_id,
+        visit_buffer.record(
+            SiteVisit(
+                ip_address=ip_address,
+                user_agent=user_agent,
+                referer=referer,
+                page_path=page_path,
+                session_id=session_id,
+                visit_time=timezone.now(),
+            )
         )
     except Exception as e:
         logger.error(f"Failed to log site visit: {e}")
@@ -163,15 +139,25 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
     lookup_field = "slug"
+    count_strategy = CACHED
 
     def get_permissions(self):
         if self.action in ("list", "retrieve", "like"):
             return [AllowAny()]
         return [IsAdminUser()]
 
+    @property
+    def keyset_ordering(self):
+        """Cursor pagination order (see api.pagination); search results are ranked, so they page by number"""
+        if self.request.query_params.get("search"):
+            return None
+        return ("-date", "-id")
+
     def get_serializer_class(self):
         if self.action in ("create", "update", "partial_update"):
             return BlogPostWriteSerializer
+        if self.action == "list":
+            return BlogPostListSerializer
         return BlogPostSerializer
 
     def get_queryset(self):
@@ -193,12 +179,14 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         if search:
             # Limit search query length to prevent abuse
             search = search[:200]
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search) | Q(content__icontains=search)
-            )
+            queryset = search_posts(queryset, search)
         if featured and featured.lower() == "true":
             queryset = queryset.filter(is_featured=True)
 
+        if self.action == "list":
+            # Cards never show the body; don't load it
+            queryset = queryset.defer(*BLOG_POST_BODY_FIELDS)
+
         return queryset
 
     def perform_create(self, serializer):
@@ -222,36 +210,51 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         log_site_visit(request)
 
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        response = Response(serializer.data)
-
-        # Increment view count (once per day per IP)
-        ip_address = get_client_ip(request)
-        cache_key = f"blog_view_{instance.id}_{hashlib.sha256(ip_address.encode()).hexdigest()[:16]}"
 
-        if not cache.get(cache_key):
-            BlogPost.objects.filter(id=instance.id).update(view_count=F("view_count") + 1)
-            cache.set(cache_key, True, timeout=ONE_DAY)
+        # Count the view (once per day per IP, deduplicated when the buffer flushes), revalidations included
+        view_count_buffer.record(instance.id, get_client_ip(request))
 
-        return response
+        serializer = self.get_serializer(instance)
+        validators = post_validators(instance, serializer.get_relative_date(instance))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        return set_validators(Response(serializer.data), validators, request)
 
     def list(self, request, *args, **kwargs):
         """List posts with visit log"""
         log_site_visit(request)
 
-        # Cache unfiltered public list for 30 seconds
-        is_public = not (request.user and request.user.is_staff)
-        has_filters = any(request.query_params.get(p) for p in ("category", "search", "featured", "page"))
-        if is_public and not has_filters:
-            cache_key = CACHE_BLOG_POST_LIST
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
+        if includes_liked(request):
+            # Per-IP answer: skip the shared list cache and validators
             response = super().list(request, *args, **kwargs)
-            cache.set(cache_key, response.data, timeout=30)
+            mark_liked(response.data["results"], "post", get_client_ip(request))
+            patch_cache_control(response, private=True, no_cache=True)
             return response
 
-        return super().list(request, *args, **kwargs)
+        # Cache unfiltered public list (with its validators) for 30 seconds
+        is_public = not (request.user and request.user.is_staff)
+        has_filters = any(
+            request.query_params.get(p) for p in ("category", "search", "featured", "page", "pagination", "cursor")
+        )
+        cacheable = is_public and not has_filters
+        cached = cache.get(CACHE_BLOG_POST_LIST) if cacheable else None
+        if isinstance(cached, tuple):
+            validators, data = cached
+        else:
+            cached = None
+            validators = post_list_validators(request)
+
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        if cached is not None:
+            response = Response(data)
+        else:
+            response = super().list(request, *args, **kwargs)
+            if cacheable:
+                cache.set(CACHE_BLOG_POST_LIST, (validators, response.data), timeout=30)
+        return set_validators(response, validators, request)
 
     @action(detail=True, methods=["post"], url_path="toggle-publish")
     def toggle_publish(self, request, slug=None):
@@ -288,9 +291,23 @@ class BlogCommentViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         post_id = self.kwargs.get("post_pk")
-        return BlogComment.objects.filter(post_id=post_id, parent__isnull=True).prefetch_related(
-            "replies", "comment_likes", "replies__comment_likes"
-        )
+        return BlogComment.objects.filter(post_id=post_id, parent__isnull=True)
+
+    def list(self, request, *args, **kwargs):
+        """The post's comment tree, loaded in one query; ``?depth=`` nests less than COMMENT_MAX_DEPTH."""
+        max_depth = max_depth_setting()
+        depth = request.query_params.get("depth")
+        if depth is not None:
+            try:
+                max_depth = min(max(int(depth), 0), max_depth)
+            except ValueError:
+                raise ValidationError({"depth": "depth는 정수여야 합니다."})
+        tree = load_comment_tree(self.kwargs.get("post_pk"), max_depth)
+        if not includes_liked(request):
+            return Response(tree)
+        response = Response(mark_liked(tree, "comment", get_client_ip(request)))
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
     def perform_create(self, serializer):
         post_id = self.kwargs.get("post_pk")
@@ -309,6 +326,40 @@ class BlogCommentViewSet(viewsets.ModelViewSet):
         return Response(toggle_like(self.get_object(), CommentLike, "comment", get_client_ip(request)))
 
 
+def includes_liked(request) -> bool:
+    """``?include=liked``: add this IP's ``liked`` flag to each listed item."""
+    return "liked" in request.query_params.get("include", "").split(",")
+
+
+class LikedLookupView(APIView):
+    """Which of the given posts and comments the client's IP has liked.
+
+    ``GET /api/likes/?posts=1,2,3&comments=4,5`` -> ``{"posts": [1, 3], "comments": []}``,
+    at most MAX_LIKED_LOOKUP ids per list, resolved with one query per list.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        ip_address = get_client_ip(request)
+        data = {}
+        for param, target in (("posts", "post"), ("comments", "comment")):
+            raw = request.query_params.get(param, "")
+            try:
+                ids = {int(pk) for pk in raw.split(",") if pk.strip()}
+            except ValueError:
+                return Response({"error": f"{param}: 정수 ID 목록이어야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+            if len(ids) > MAX_LIKED_LOOKUP:
+                return Response(
+                    {"error": f"{param}: 한 번에 최대 {MAX_LIKED_LOOKUP}개까지 조회할 수 있습니다."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            data[param] = sorted(liked_ids(target, ip_address, ids))
+        response = Response(data)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
 class BlogImageUploadView(APIView):
     permission_classes = [IsAdminUser]
 
@@ -349,17 +400,19 @@ class CategoryListView(APIView):
     def get(self, request):
         log_site_visit(request)
 
-        # Return cached category data if available
+        # Return cached category data (with its validators) if available
         cached = cache.get(CACHE_BLOG_CATEGORIES)
-        if cached is not None:
-            return Response(cached)
+        if isinstance(cached, tuple):
+            validators, category_data = cached
+            return not_modified(request, validators) or set_validators(Response(category_data), validators, request)
+
+        published = BlogPost.objects.filter(is_published=True)
+        validators = category_validators(published)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
 
-        categories = (
-            BlogPost.objects.filter(is_published=True)
-            .values("category")
-            .annotate(count=Count("category"))
-            .order_by("category")
-        )
+        categories = published.values("category").annotate(count=Count("category")).order_by("category")
 
         category_data = []
         category_choices_dict = dict(BlogPost.CATEGORY_CHOICES)
@@ -374,8 +427,8 @@ class CategoryListView(APIView):
                 }
             )
 
-        cache.set(CACHE_BLOG_CATEGORIES, category_data, timeout=ONE_HOUR)
-        return Response(category_data)
+        cache.set(CACHE_BLOG_CATEGORIES, (validators, category_data), timeout=ONE_HOUR)
+        return set_validators(Response(category_data), validators, request)
 
 
 class ContactView(APIView):
@@ -416,20 +469,20 @@ class ContactView(APIView):
             )
 
         try:
-            # Save contact data (with IP and User Agent)
-            contact = serializer.save(ip_address=ip_address, user_agent=user_agent)
-
-            # Send email notification
-            subject = f"[에멜무지로 문의] {contact.get_inquiry_type_display()} - {contact.name}"
-            message = self._create_email_message(contact)
-
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.ADMIN_EMAIL],
-                fail_silently=False,
-            )
+            with transaction.atomic():
+                # Save contact data (with IP and User Agent)
+                contact = serializer.save(ip_address=ip_address, user_agent=user_agent)
+
+                # Queue the email notification; the outbox worker sends it after commit (api/outbox.py)
+                subject = f"[에멜무지로 문의] {contact.get_inquiry_type_display()} - {contact.name}"
+                message = self._create_email_message(contact)
+
+                queue_email(
+                    subject=subject,
+                    message=message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[settings.ADMIN_EMAIL],
+                )
 
             # Log successful contact attempt
             self._log_contact_attempt(ip_address, email, True)
@@ -454,39 +507,38 @@ class ContactView(APIView):
             )
 
     def _is_spam_attempt(self, ip_address: str, email: str) -> bool:
-        """Check for spam attempts (security-hardened)"""
-        try:
-            # Check if IP or email is explicitly blocked
-            blocked_filter = Q(ip_address=ip_address, is_blocked=True)
-            if email and self._is_valid_email(email):
-                blocked_filter |= Q(email=email, is_blocked=True)
-            if ContactAttempt.objects.filter(blocked_filter).exists():
-                return True
+        """Check for spam attempts (security-hardened)
 
-            # IP-based check (limit 3 per hour)
-            ip_attempts = ContactAttempt.objects.filter(
-                ip_address=ip_address,
-                last_attempt__gte=timezone.now() - timedelta(hours=1),
-            ).first()
+        Every ``ContactAttempt`` rule is evaluated by one aggregate over the
+        rows for this IP or email (both indexed with ``last_attempt``).
+        """
+        try:
+            # Attempts are logged with the normalized email (_log_contact_attempt)
+            email = (email or "").strip().lower()
+            has_email = bool(email) and self._is_valid_email(email)
+            now = timezone.now()
+
+            by_ip = Q(ip_address=ip_address)
+            by_email = Q(email=email) if has_email else Q(pk__in=[])
+            verdict = ContactAttempt.objects.filter(by_ip | by_email).aggregate(
+                # IP or email explicitly blocked
+                blocked=Count("pk", filter=Q(is_blocked=True)),
+                # IP-based check (limit 3 per hour)
+                ip_attempts=Max("attempt_count", filter=by_ip & Q(last_attempt__gte=now - timedelta(hours=1))),
+                # Failure-based check: accumulated failed attempts from an IP signal a bot
+                ip_failures=Max("failure_count", filter=by_ip),
+                # Email-based check (limit 2 per day)
+                email_attempts=Max("attempt_count", filter=by_email & Q(last_attempt__gte=now - timedelta(days=1))),
+            )
 
-            if ip_attempts and ip_attempts.attempt_count >= 3:
+            if verdict["blocked"]:
                 return True
-
-            # Failure-based check: accumulated failed attempts from an IP signal a bot
-            if ContactAttempt.objects.filter(
-                ip_address=ip_address,
-                failure_count__gte=MAX_FAILED_CONTACT_ATTEMPTS,
-            ).exists():
+            if (verdict["ip_attempts"] or 0) >= 3:
+                return True
+            if (verdict["ip_failures"] or 0) >= MAX_FAILED_CONTACT_ATTEMPTS:
+                return True
+            if (verdict["email_attempts"] or 0) >= 2:
                 return True
-
-            # Email-based check (limit 2 per day)
-            if email and self._is_valid_email(email):
-                email_attempts = ContactAttempt.objects.filter(
-                    email=email, last_attempt__gte=timezone.now() - timedelta(days=1)
-                ).first()
-
-                if email_attempts and email_attempts.attempt_count >= 2:
-                    return True
 
             # Suspicious pattern check
             if self._is_suspicious_content(email):
@@ -509,17 +561,7 @@ class ContactView(APIView):
 
     def _is_suspicious_content(self, email: str) -> bool:
         """Check for suspicious content patterns"""
-        suspicious_patterns = [
-            r"[0-9]{10,}",  # Excessively long numbers
-            r"(.)\1{5,}",  # Repeated characters
-            r"test.*test",  # Test patterns
-            r"spam|phishing|scam",  # Spam keywords
-        ]
-
-        for pattern in suspicious_patterns:
-            if re.search(pattern, email.lower()):
-                return True
-        return False
+        return SUSPICIOUS_EMAIL_PATTERN.search(email.lower()) is not None
 
     def _log_contact_attempt(self, ip_address: str, email: str, success: bool):
         """Log contact attempt; failed attempts feed spam detection."""
@@ -1,6 +1,9 @@
 from pathlib import Path
+import atexit
 import os
+import shutil
 import sys
+import tempfile
 from dotenv import load_dotenv
 from django.core.exceptions import ImproperlyConfigured
 
@@ -255,10 +258,7 @@ SIMPLE_JWT = {
 
 # REST Framework settings
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "api.authentication.CookieJWTAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("api.authentication.CookieJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
@@ -322,6 +322,8 @@ else:
 # File upload security
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+# RequestSecurityMiddleware scans at most this many leading body bytes for malicious patterns
+SECURITY_SCAN_MAX_BODY_BYTES = 262144  # 256KB
 FILE_UPLOAD_PERMISSIONS = 0o644
 ALLOWED_UPLOAD_EXTENSIONS = [".jpg", ".jpeg", ".png", ".gif", ".pdf", ".doc", ".docx"]
 
@@ -345,16 +347,130 @@ EMAIL_MAX_RETRIES = 3
 RECAPTCHA_PUBLIC_KEY = os.environ.get("RECAPTCHA_PUBLIC_KEY")
 RECAPTCHA_PRIVATE_KEY = os.environ.get("RECAPTCHA_PRIVATE_KEY")
 
-# Cache settings — file-based cache is shared across Gunicorn workers
+# How contact-form tokens are verified (api/recaptcha.py). SiteVerifyVerifier
+# posts to Google over a pooled keep-alive session (point URL at a stub server
+# for load tests); StaticVerifier answers without network. Verified tokens are
+# remembered per client IP for CACHE_TIMEOUT seconds.
+RECAPTCHA_VERIFIER = {
+    "BACKEND": "api.recaptcha.SiteVerifyVerifier",
+    "OPTIONS": {
+        "POOL_SIZE": 4,
+    },
+    "CACHE_TIMEOUT": 120,
+}
+
+# Deepest reply level in a post's comment tree (api/comments.py); deeper
+# replies are flattened into that level
+COMMENT_MAX_DEPTH = 5
+
+# Keyword spam filter for contact messages and comments (api/spam.py). Rules
+# come from SPAM_KEYWORDS, RULES_FILE ("keyword<TAB>weight" lines) and the
+# SpamKeyword admin; workers reload them within RELOAD_INTERVAL seconds of a change.
+SPAM_FILTER = {
+    "THRESHOLD": 2,
+    "RULES_FILE": os.environ.get("SPAM_RULES_FILE") or None,
+    "RELOAD_INTERVAL": 30,
+}
+
+# Cache settings — "default" keeps a small per-worker LRU (api/cache.py) in
+# front of the "shared" cache, a WAL-mode SQLite file all Gunicorn workers use
+# (expired rows are swept SWEEP_BATCH at a time every SWEEP_EVERY writes).
+# L1_TIMEOUTS are local TTLs by key prefix (0 = always read the shared tier);
+# deleting a key cached locally for longer than EPOCH_CHECK_INTERVAL seconds
+# invalidates every worker's local tier within that interval (sets don't).
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
-        "LOCATION": os.path.join(BASE_DIR, ".cache"),
+        "BACKEND": "api.cache.TieredCache",
+        "LOCATION": "shared",
         "TIMEOUT": 300,
         "OPTIONS": {
-            "MAX_ENTRIES": 1000,
+            "L1_MAX_ENTRIES": 1000,
+            "L1_TIMEOUT": 1,
+            "L1_TIMEOUTS": {
+                "blog_categories": 60,
+                "blog_post_list": 10,
+                "permanently_blocked_ips": 10,
+                "block_count_": 0,
+            },
+            "EPOCH_CHECK_INTERVAL": 1,
         },
-    }
+    },
+    "shared": {
+        "BACKEND": "api.cache.SQLiteCache",
+        "LOCATION": os.path.join(os.environ.get("SQLITE_DIR", BASE_DIR), "cache.sqlite3"),
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            "MAX_ENTRIES": 100000,
+            "SWEEP_EVERY": 100,
+            "SWEEP_BATCH": 500,
+        },
+    },
+}
+
+# Per-IP request rate limit enforced by RequestSecurityMiddleware (api/ratelimit.py).
+# GCRA sliding window: an idle client may burst LIMIT requests, then gets one
+# every PERIOD / LIMIT seconds. The SQLite backend keeps one row per IP in a
+# WAL-mode file shared by all gunicorn workers (one atomic UPSERT per request).
+RATE_LIMIT = {
+    "BACKEND": "api.ratelimit.SQLiteRateLimiter",
+    "LIMIT": 100,
+    "PERIOD": 3600,
+    "OPTIONS": {
+        "LOCATION": os.path.join(os.environ.get("SQLITE_DIR", BASE_DIR), "ratelimit.sqlite3"),
+    },
+}
+
+# Buffered SiteVisit ingestion (api/ingest.py). Each worker queues visits in
+# memory and writes them with bulk_create every BATCH_SIZE visits or
+# FLUSH_INTERVAL_MS, whichever comes first; visits beyond MAX_SIZE are dropped
+# and counted (see /api/admin/metrics/).
+VISIT_BUFFER = {
+    "ASYNC": True,
+    "MAX_SIZE": 5000,
+    "BATCH_SIZE": 200,
+    "FLUSH_INTERVAL_MS": 2000,
+}
+
+# Write-behind blog view counts (api/ingest.py). Each worker sums views per post
+# and applies them as one UPDATE per post every FLUSH_INTERVAL_MS (or sooner
+# once BATCH_SIZE posts are pending), so view_count lags by at most about that.
+VIEW_COUNT_BUFFER = {
+    "ASYNC": True,
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL_MS": 5000,
+}
+
+# Outbound email queue (api/outbox.py). Messages are stored as OutboundEmail
+# rows and sent by a per-worker thread over one SMTP connection per batch,
+# right after the enqueuing transaction commits and every FLUSH_INTERVAL_MS for
+# retries. A failed send is retried after RETRY_BASE_SECONDS, doubling each
+# time, up to EMAIL_MAX_RETRIES retries. A worker claims a batch for
+# LEASE_SECONDS, after which unsent rows become due again.
+EMAIL_OUTBOX = {
+    "ASYNC": True,
+    "BATCH_SIZE": 50,
+    "FLUSH_INTERVAL_MS": 30000,
+    "RETRY_BASE_SECONDS": 30,
+    "LEASE_SECONDS": 300,
+}
+
+# Like counters (api/likes.py). A like or unlike adds ±1 to one of SHARDS
+# counter rows of the post/comment instead of updating its likes column; a
+# per-worker thread folds the shards into likes every FLUSH_INTERVAL_MS.
+LIKE_COUNTERS = {
+    "ASYNC": True,
+    "SHARDS": 8,
+    "BATCH_SIZE": 1000,
+    "FLUSH_INTERVAL_MS": 5000,
+}
+
+# Users resolved from access tokens (api/authentication.py) are cached per
+# worker for TIMEOUT seconds, keyed by user id and token iat; saving a user
+# drops them in every worker within CHECK_INTERVAL seconds. 0 disables it.
+AUTH_USER_CACHE = {
+    "TIMEOUT": 30,
+    "MAX_ENTRIES": 1000,
+    "CHECK_INTERVAL": 1,
 }
 
 # Logging settings
@@ -450,3 +566,16 @@ if "test" in sys.argv:
     # Remove WhiteNoise middleware and use default storage to avoid UserWarning.
     MIDDLEWARE = [m for m in MIDDLEWARE if "whitenoise" not in m]
     STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+    # Write visits inline so tests can assert on SiteVisit rows right after a request
+    VISIT_BUFFER["ASYNC"] = False
+    VIEW_COUNT_BUFFER["ASYNC"] = False
+    EMAIL_OUTBOX["ASYNC"] = False
+    LIKE_COUNTERS["ASYNC"] = False
+    # User ids and iat seconds repeat across tests that roll back (on_commit never runs)
+    AUTH_USER_CACHE["TIMEOUT"] = 0
+    # Each middleware instance (one per test client) gets fresh limiter state
+    RATE_LIMIT = {**RATE_LIMIT, "BACKEND": "api.ratelimit.MemoryRateLimiter", "OPTIONS": {}}
+    # A fresh shared-cache file per run, outside the source tree, removed at exit
+    _test_cache_dir = tempfile.mkdtemp(prefix="test-cache-")
+    atexit.register(shutil.rmtree, _test_cache_dir, ignore_errors=True)
+    CACHES["shared"]["LOCATION"] = os.path.join(_test_cache_dir, "cache.sqlite3")
@@ -74,12 +74,12 @@ const BlogSearch: React.FC<BlogSearchProps> = ({ onSearch }) => {
         logger.warn('API search failed, using local search:', error);
       }
 
-      // Fallback to local search
+      // Fallback to local search (list items carry no body, so content is usually absent)
       const lowerTerm = term.toLowerCase();
       const results = posts.filter(
         (post) =>
           post.title.toLowerCase().includes(lowerTerm) ||
-          post.content.toLowerCase().includes(lowerTerm) ||
+          post.content?.toLowerCase().includes(lowerTerm) ||
           (post.description && post.description.toLowerCase().includes(lowerTerm)) ||
           (post.category && post.category.toLowerCase().includes(lowerTerm)) ||
           (post.tags && post.tags.some((tag) => tag.toLowerCase().includes(lowerTerm)))
@@ -107,7 +107,7 @@ describe('blogPosts data', () => {
     });
 
     it('should find posts by content keyword', () => {
-      const results = blogPosts.filter((p) => p.content.toLowerCase().includes('ai'));
+      const results = blogPosts.filter((p) => p.content?.toLowerCase().includes('ai'));
       expect(results.length).toBeGreaterThan(0);
     });
 
@@ -170,7 +170,7 @@ describe('blogPosts data', () => {
         expect(post.title.trim()).not.toBe('');
         expect(post.slug.trim()).not.toBe('');
         expect(post.description.trim()).not.toBe('');
-        expect(post.content.trim()).not.toBe('');
+        expect((post.content ?? '').trim()).not.toBe('');
         expect(post.author.trim()).not.toBe('');
         expect(post.category?.trim()).not.toBe('');
       });
@@ -64,7 +64,7 @@ describe('mockData', () => {
     it('should have non-empty required string fields', () => {
       mockBlogPosts.forEach((post) => {
         expect(post.title.trim().length).toBeGreaterThan(0);
-        expect(post.content.trim().length).toBeGreaterThan(0);
+        expect((post.content ?? '').trim().length).toBeGreaterThan(0);
         expect(post.description.trim().length).toBeGreaterThan(0);
         expect(post.author.trim().length).toBeGreaterThan(0);
         expect(post.slug.trim().length).toBeGreaterThan(0);
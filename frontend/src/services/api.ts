@@ -169,7 +169,7 @@ export const api = {
       const filtered = mockBlogPosts.filter(
         (post) =>
           post.title.toLowerCase().includes(query.toLowerCase()) ||
-          post.content.toLowerCase().includes(query.toLowerCase()) ||
+          post.content?.toLowerCase().includes(query.toLowerCase()) ||
           (post.tags && post.tags.some((tag) => tag.toLowerCase().includes(query.toLowerCase())))
       );
       return mockResponse(paginateMockData(filtered, 1, 10));
@@ -10,7 +10,8 @@ export interface BlogPost {
   id: string | number;
   title: string;
   slug: string;
-  content: string;
+  // Absent from list responses (GET /blog-posts/ omits the body); only the detail carries it
+  content?: string;
   content_html?: string;
   description: string;
   author: string;